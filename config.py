@@ -9,9 +9,40 @@ MAX_PROCESS_COUNT = 20  # 最大进程数量
 # === 内存管理模块配置 (对应 扩展 2) ===
 MEMORY_SIZE = 1024      # 模拟的总内存大小 (MB)
 PAGE_SIZE = 4           # 页面大小 (KB/MB)
+MEMORY_BUDDY_MIN_BLOCK = 1  # 伙伴分配器的最小块 (MB，向上取整为 2 的幂)
+MEMORY_SLAB_SIZE = 64       # slab 分配器中一个 slab 的大小 (MB，由伙伴分配器提供)
+MEMORY_SLAB_CLASSES = (2, 4, 8, 12, 16, 24, 32)  # slab 的对象大小类 (MB)，更大的请求直接由伙伴分配器分配
 
 # === RTOS 模块配置 (对应 扩展 4) ===
 RTOS_PRIORITY_RANGE = (1, 10)  # RTOS 任务的优先级范围 (1最高)
+RTOS_TIMELINE_CAPACITY = 4096  # RTOS 事件环形缓冲区保留的事件数量
+RTOS_LOG_MAX_LINES = 1000  # RTOS 实时日志保留的行数 (每个事件一行)
+NVIC_PRIORITY_BITS = 4  # 中断优先级位数 (优先级 0 ~ 2^位数-1，数值越小越优先)
+NVIC_CPU_MHZ = 100  # 主频 (MHz)，用于把异常进入 / 返回的周期数换算为时间
+NVIC_ENTRY_CYCLES = 12  # 进入异常 (硬件压栈) 的周期数
+NVIC_EXIT_CYCLES = 10  # 异常返回 (硬件出栈) 的周期数
+NVIC_TAILCHAIN_CYCLES = 6  # 尾链 (不出栈直接进入下一个挂起中断) 的周期数
+# 默认中断线：[(IRQ 号, 处理函数名, 优先级, 处理时间 ms)]
+RTOS_IRQ_LINES = [(99, "GPIO_IRQ_Handler", 0, 300)]
+RTOS_TICKLESS = False  # 无节拍模式：所有任务都阻塞时直接跳到下一个定时器到期 (或中断到达) 的时间片
+RTOS_DELAY_RANGE_MS = (20, 400)  # 非周期任务调用 vTaskDelay 的延时范围 (ms)
+RTOS_SEM_TIMEOUT_MS = 200  # 非周期任务等待中断信号量的超时时间 (ms)
+RTOS_MUTEX_COUNT = 2  # 界面生成任务集时创建的互斥量数量 (0 表示不使用互斥量)
+RTOS_MUTEX_PROTOCOL = "INHERIT"  # 互斥量协议：NONE (无) / INHERIT (优先级继承) / CEILING (优先级天花板)
+RTOS_CS_RANGE_MS = (10, 60)  # 临界区 (持有互斥量) 的执行时间范围 (ms)
+RTOS_STACK_SIZE = 1024  # 任务栈大小 (字节)，也是任务栈内存池的块大小
+RTOS_STACK_POOL_BLOCKS = 8192  # 任务栈内存池的块数 (同时存在的任务数上限)
+RTOS_MAIN_STACK_SIZE = 4096  # 主栈 (MSP，中断处理函数使用) 的大小 (字节)
+RTOS_CALL_FRAME_BYTES = 48  # 任务每一层函数调用占用的栈空间 (字节)
+RTOS_MAX_CALL_DEPTH = 12  # 任务的最大函数调用深度
+RTOS_ISR_FRAME_BYTES = 96  # 中断处理函数占用的主栈空间 (字节，不含硬件压栈的异常帧)
 
 # === 任务管理器刷新频率 (对应 扩展 1) ===
-REFRESH_INTERVAL_MS = 100  # 任务管理器数据刷新间隔 (毫秒) - 降低到100ms以提高RTOS时间线的流畅度
\ No newline at end of file
+ARCHIVE_PAGE_SIZE = 200    # 列表视图中归档进程的分页大小
+STATE_DIAGRAM_DOT_LIMIT = 24  # 状态转换图中每个状态最多逐个绘制的进程点数，超过后改为计数热力环
+REFRESH_INTERVAL_MS = 100  # 任务管理器数据刷新间隔 (毫秒) - 降低到100ms以提高RTOS时间线的流畅度
+BACKGROUND_REFRESH_INTERVAL_MS = 1000  # 隐藏页面的后台刷新间隔 (毫秒)
+REFRESH_INTERVAL_MAX_MS = 1000  # 刷新过慢时自动放慢到的最大间隔 (毫秒)
+REFRESH_BUDGET_RATIO = 0.5      # 单次刷新耗时占刷新间隔的预算比例
+REFRESH_TIMING_SMOOTHING = 0.2  # 刷新耗时的指数平滑系数
+SNAPSHOT_TIMEOUT_MS = 2000  # 快照请求的超时时间 (ms)，超时未到达则重新请求
@@ -0,0 +1,101 @@
+# qt_frontend/engine_workers.py
+# 模拟引擎工作线程：引擎在独立的 QThread 中推进，增量结果通过排队信号批量送回 GUI 线程
+
+import time
+from functools import partial
+
+from PyQt6.QtCore import QCoreApplication, QObject, QThread, QTimer, pyqtSignal, pyqtSlot
+
+
+class EngineWorker(QObject):
+    """
+    通用引擎工作者。
+    - engine.step(now) 每 step_ms 毫秒在工作线程中调用一次，返回增量列表；step_ms 为 None 时不定时推进
+    - 增量先在工作线程中累积，每 batch_ms 毫秒通过 deltas_ready 信号批量发出一次
+    - call() 把对引擎的操作 (启动、停止、改参数、生成快照等) 投递到工作线程执行，
+      返回的增量立即发出
+    GUI 线程只接收 deltas_ready，不直接调用引擎，也不等待工作线程。
+    """
+
+    deltas_ready = pyqtSignal(list)
+    _command = pyqtSignal(object)
+    _shutdown = pyqtSignal()
+
+    def __init__(self, engine, step_ms=None, batch_ms=50, name="engine"):
+        super().__init__()
+        self.engine = engine
+        self.step_ms = step_ms
+        self.batch_ms = batch_ms
+        self._pending = []
+        self._step_timer = None
+        self._flush_timer = None
+
+        self._thread = QThread()
+        self._thread.setObjectName(f"{name}-worker")
+        self.moveToThread(self._thread)
+        self._thread.started.connect(self._on_started)
+        self._command.connect(self._run_command)
+        self._shutdown.connect(self._on_shutdown)
+        # 应用退出时自动停止，避免工作线程中的定时器在其他线程被销毁。
+        # 用 lambda 连接，使 stop() 在 GUI 线程执行 (绑定方法会被排队到工作线程)
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(lambda: self.stop())
+
+    def start(self):
+        self._thread.start()
+
+    def call(self, fn, *args):
+        """在工作线程中执行 fn(*args)，fn 返回增量列表 (或 None)"""
+        self._command.emit(partial(fn, *args))
+
+    def stop(self, timeout_ms=1000):
+        """停止工作线程并等待其退出 (在 GUI 线程调用)"""
+        if self._thread.isRunning():
+            self._shutdown.emit()
+            self._thread.wait(timeout_ms)
+
+    # --- 以下方法均在工作线程中执行 ---
+
+    @pyqtSlot()
+    def _on_started(self):
+        # 定时器必须在工作线程中创建，才会在工作线程中触发
+        if self.step_ms is not None:
+            self._step_timer = QTimer(self)
+            self._step_timer.timeout.connect(self._step)
+            self._step_timer.start(self.step_ms)
+        self._flush_timer = QTimer(self)
+        self._flush_timer.timeout.connect(self._flush)
+        self._flush_timer.start(self.batch_ms)
+
+    @pyqtSlot()
+    def _step(self):
+        deltas = self.engine.step(time.monotonic())
+        if deltas:
+            self._pending.extend(deltas)
+
+    @pyqtSlot(object)
+    def _run_command(self, fn):
+        try:
+            deltas = fn()
+        except Exception as e:
+            print(f"Engine Error: {e}")
+            return
+        if deltas:
+            self._pending.extend(deltas)
+        self._flush()
+
+    @pyqtSlot()
+    def _flush(self):
+        if self._pending:
+            batch, self._pending = self._pending, []
+            self.deltas_ready.emit(batch)
+
+    @pyqtSlot()
+    def _on_shutdown(self):
+        if self._step_timer:
+            self._step_timer.stop()
+        if self._flush_timer:
+            self._flush_timer.stop()
+        self._flush()
+        self._thread.quit()
@@ -134,8 +134,10 @@ class EventHandler:
             return
         
         # 启动RTOS模拟
-        rtos_start()
-        self.main_window.status_bar.showMessage("RTOS模拟已启动！", 3000)
+        policy = self.main_window.rtos_policy_combo.currentData()
+        rtos_start(policy=policy, tickless=self.main_window.rtos_tickless_check.isChecked(),
+                   mutex_protocol=self.main_window.rtos_mutex_combo.currentData())
+        self.main_window.status_bar.showMessage(f"RTOS模拟已启动！(调度策略: {policy})", 3000)
 
     def stop_rtos_simulation(self):
         """停止RTOS模拟"""
@@ -152,13 +154,13 @@ class EventHandler:
             STATUS.rtos_timeline.clear()
             STATUS.global_timer = 0
         
-        # 重置全局中断标志
         import src.modules_extension.extension_rtos as rtos_module
-        rtos_module.pending_isr = None
         
-        # 更新UI
+        # 更新UI (RTOS 页面尚未打开时直接重置内核数据，中断控制器随之重置)
         if hasattr(self.main_window, 'rtos_timeline'):
             self.main_window.rtos_timeline.reset_simulation()
+        else:
+            rtos_module.reset_rtos_data()
             
         self.main_window.status_bar.showMessage("RTOS模拟已重置！", 3000)
 
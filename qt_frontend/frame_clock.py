@@ -0,0 +1,137 @@
+# qt_frontend/frame_clock.py
+# 全局帧时钟：用一个 QTimer 统一驱动各可视化组件的动画与定时刷新
+
+import time
+from typing import Callable, List, Optional
+
+from PyQt6.QtCore import QEvent, QObject, QTimer, Qt
+from PyQt6.QtWidgets import QWidget
+
+
+class FrameSubscription:
+    """
+    一个订阅。接口与 QTimer 的 start() / stop() / isActive() 相同，
+    组件可以直接用它替换原来的动画定时器。
+    """
+
+    def __init__(self, clock: 'FrameClock', owner: QWidget, callback: Callable[[], None], fps: float):
+        self._clock = clock
+        self.owner = owner
+        self.callback = callback
+        self.period = 1.0 / fps
+        self.active = False
+        self.next_due = 0.0
+
+    def start(self):
+        if not self.active:
+            self.active = True
+            self.next_due = time.monotonic() + self.period
+            self._clock._reschedule()
+
+    def stop(self):
+        if self.active:
+            self.active = False
+            self._clock._reschedule()
+
+    def isActive(self):
+        return self.active
+
+
+class FrameClock(QObject):
+    """
+    帧时钟。
+    - 每个订阅声明自己的目标帧率，时钟以当前最快的可见订阅的周期运行，到期的订阅在同一次触发中依次执行
+    - 所属组件不可见 (页面被切走、窗口最小化) 的订阅暂停，重新显示时恢复
+    - 没有可运行的订阅时时钟完全停止；组件重新显示时由事件过滤器唤醒
+    所有订阅在同一个定时器事件中执行，它们触发的 update() 会被 Qt 合并为同一轮绘制。
+    """
+
+    _instance: Optional['FrameClock'] = None
+
+    @classmethod
+    def instance(cls) -> 'FrameClock':
+        # QTimer 需要在 QApplication 创建之后才能创建，因此在第一次使用时才实例化
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        super().__init__()
+        self._subs: List[FrameSubscription] = []
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.timeout.connect(self._tick)
+
+    def subscribe(self, owner: QWidget, callback: Callable[[], None], fps: float, active: bool = True) -> FrameSubscription:
+        """为 owner 注册一个以 fps 帧率调用 callback 的订阅，owner 销毁时自动取消"""
+        sub = FrameSubscription(self, owner, callback, fps)
+        self._subs.append(sub)
+        owner.installEventFilter(self)
+        owner.destroyed.connect(lambda: self._drop_owner(sub.owner))
+        if active:
+            sub.start()
+        return sub
+
+    def unsubscribe(self, sub: FrameSubscription):
+        sub.active = False
+        if sub in self._subs:
+            self._subs.remove(sub)
+        self._reschedule()
+
+    def eventFilter(self, obj, event):
+        # 订阅者重新显示时唤醒时钟 (或按新的最快帧率调整间隔)
+        if event.type() == QEvent.Type.Show:
+            self._reschedule()
+        return False
+
+    def _drop_owner(self, owner):
+        self._subs = [s for s in self._subs if s.owner is not owner]
+        try:
+            self._reschedule()
+        except RuntimeError:
+            # 程序退出时定时器可能先于订阅者被销毁
+            pass
+
+    def _runnable(self) -> List[FrameSubscription]:
+        runnable = []
+        for sub in self._subs:
+            if not sub.active:
+                continue
+            try:
+                visible = sub.owner.isVisible()
+            except RuntimeError:
+                # C++ 对象已被销毁
+                visible = False
+            if visible:
+                runnable.append(sub)
+        return runnable
+
+    def _reschedule(self):
+        runnable = self._runnable()
+        if not runnable:
+            self._timer.stop()
+            return
+        interval = max(1, int(min(sub.period for sub in runnable) * 1000))
+        if not self._timer.isActive() or self._timer.interval() != interval:
+            self._timer.start(interval)
+
+    def _tick(self):
+        now = time.monotonic()
+        runnable = self._runnable()
+        if not runnable:
+            self._timer.stop()
+            return
+        # 允许半个时钟周期的提前量，避免周期略大于时钟间隔的订阅被推迟一整帧
+        slack = self._timer.interval() / 2000
+        for sub in runnable:
+            if not sub.active or now + slack < sub.next_due:
+                continue
+            sub.next_due += sub.period
+            if sub.next_due < now:
+                # 暂停过 (或严重落后) 的订阅恢复时不补帧
+                sub.next_due = now + sub.period
+            try:
+                sub.callback()
+            except Exception as e:
+                print(f"Frame Error: {e}")
+        self._reschedule()
@@ -0,0 +1,39 @@
+# qt_frontend/lazy_tab.py
+# 延迟构建的选项卡页面：第一次显示时才创建内容（以及内容中的定时器、工作线程）
+
+from typing import Callable
+
+from PyQt6.QtWidgets import QTabWidget, QVBoxLayout, QWidget
+
+
+class LazyTab(QWidget):
+    """
+    选项卡占位页面。
+    页面对象在启动时就加入 QTabWidget（选项卡顺序和页面引用保持不变），
+    builder(page) 在页面第一次成为当前页时调用，向 page.layout() 中添加实际内容。
+    """
+
+    def __init__(self, builder: Callable[['LazyTab'], None], parent=None):
+        super().__init__(parent)
+        self._builder = builder
+        self.built = False
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+    def ensure_built(self):
+        if not self.built:
+            self.built = True
+            self._builder(self)
+
+
+def install_lazy_tabs(tab_widget: QTabWidget):
+    """
+    切换到尚未构建的页面时先构建它。
+    需要在其他 currentChanged 处理函数之前调用，保证它们看到的是已构建的页面。
+    """
+    def on_current_changed(index):
+        page = tab_widget.widget(index)
+        if isinstance(page, LazyTab):
+            page.ensure_built()
+
+    tab_widget.currentChanged.connect(on_current_changed)
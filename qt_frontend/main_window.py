@@ -3,20 +3,25 @@
 
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QTabWidget,
-    QTableWidget, QTableWidgetItem, QLabel, QPushButton, QStatusBar,
-    QGridLayout, QHeaderView, QGroupBox, QComboBox, QTextEdit
+    QTableView, QLabel, QPushButton, QStatusBar,
+    QGridLayout, QHeaderView, QGroupBox, QComboBox, QTextEdit, QCheckBox
 )
 from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QFont, QColor
-from collections import defaultdict
 
-from src.system_status import STATUS
 from src.process_model import ProcessState
 from qt_frontend.event_handler import EventHandler
+from qt_frontend.refresh_pipeline import RefreshPipeline
+from qt_frontend.process_table_model import ProcessTableModel, PROCESS_COLUMNS, ARCHIVE_COLUMNS
+from qt_frontend.engine_workers import EngineWorker
+from qt_frontend.status_snapshot import StatusSnapshotEngine
+from qt_frontend.lazy_tab import LazyTab, install_lazy_tabs
+from qt_frontend.frame_clock import FrameClock
 from src.modules_core.module_4_multicore_scheduler import SCHEDULER_MANAGER
-from config import REFRESH_INTERVAL_MS, NUM_CPUS
+from config import BACKGROUND_REFRESH_INTERVAL_MS, NUM_CPUS, ARCHIVE_PAGE_SIZE, RTOS_TICKLESS, RTOS_MUTEX_PROTOCOL
 
 from qt_frontend.visuals.qt_gantt_chart import QtGanttChart
+from qt_frontend.visuals.qt_analysis_panel import QtAnalysisPanel
 from qt_frontend.visuals.qt_process_states import QtProcessStates
 # 注意：这里导入了新的 QtSharedMemoryVisualization 类
 from qt_frontend.visuals.qt_ipc_visualization import QtIpcVisualization, QtSharedMemoryVisualization
@@ -45,13 +50,16 @@ class MainWindow(QMainWindow):
         """)
         
         self.init_process_tab()
-        self.init_state_diagram_tab()
-        self.init_scheduler_tab()
-        self.init_ipc_tab() # 这里会调用修改后的初始化函数
-        self.init_semaphore_tab()
-        self.init_memory_allocation_tab()
-        self.init_page_replacement_tab()
-        self.init_rtos_tab()
+        # 其余选项卡在第一次打开时才构建，其中的定时器和工作线程也随之启动
+        self.state_tab = self._add_lazy_tab(self.init_state_diagram_tab, "状态转换图")
+        self.scheduler_tab = self._add_lazy_tab(self.init_scheduler_tab, "调度甘特图与分析")
+        self.ipc_tab = self._add_lazy_tab(self.init_ipc_tab, "进程间通信 (IPC)")
+        self.semaphore_tab = self._add_lazy_tab(self.init_semaphore_tab, "信号量同步模型")
+        self.memory_allocation_tab = self._add_lazy_tab(self.init_memory_allocation_tab, "动态内存分配")
+        self.page_replacement_tab = self._add_lazy_tab(self.init_page_replacement_tab, "页面置换算法")
+        self.rtos_tab = self._add_lazy_tab(self.init_rtos_tab, "RTOS 逻辑分析仪")
+        # 必须先于刷新管线和控制台的 currentChanged 处理函数连接
+        install_lazy_tabs(self.tab_widget)
 
         main_layout.addWidget(self.tab_widget)
 
@@ -61,7 +69,12 @@ class MainWindow(QMainWindow):
 
         self.status_bar = QStatusBar()
         self.setStatusBar(self.status_bar)
+        # 刷新耗时统计 (鼠标悬停查看各页面的耗时)
+        self.lbl_frame_stats = QLabel()
+        self.lbl_frame_stats.setStyleSheet("color: #7F8C8D;")
+        self.status_bar.addPermanentWidget(self.lbl_frame_stats)
 
+        self.setup_refresh_pipeline()
         self.setup_connections()
         
         # 设置初始算法
@@ -76,6 +89,11 @@ class MainWindow(QMainWindow):
         # 初始显示第一个选项卡的控制台
         self.on_tab_changed(0)
 
+    def _add_lazy_tab(self, builder, title):
+        page = LazyTab(builder)
+        self.tab_widget.addTab(page, title)
+        return page
+
     def auto_init_processes(self):
         print("System Auto-Init: Generating 10 processes...")
         self.event_handler.create_test_processes()
@@ -85,26 +103,66 @@ class MainWindow(QMainWindow):
         self.process_page = QWidget()
         layout = QVBoxLayout(self.process_page)
         
-        self.process_table = QTableWidget()
-        self.process_table.setColumnCount(7)
-        self.process_table.setHorizontalHeaderLabels([
-            "PID", "状态", "到达时间", "总需时间", "剩余时间", "优先级", "等待时间"
-        ])
+        # Model/View：模型只通知变化的行，视图只格式化可见单元格
+        # 活跃进程与归档分页各用一个模型，切换时只更换视图的模型
+        self.process_model = ProcessTableModel(PROCESS_COLUMNS, self)
+        self.archive_model = ProcessTableModel(ARCHIVE_COLUMNS, self)
+        self.process_table = QTableView()
+        self.process_table.setModel(self.process_model)
         self.process_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        # 固定行高，避免大数据量下逐行计算尺寸
+        self.process_table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.process_table.verticalHeader().setDefaultSectionSize(24)
         self.process_table.setAlternatingRowColors(True)
-        self.process_table.setStyleSheet("QTableWidget { selection-background-color: #D6EAF8; selection-color: black; }")
+        self.process_table.setStyleSheet("QTableView { selection-background-color: #D6EAF8; selection-color: black; }")
         layout.addWidget(self.process_table)
+
+        # 归档浏览：按需分页查看已终止进程
+        archive_bar = QHBoxLayout()
+        self.archive_toggle = QCheckBox("显示已归档进程")
+        self.archive_toggle.toggled.connect(self.on_archive_toggled)
+        self.btn_archive_prev = QPushButton("上一页")
+        self.btn_archive_next = QPushButton("下一页")
+        self.lbl_archive_page = QLabel("已归档: 0")
+        self.btn_archive_prev.clicked.connect(lambda: self.change_archive_page(-1))
+        self.btn_archive_next.clicked.connect(lambda: self.change_archive_page(1))
+        archive_bar.addWidget(self.archive_toggle)
+        archive_bar.addStretch(1)
+        archive_bar.addWidget(self.lbl_archive_page)
+        archive_bar.addWidget(self.btn_archive_prev)
+        archive_bar.addWidget(self.btn_archive_next)
+        layout.addLayout(archive_bar)
+        self.archive_page = 0
+        self._set_archive_controls_enabled(False)
         
         # 保存布局引用，用于动态添加/移除控制台
         self.process_tab_layout = layout
         
         self.tab_widget.addTab(self.process_page, "列表视图 (List View)")
 
-    def init_state_diagram_tab(self):
+    def _set_archive_controls_enabled(self, enabled):
+        self.btn_archive_prev.setEnabled(enabled)
+        self.btn_archive_next.setEnabled(enabled)
+
+    def on_archive_toggled(self, checked):
+        """切换列表视图的数据源：活跃进程 / 已归档进程"""
+        self.archive_page = 0
+        self._set_archive_controls_enabled(checked)
+        self.process_table.setModel(self.archive_model if checked else self.process_model)
+        self.snapshot_worker.call(self.snapshot_engine.set_archive_view, checked, 0)
+        self.refresh_pipeline.refresh(self.process_page)
+
+    def change_archive_page(self, step):
+        last_page = max(0, (self.archived_count - 1) // ARCHIVE_PAGE_SIZE)
+        self.archive_page = min(max(0, self.archive_page + step), last_page)
+        self.snapshot_worker.call(self.snapshot_engine.set_archive_view, True, self.archive_page)
+        self.refresh_pipeline.refresh(self.process_page)
+
+    def init_state_diagram_tab(self, page):
         # 创建一个容器布局，同时包含状态图和控制台
         container_widget = QWidget()
         container_layout = QVBoxLayout(container_widget)
-        
+
         # 添加状态图
         self.state_page = QtProcessStates()
         container_layout.addWidget(self.state_page)
@@ -112,9 +170,10 @@ class MainWindow(QMainWindow):
         # 保存布局引用，用于动态添加/移除控制台
         self.state_tab_layout = container_layout
         
-        self.tab_widget.addTab(container_widget, "状态转换图")
+        page.layout().addWidget(container_widget)
+        self.refresh_pipeline.add_tab(page, 'states', self.update_state_diagram)
 
-    def init_scheduler_tab(self):
+    def init_scheduler_tab(self, page):
         self.scheduler_page = QWidget()
         main_layout = QVBoxLayout(self.scheduler_page)
         main_layout.setSpacing(10)
@@ -135,11 +194,9 @@ class MainWindow(QMainWindow):
         analysis_layout.setSpacing(5)
         analysis_group.setMaximumWidth(350)  # 保持分析报告的宽度
         
-        self.analysis_text = QTextEdit()
-        self.analysis_text.setReadOnly(True)
-        self.analysis_text.setStyleSheet("background-color: #FDFEFE; font-family: Consolas; font-size: 9.5pt; border: 1px solid #E0E0E0; border-radius: 3px;")  # 增大字体大小
-        self.analysis_text.setMinimumHeight(530)  # 保持分析文本框高度
-        analysis_layout.addWidget(self.analysis_text)
+        self.analysis_panel = QtAnalysisPanel()
+        self.analysis_panel.setMinimumHeight(530)  # 保持分析面板高度
+        analysis_layout.addWidget(self.analysis_panel)
         
         upper_layout.addWidget(analysis_group, 1)  # 保持分析报告的权重
         
@@ -157,17 +214,25 @@ class MainWindow(QMainWindow):
         
         for lbl in [self.metric_cpu, self.metric_wait, self.metric_turnaround]:
             lbl.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            lbl.setStyleSheet("font-weight: bold; font-size: 9pt; border: 1px solid #E0E0E0; padding: 8px 12px; border-radius: 4px; margin: 1px;")  # 调整内边距，使框与字体比例协调
+            lbl.setStyleSheet(self._metric_style('#FFFFFF'))
             lbl.setMinimumWidth(150)  # 设置相同的最小宽度
             lbl.setFixedHeight(60)  # 设置固定高度，确保三个框高度一致
             metrics_layout.addWidget(lbl)
+        self.metric_cpu.setStyleSheet(self._metric_style('#F9E79F'))
+        self._cpu_busy = False  # CPU 利用率是否超过 50%，只在状态翻转时更换样式
         
         main_layout.addWidget(metrics_group)
 
         # 保存布局引用，用于动态添加/移除控制台
         self.scheduler_tab_layout = main_layout
 
-        self.tab_widget.addTab(self.scheduler_page, "调度甘特图与分析")
+        page.layout().addWidget(self.scheduler_page)
+        self.refresh_pipeline.add_tab(page, 'scheduler', self.update_scheduler_view)
+
+    @staticmethod
+    def _metric_style(background):
+        # 调整内边距，使框与字体比例协调
+        return f"font-weight: bold; font-size: 9pt; border: 1px solid #E0E0E0; padding: 8px 12px; border-radius: 4px; margin: 1px; background-color: {background};"
 
     def init_control_panel(self):
         panel = QGroupBox("控制台")
@@ -215,25 +280,10 @@ class MainWindow(QMainWindow):
         self.btn_create.clicked.connect(self.event_handler.create_single_process)
         self.btn_start.clicked.connect(self.event_handler.start_simulation)
         self.btn_stop.clicked.connect(self.event_handler.stop_all_simulations)
-        
-        # IPC: 消息队列连接
-        self.start_ipc_button.clicked.connect(self.event_handler.start_ipc_simulation)
-        self.stop_ipc_button.clicked.connect(self.event_handler.stop_ipc_simulation)
-        self.reset_ipc_button.clicked.connect(self.event_handler.reset_ipc_simulation)
-        
-        # IPC: 共享内存连接 (新增)
-        self.start_shm_button.clicked.connect(self.event_handler.start_shm_simulation)
-        self.stop_shm_button.clicked.connect(self.event_handler.stop_shm_simulation)
-        
-        # RTOS 模拟按钮连接
-        self.start_rtos_button.clicked.connect(self.event_handler.start_rtos_simulation)
-        self.stop_rtos_button.clicked.connect(self.event_handler.stop_rtos_simulation)
-        self.reset_rtos_button.clicked.connect(self.event_handler.reset_rtos_simulation)
 
-        self.timer = QTimer(self)
-        self.timer.setInterval(REFRESH_INTERVAL_MS)
-        self.timer.timeout.connect(self.update_process_status)
-        self.timer.start()
+        self.refresh_pipeline.start()
+
+        self.frame_stats_timer = FrameClock.instance().subscribe(self.lbl_frame_stats, self.update_frame_stats, fps=1)
 
     def on_tab_changed(self, index):
         """选项卡切换时更新系统状态显示并动态显示/隐藏控制台"""
@@ -252,7 +302,7 @@ class MainWindow(QMainWindow):
         elif index == 2:  # 调度甘特图与分析
             self.scheduler_tab_layout.addWidget(self.shared_control_panel)
 
-    def init_ipc_tab(self):
+    def init_ipc_tab(self, page):
         """初始化进程间通信(IPC)选项卡 - 修改版：支持多种IPC模式"""
         self.ipc_page = QWidget()
         main_layout = QVBoxLayout(self.ipc_page)
@@ -330,30 +380,41 @@ class MainWindow(QMainWindow):
         self.ipc_sub_tabs.addTab(self.shm_tab, "共享内存")
         
         main_layout.addWidget(self.ipc_sub_tabs)
-        self.tab_widget.addTab(self.ipc_page, "进程间通信 (IPC)")
+        page.layout().addWidget(self.ipc_page)
+
+        # IPC: 消息队列连接
+        self.start_ipc_button.clicked.connect(self.event_handler.start_ipc_simulation)
+        self.stop_ipc_button.clicked.connect(self.event_handler.stop_ipc_simulation)
+        self.reset_ipc_button.clicked.connect(self.event_handler.reset_ipc_simulation)
+        # 消息队列由其工作线程直接推送增量
+        self.ipc_visualization.queue_changed.connect(self.update_ipc_display)
+        
+        # IPC: 共享内存连接 (新增)
+        self.start_shm_button.clicked.connect(self.event_handler.start_shm_simulation)
+        self.stop_shm_button.clicked.connect(self.event_handler.stop_shm_simulation)
     
-    def init_semaphore_tab(self):
+    def init_semaphore_tab(self, page):
         """初始化信号量同步机制选项卡"""
         # 实例化新的可视化类
         self.semaphore_page = QtSemaphoreVisualization()
         # 注意：这里我们不需要再手动布局，因为QtSemaphoreVisualization继承自QWidget且内部已经有了Layout
-        self.tab_widget.addTab(self.semaphore_page, "信号量同步模型")
+        page.layout().addWidget(self.semaphore_page)
     
-    def init_memory_allocation_tab(self):
+    def init_memory_allocation_tab(self, page):
         """初始化动态内存分配选项卡"""
         # 实例化新的可视化类
         self.memory_allocation_page = QtMemoryAllocation()
-        self.tab_widget.addTab(self.memory_allocation_page, "动态内存分配")
+        page.layout().addWidget(self.memory_allocation_page)
     
-    def init_page_replacement_tab(self):
+    def init_page_replacement_tab(self, page):
         """初始化页面置换算法选项卡"""
         # 实例化新的可视化类
         self.page_replacement_page = QtPageReplacement()
-        self.tab_widget.addTab(self.page_replacement_page, "页面置换算法")
+        page.layout().addWidget(self.page_replacement_page)
 
     # ... 在 MainWindow 类中 ...
     
-    def init_rtos_tab(self):
+    def init_rtos_tab(self, page):
         """初始化RTOS任务切换可视化选项卡 (Pro 版集成)"""
         self.rtos_page = QWidget()
         main_layout = QVBoxLayout(self.rtos_page)
@@ -378,7 +439,30 @@ class MainWindow(QMainWindow):
         self.reset_rtos_button = QPushButton("⏹ 重置")
         self.reset_rtos_button.setStyleSheet("background-color: #C0392B; color: white; font-weight: bold;")
         
+        # 调度策略：固定优先级 (原有行为，随机非周期任务) 或周期任务集上的 RM / EDF
+        self.rtos_policy_combo = QComboBox()
+        self.rtos_policy_combo.addItem("固定优先级", "PRIORITY")
+        self.rtos_policy_combo.addItem("RM (速率单调)", "RM")
+        self.rtos_policy_combo.addItem("EDF (最早截止期)", "EDF")
+        self.rtos_policy_combo.setToolTip("任务集在重置后的下一次启动时按所选策略重新生成")
+
+        # 互斥量协议 (EDF 下固定使用普通互斥量)
+        self.rtos_mutex_combo = QComboBox()
+        self.rtos_mutex_combo.addItem("普通互斥量", "NONE")
+        self.rtos_mutex_combo.addItem("优先级继承", "INHERIT")
+        self.rtos_mutex_combo.addItem("优先级天花板", "CEILING")
+        self.rtos_mutex_combo.setCurrentIndex(self.rtos_mutex_combo.findData(RTOS_MUTEX_PROTOCOL))
+        self.rtos_mutex_combo.setToolTip("互斥量在重置后的下一次启动时按所选协议重新创建")
+
+        # 无节拍模式：所有任务都阻塞时直接跳到下一个定时器到期的时间片
+        self.rtos_tickless_check = QCheckBox("Tickless")
+        self.rtos_tickless_check.setChecked(RTOS_TICKLESS)
+        self.rtos_tickless_check.setToolTip("所有任务都阻塞时跳过空闲时间片，直接推进到下一个定时器到期 (下一次启动时生效)")
+
         control_layout.addWidget(lbl)
+        control_layout.addWidget(self.rtos_policy_combo)
+        control_layout.addWidget(self.rtos_mutex_combo)
+        control_layout.addWidget(self.rtos_tickless_check)
         control_layout.addWidget(self.start_rtos_button)
         control_layout.addWidget(self.stop_rtos_button)
         control_layout.addWidget(self.reset_rtos_button)
@@ -393,206 +477,165 @@ class MainWindow(QMainWindow):
 
 
 
-        self.tab_widget.addTab(self.rtos_page, "RTOS 逻辑分析仪")
+        page.layout().addWidget(self.rtos_page)
 
-    def update_ipc_display(self):
-        """更新IPC可视化显示"""
-        with STATUS._lock:
-            # 更新消息队列文字显示
-            queue_content = "\n".join([f"[消息] {msg}" for msg in STATUS.message_queue])
-            if not queue_content:
-                queue_content = "[空队列]"
-            self.queue_status.setPlainText(queue_content)
-            
-            # 使用动画组件更新可视化效果
-            if hasattr(self, 'ipc_visualization'):
-                self.ipc_visualization.update_visualization(STATUS.message_queue)
-            
-            # 共享内存部分通常由其自身的定时器更新，但如果需要同步可以在这里调用
-            pass
+        # RTOS 模拟按钮连接
+        self.start_rtos_button.clicked.connect(self.event_handler.start_rtos_simulation)
+        self.stop_rtos_button.clicked.connect(self.event_handler.stop_rtos_simulation)
+        self.reset_rtos_button.clicked.connect(self.event_handler.reset_rtos_simulation)
+        # RTOS 日志按增量推进，隐藏时也保持低频同步，避免切回时积压
+        self.refresh_pipeline.add_tab(page, 'rtos', self.update_rtos_view, BACKGROUND_REFRESH_INTERVAL_MS)
+
+    def setup_refresh_pipeline(self):
+        """
+        注册各选项卡的刷新函数：只刷新可见页面，隐藏页面按需低频刷新。
+        全局状态由快照工作线程读取，GUI 线程只接收快照，不持有 STATUS._lock。
+        """
+        self.archived_count = 0
+        self.snapshot_engine = StatusSnapshotEngine()
+        self.snapshot_worker = EngineWorker(self.snapshot_engine, name="snapshot")
+        self.snapshot_worker.deltas_ready.connect(self.on_snapshots)
+        self.snapshot_worker.start()
+
+        self.refresh_pipeline = RefreshPipeline(self.tab_widget, self.request_snapshot)
+        self.refresh_pipeline.add_global(self.update_control_labels)
+        self.refresh_pipeline.add_tab(self.process_page, 'table', self.update_process_table)
+        # 其余页面在构建时注册 (见各 init_*_tab)
+
+    def request_snapshot(self, sections):
+        self.snapshot_worker.call(self.snapshot_engine.build, sections)
+
+    def on_snapshots(self, snapshots):
+        for snapshot in snapshots:
+            self.refresh_pipeline.deliver(snapshot)
 
     def update_process_status(self):
-        try:
-            with STATUS._lock:
-                all_procs = list(STATUS.all_processes.values())
-                
-                # 1. 表格
-                self.process_table.setRowCount(len(all_procs))
-                finished_count = 0
-                total_wait = 0
-                total_turnaround = 0
-                
-                for idx, p in enumerate(all_procs):
-                    self.process_table.setItem(idx, 0, QTableWidgetItem(str(p.pid)))
-                    state_str = p.state.value
-                    if p.state == ProcessState.RUNNING:
-                        # 检查对象是否有cpu_id属性（避免RTOS_Task对象出现AttributeError）
-                        if hasattr(p, 'cpu_id'):
-                            state_str += f" (Core {p.cpu_id})"
-                    self.process_table.setItem(idx, 1, QTableWidgetItem(state_str))
-                    self.process_table.setItem(idx, 2, QTableWidgetItem(f"{p.arrival_time}"))
-                    self.process_table.setItem(idx, 3, QTableWidgetItem(f"{p.burst_time}"))
-                    self.process_table.setItem(idx, 4, QTableWidgetItem(f"{p.remaining_time:.1f}"))
-                    self.process_table.setItem(idx, 5, QTableWidgetItem(str(p.priority)))
-                    self.process_table.setItem(idx, 6, QTableWidgetItem(f"{p.wait_time:.1f}"))
-
-                    if p.state == ProcessState.TERMINATED:
-                        finished_count += 1
-                        total_wait += p.wait_time
-                        total_turnaround += p.turnaround_time
-                        
-
-                # 2. 状态图
-                self.state_page.update_processes(all_procs)
-
-                # 3. 甘特图与分析
-                gantt_data = self._convert_cpu_history_to_gantt_data(STATUS.cpu_history, STATUS.global_timer)
-                self.gantt_chart.update_schedule_data(gantt_data)
-                
-                self._update_analysis_report(finished_count, total_wait, total_turnaround, len(all_procs))
-                
-                self.lbl_timer.setText(f"系统时间: {STATUS.global_timer:.1f}s")
-                self.lbl_queues.setText(f"就绪: {len(STATUS.ready_queue)} | 阻塞: {len(STATUS.blocked_queue)}")
-        
-                # 更新IPC显示
-                self.update_ipc_display()
-
-                # 更新RTOS时间轴
-                if hasattr(self, 'rtos_timeline'):
-                    self.rtos_timeline.update_timeline(STATUS.rtos_timeline)
-
-                # === 新增：RTOS 实时刷新逻辑 ===
-                # 只有当 RTOS 正在运行，且界面组件已创建时才更新
-                if STATUS.rtos_running and hasattr(self, 'rtos_timeline'):
-                    # 将最新的时间轴数据传递给组件，组件内部会自动分发给波形图和日志
-                    self.rtos_timeline.update_timeline(STATUS.rtos_timeline)
-
-        except Exception as e:
-            print(f"Update Error: {e}")
-
-    def _update_analysis_report(self, finished_count, total_wait, total_turnaround, total_procs):
+        """请求刷新界面：由事件处理器调用，多次请求会合并为一轮刷新"""
+        self.refresh_pipeline.request_refresh()
+
+    def update_frame_stats(self):
+        stats = self.refresh_pipeline.frame_stats()
+        self.lbl_frame_stats.setText(f"刷新间隔 {stats['interval_ms']}ms | 耗时 {stats['frame_ms']:.1f}ms")
+        detail = sorted(stats['updaters'].items(), key=lambda item: -item[1])
+        self.lbl_frame_stats.setToolTip("\n".join(f"{name}: {ms:.2f}ms" for name, ms in detail))
+
+    # 以下刷新函数由 RefreshPipeline 调用，只读取快照
+
+    def update_control_labels(self, snap):
+        self.archived_count = snap.archived_count
+        self.lbl_timer.setText(f"系统时间: {snap.global_timer:.1f}s")
+        self.lbl_queues.setText(f"就绪: {snap.ready_count} | 阻塞: {snap.blocked_count}")
+
+    def update_process_table(self, snap):
+        # 活跃进程表只应用增量；归档模式下同步当前页
+        if snap.archive_mode:
+            self.archive_model.sync(snap.archive_rows)
+            self.archive_page = snap.archive_page
+            last_page = max(0, (snap.archived_count - 1) // ARCHIVE_PAGE_SIZE)
+            self.lbl_archive_page.setText(f"已归档: {snap.archived_count} | 第 {snap.archive_page + 1}/{last_page + 1} 页")
+        else:
+            self.process_model.apply_delta(snap.table_upserts, snap.table_removed)
+            self.lbl_archive_page.setText(f"已归档: {snap.archived_count}")
+
+    def update_state_diagram(self, snap):
+        self.state_page.update_processes(snap.process_views, archived_count=snap.archived_count)
+
+    def update_scheduler_view(self, snap):
+        self.gantt_chart.update_schedule_data(snap.gantt_data)
+        self._update_analysis_report(snap)
+
+    def update_ipc_display(self, messages):
+        """更新消息队列日志 (由消息队列组件在队列变化时调用)"""
+        queue_content = "\n".join([f"[消息] {msg}" for msg in messages])
+        if not queue_content:
+            queue_content = "[空队列]"
+        self.queue_status.setPlainText(queue_content)
+
+    def update_rtos_view(self, snap):
+        # 快照中的新增事件、任务和寄存器由组件内部分发给波形图、日志和 TCB 表
+        self.rtos_timeline.apply_snapshot(snap)
+
+    def _update_analysis_report(self, snap):
         algo = self.algorithm_selector.currentText()
-        avg_wait = total_wait / finished_count if finished_count > 0 else 0.0
-        avg_turnaround = total_turnaround / finished_count if finished_count > 0 else 0.0
-        
-        # 计算更详细的性能指标
-        active_cores = sum(1 for p in STATUS.running_processes.values() if p is not None)
-        cpu_util = (active_cores / NUM_CPUS) * 100
-        
-        # 计算各状态进程数量
-        state_counts = {}
-        for state in ProcessState:
-            state_counts[state] = sum(1 for p in STATUS.all_processes.values() if p.state == state)
-        
-        # 计算平均响应时间
-        total_response = 0.0
-        response_count = 0
-        for p in STATUS.all_processes.values():
-            if p.response_time is not None:
-                total_response += p.response_time
-                response_count += 1
-        avg_response = total_response / response_count if response_count > 0 else 0.0
-        
-        # 更新性能指标面板
-        self.metric_cpu.setText(f"CPU 利用率\n{cpu_util:.1f}%")
-        self.metric_wait.setText(f"平均等待\n{avg_wait:.2f}s")
-        self.metric_turnaround.setText(f"平均周转\n{avg_turnaround:.2f}s")
-        
-        # 确保三个指标使用相同的样式，保持大小一致
-        for lbl in [self.metric_cpu, self.metric_wait, self.metric_turnaround]:
-            lbl.setStyleSheet(f"font-weight: bold; font-size: 9pt; border: 1px solid #E0E0E0; padding: 8px 12px; border-radius: 4px; margin: 1px; background-color: {'#ABEBC6' if lbl is self.metric_cpu and cpu_util > 50 else '#F9E79F' if lbl is self.metric_cpu else '#FFFFFF'}; ")
-            lbl.setMinimumWidth(150)
-            lbl.setFixedHeight(60)
-
-        # 生成详细的分析报告
-        report = f"""
-        <h3 style='color:#2E86C1; margin-bottom:5px;'>算法实时分析: {algo}</h3>
-        
-        <p><b>系统总体状态:</b></p>
-        <ul>
-            <li><b>时间:</b> {STATUS.global_timer:.1f}s</li>
-            <li><b>进程总数:</b> {total_procs}个</li>
-            <li><b>已完成:</b> {finished_count}个 ({(finished_count/total_procs*100 if total_procs > 0 else 0):.1f}%)</li>
-            <li><b>就绪队列:</b> {len(STATUS.ready_queue)}个进程</li>
-            <li><b>阻塞队列:</b> {len(STATUS.blocked_queue)}个进程</li>
-        </ul>
-        
-        <p><b>进程状态分布:</b></p>
-        <ul>
-            <li><b>新建:</b> {state_counts.get(ProcessState.NEW, 0)}个</li>
-            <li><b>就绪:</b> {state_counts.get(ProcessState.READY, 0)}个</li>
-            <li><b>运行:</b> {state_counts.get(ProcessState.RUNNING, 0)}个</li>
-            <li><b>阻塞:</b> {state_counts.get(ProcessState.BLOCKED, 0)}个</li>
-            <li><b>终止:</b> {state_counts.get(ProcessState.TERMINATED, 0)}个</li>
-        </ul>
-        
-        <p><b>性能指标:</b></p>
-        <ul>
-            <li><b>CPU利用率:</b> {cpu_util:.1f}%</li>
-            <li><b>平均等待时间:</b> {avg_wait:.2f}s</li>
-            <li><b>平均周转时间:</b> {avg_turnaround:.2f}s</li>
-            <li><b>平均响应时间:</b> {avg_response:.2f}s</li>
-        </ul>
-        
-        <p><b>算法特性分析:</b></p>
-        <ul>
-        """
-        
+        stats = snap.analysis
+        finished_count = stats['finished_count']
+        total_procs = stats['total_procs']
+        avg_wait = stats['total_wait'] / finished_count if finished_count > 0 else 0.0
+        avg_turnaround = stats['total_turnaround'] / finished_count if finished_count > 0 else 0.0
+        cpu_util = stats['cpu_util']
+        state_counts = stats['state_counts']
+        avg_response = stats['avg_response']
+        
+        # 更新性能指标面板 (文字相同时不重设，样式只在阈值翻转时重设)
+        for lbl, text in ((self.metric_cpu, f"CPU 利用率\n{cpu_util:.1f}%"),
+                          (self.metric_wait, f"平均等待\n{avg_wait:.2f}s"),
+                          (self.metric_turnaround, f"平均周转\n{avg_turnaround:.2f}s")):
+            if lbl.text() != text:
+                lbl.setText(text)
+        cpu_busy = cpu_util > 50
+        if cpu_busy != self._cpu_busy:
+            self._cpu_busy = cpu_busy
+            self.metric_cpu.setStyleSheet(self._metric_style('#ABEBC6' if cpu_busy else '#F9E79F'))
+
+        # 更新分析报告
+        panel = self.analysis_panel
+        panel.set_title(algo)
+        panel.update_values({
+            'time': f"{snap.global_timer:.1f}s",
+            'total': f"{total_procs}个",
+            'finished': f"{finished_count}个 ({(finished_count/total_procs*100 if total_procs > 0 else 0):.1f}%)",
+            'ready': f"{snap.ready_count}个进程",
+            'blocked': f"{snap.blocked_count}个进程",
+            'new': f"{state_counts[ProcessState.NEW]}个",
+            'state_ready': f"{state_counts[ProcessState.READY]}个",
+            'running': f"{state_counts[ProcessState.RUNNING]}个",
+            'state_blocked': f"{state_counts[ProcessState.BLOCKED]}个",
+            'terminated': f"{state_counts[ProcessState.TERMINATED]}个",
+            'cpu_util': f"{cpu_util:.1f}%",
+            'avg_wait': f"{avg_wait:.2f}s",
+            'avg_turnaround': f"{avg_turnaround:.2f}s",
+            'avg_response': f"{avg_response:.2f}s",
+        })
+        panel.set_notes(self._algorithm_notes(algo, stats, avg_wait))
+
+    def _algorithm_notes(self, algo, stats, avg_wait):
+        """算法特性分析条目：[(级别, 文字), ...]"""
+        notes = []
         if algo == 'FCFS':
-            report += "<li><b>公平性:</b> 严格按到达顺序，无饥饿风险。</li>"
-            long_job_waiting = any(p.remaining_time > 10 and p.state == ProcessState.READY for p in STATUS.all_processes.values())
-            if long_job_waiting:
-                report += "<li style='color:red'><b>警报:</b> 检测到长作业等待，可能存在护航效应！</li>"
-            elif cpu_util < 30:
-                report += "<li style='color:orange'><b>注意:</b> CPU利用率较低，系统资源利用率不高。</li>"
+            notes.append(('normal', "<b>公平性:</b> 严格按到达顺序，无饥饿风险。"))
+            if stats['long_job_waiting']:
+                notes.append(('alert', "<b>警报:</b> 检测到长作业等待，可能存在护航效应！"))
+            elif stats['cpu_util'] < 30:
+                notes.append(('warning', "<b>注意:</b> CPU利用率较低，系统资源利用率不高。"))
             else:
-                report += "<li><b>状态:</b> 队列流动正常，系统运行稳定。</li>"
+                notes.append(('normal', "<b>状态:</b> 队列流动正常，系统运行稳定。"))
         elif algo == 'RR':
-            report += "<li><b>响应性:</b> 极佳。所有就绪进程轮流执行。</li>"
-            report += "<li><b>开销:</b> 上下文切换频繁，适合交互式系统。</li>"
+            notes.append(('normal', "<b>响应性:</b> 极佳。所有就绪进程轮流执行。"))
+            notes.append(('normal', "<b>开销:</b> 上下文切换频繁，适合交互式系统。"))
             if avg_wait > 5:
-                report += "<li style='color:orange'><b>注意:</b> 平均等待时间较长，可能需要调整时间片大小。</li>"
+                notes.append(('warning', "<b>注意:</b> 平均等待时间较长，可能需要调整时间片大小。"))
         elif algo == 'Priority':
-            report += "<li><b>优先级:</b> 高优先级先行，资源分配灵活。</li>"
+            notes.append(('normal', "<b>优先级:</b> 高优先级先行，资源分配灵活。"))
             # 检查是否有饥饿风险
-            low_prio_starving = any(p.priority > 5 and p.wait_time > 10 and p.state == ProcessState.READY for p in STATUS.all_processes.values())
-            if low_prio_starving:
-                report += "<li style='color:red'><b>警报:</b> 检测到低优先级进程可能存在饥饿！</li>"
+            if stats['low_prio_starving']:
+                notes.append(('alert', "<b>警报:</b> 检测到低优先级进程可能存在饥饿！"))
             else:
-                report += "<li><b>状态:</b> 进程调度符合优先级策略。</li>"
+                notes.append(('normal', "<b>状态:</b> 进程调度符合优先级策略。"))
         elif algo == 'SJF':
-            report += "<li><b>效率:</b> 理论等待时间最优，吞吐量高。</li>"
-            report += "<li><b>局限性:</b> 可能导致长作业饥饿。</li>"
-            long_job_starving = any(p.burst_time > 10 and p.wait_time > 15 and p.state == ProcessState.READY for p in STATUS.all_processes.values())
-            if long_job_starving:
-                report += "<li style='color:orange'><b>注意:</b> 检测到长作业可能存在饥饿风险。</li>"
-        
-        report += "</ul>"
-        self.analysis_text.setHtml(report)
-
-    def _convert_cpu_history_to_gantt_data(self, history, current_time):
-        data = defaultdict(list)
-        for cpu_id, events in history.items():
-            start_t = 0
-            curr_pid = -1
-            sorted_events = sorted(events, key=lambda x: x['time'])
-            
-            for ev in sorted_events:
-                t, pid, type_ = ev['time'], ev['pid'], ev['event']
-                if curr_pid != -1 and t > start_t:
-                    data[cpu_id].append({'pid': curr_pid, 'start': start_t, 'end': t})
-                
-                if type_ == "RUNNING":
-                    curr_pid = pid
-                    start_t = t
-                else:
-                    curr_pid = -1
-                    start_t = t
-            
-            if curr_pid != -1 and current_time > start_t:
-                data[cpu_id].append({'pid': curr_pid, 'start': start_t, 'end': current_time})
-        return dict(data)
+            notes.append(('normal', "<b>效率:</b> 理论等待时间最优，吞吐量高。"))
+            notes.append(('normal', "<b>局限性:</b> 可能导致长作业饥饿。"))
+            if stats['long_job_starving']:
+                notes.append(('warning', "<b>注意:</b> 检测到长作业可能存在饥饿风险。"))
+        return notes
 
     def closeEvent(self, event):
         SCHEDULER_MANAGER.stop_schedulers()
+        self.refresh_pipeline.stop()
+        self.snapshot_worker.stop()
+        # IPC 页面打开过才有工作线程
+        if hasattr(self, 'ipc_visualization'):
+            self.ipc_visualization.worker.stop()
+            self.shm_visualization.worker.stop()
+        if hasattr(self, 'semaphore_page'):
+            self.semaphore_page.worker.stop()
         event.accept()
\ No newline at end of file
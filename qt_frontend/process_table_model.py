@@ -0,0 +1,199 @@
+# qt_frontend/process_table_model.py
+# 列表视图的数据模型：基于 QAbstractTableModel，只通知真正变化的行和单元格
+
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+from src.process_model import Process, ProcessState
+
+
+_RUNNING = ProcessState.RUNNING
+
+
+def _format_state(value):
+    # 运行中的进程签名为 (state, cpu_id)，其余为 state 本身
+    if isinstance(value, tuple):
+        state, cpu_id = value
+        return f"{state.value} (Core {cpu_id})"
+    return value.value
+
+
+def _format_tenths(value):
+    # 签名中按 0.1 精度保存为整数，避免每次刷新都做浮点取整和格式化
+    return f"{value / 10:.1f}"
+
+
+def _format_1f(value):
+    return f"{value:.1f}"
+
+
+# 列定义：(表头, 格式化函数)。行签名的第 i 个元素对应第 i 列。
+PROCESS_COLUMNS: List[Tuple[str, Callable]] = [
+    ("PID", str), ("状态", _format_state), ("到达时间", str), ("总需时间", str),
+    ("剩余时间", _format_tenths), ("优先级", str), ("等待时间", _format_tenths),
+]
+
+ARCHIVE_COLUMNS: List[Tuple[str, Callable]] = [
+    ("PID", str), ("到达时间", str), ("总需时间", str), ("等待时间", _format_1f),
+    ("周转时间", _format_1f), ("响应时间", _format_1f), ("完成时间", _format_1f),
+]
+
+
+def process_signature(p: Process) -> tuple:
+    """
+    生成进程的行签名（原始值，不做字符串格式化）。
+    数值按显示精度取整，使不影响显示的微小变化不会触发重绘。
+    """
+    state = p.state
+    if state is _RUNNING:
+        # 检查对象是否有cpu_id属性（避免RTOS_Task对象出现AttributeError）
+        cpu_id = getattr(p, 'cpu_id', None)
+        if cpu_id is not None:
+            state = (state, cpu_id)
+    return (
+        p.pid, state, p.arrival_time, p.burst_time,
+        int(p.remaining_time * 10 + 0.5), p.priority, int(p.wait_time * 10 + 0.5)
+    )
+
+
+def archive_signature(row: tuple) -> tuple:
+    """归档行 (pid, 到达, 总需, 优先级, 等待, 周转, 响应, 完成) -> 行签名"""
+    pid, arrival, burst, _prio, wait, turnaround, response, finish = row
+    return (pid, arrival, burst, round(wait, 1), round(turnaround, 1), round(response, 1), round(finish, 1))
+
+
+class ProcessTableModel(QAbstractTableModel):
+    """
+    进程表模型。
+    模型只保存每行的签名，单元格文字在视图真正需要显示时才格式化；
+    apply_delta() / sync() 按需发出 rowsRemoved / rowsInserted / dataChanged。
+    """
+
+    def __init__(self, columns=PROCESS_COLUMNS, parent=None):
+        super().__init__(parent)
+        self._columns = list(columns)
+        self._signatures: List[tuple] = []  # 每行的签名，sig[0] 为 PID
+        self._row_of: Dict[int, int] = {}   # {pid: 行号}
+
+    # --- Qt 模型接口 ---
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._signatures)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._columns)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+        formatter = self._columns[index.column()][1]
+        return formatter(self._signatures[index.row()][index.column()])
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self._columns[section][0]
+        return super().headerData(section, orientation, role)
+
+    # --- 数据同步 ---
+
+    def sync(self, signatures: Sequence[tuple]):
+        """
+        用完整的行签名列表同步模型 (用于归档分页等小数据量场景)：
+        对比出新增/变化的行与已不存在的行，再交给 apply_delta 处理。
+        """
+        row_of = self._row_of
+        current = self._signatures
+        upserts: List[tuple] = []
+        matched = 0
+        for sig in signatures:
+            row = row_of.get(sig[0])
+            if row is None:
+                upserts.append(sig)
+                continue
+            matched += 1
+            if current[row] != sig:
+                upserts.append(sig)
+
+        removed: List[int] = []
+        if matched < len(current):
+            new_keys = {sig[0] for sig in signatures}
+            removed = [sig[0] for sig in current if sig[0] not in new_keys]
+        self.apply_delta(upserts, removed)
+
+    def apply_delta(self, upserts: Sequence[tuple], removed: Sequence[int]):
+        """
+        应用增量：
+        1. 删除 removed 中的行（按连续区间从后向前删除）
+        2. upserts 中已存在的行就地更新，记录变化的列范围；新出现的行追加到末尾
+        3. 最后合并发出 dataChanged
+        """
+        if removed:
+            rows = sorted(self._row_of[pid] for pid in removed if pid in self._row_of)
+            if rows:
+                self._remove_rows(rows)
+
+        changed: List[Tuple[int, int, int]] = []  # (行, 起始列, 结束列)
+        appended: List[tuple] = []
+        for sig in upserts:
+            row = self._row_of.get(sig[0])
+            if row is None:
+                appended.append(sig)
+                continue
+            old = self._signatures[row]
+            first = last = -1
+            for col in range(len(sig)):
+                if old[col] != sig[col]:
+                    if first == -1:
+                        first = col
+                    last = col
+            if first == -1:
+                continue
+            self._signatures[row] = sig
+            changed.append((row, first, last))
+
+        if appended:
+            start = len(self._signatures)
+            self.beginInsertRows(QModelIndex(), start, start + len(appended) - 1)
+            for offset, sig in enumerate(appended):
+                self._row_of[sig[0]] = start + offset
+            self._signatures.extend(appended)
+            self.endInsertRows()
+
+        self._emit_changed(changed)
+
+    def _remove_rows(self, rows: List[int]):
+        # rows 已升序，合并为连续区间后从后向前删除，保证行号不失效
+        ranges = []
+        first = prev = rows[0]
+        for row in rows[1:]:
+            if row != prev + 1:
+                ranges.append((first, prev))
+                first = row
+            prev = row
+        ranges.append((first, prev))
+
+        for first, last in reversed(ranges):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self._signatures[first:last + 1]
+            self.endRemoveRows()
+
+        self._row_of = {sig[0]: row for row, sig in enumerate(self._signatures)}
+
+    def _emit_changed(self, changed: List[Tuple[int, int, int]]):
+        # 相邻的变化行合并为一次 dataChanged，列范围取并集
+        if not changed:
+            return
+        changed.sort()
+        run_first, first_col, last_col = changed[0]
+        run_last = run_first
+        for row, c0, c1 in changed[1:]:
+            if row == run_last + 1:
+                run_last = row
+                first_col = min(first_col, c0)
+                last_col = max(last_col, c1)
+                continue
+            self.dataChanged.emit(self.index(run_first, first_col), self.index(run_last, last_col))
+            run_first = run_last = row
+            first_col, last_col = c0, c1
+        self.dataChanged.emit(self.index(run_first, first_col), self.index(run_last, last_col))
@@ -0,0 +1,172 @@
+# qt_frontend/refresh_pipeline.py
+# 界面刷新管线：按选项卡可见性向快照线程请求数据，并把快照分发给各页面
+
+import time
+from typing import Callable, Dict, List, Optional, Set
+
+from PyQt6.QtCore import QTimer
+from PyQt6.QtWidgets import QTabWidget, QWidget
+
+from config import (
+    REFRESH_INTERVAL_MS, REFRESH_INTERVAL_MAX_MS, REFRESH_BUDGET_RATIO, REFRESH_TIMING_SMOOTHING,
+    SNAPSHOT_TIMEOUT_MS
+)
+
+
+class _TabUpdater:
+    """一个刷新项（全局刷新项的 page 和 section 为 None）"""
+
+    def __init__(self, page: Optional[QWidget], section: Optional[str],
+                 updater: Callable, background_ms: Optional[int]):
+        self.page = page
+        self.section = section  # 页面需要的快照分区
+        self.updater = updater
+        self.background_ms = background_ms  # 隐藏时的后台刷新间隔，None 表示隐藏时不刷新
+        self.last_run = 0.0
+        self.stale = True  # 自上次刷新以来是否错过了数据更新
+        self.name = getattr(updater, '__name__', repr(updater))
+
+
+class RefreshPipeline:
+    """
+    刷新管线。
+    - 每一帧先确定需要的快照分区：可见页面的分区，以及到了后台刷新时间的隐藏页面的分区，
+      然后通过 request_snapshot(sections) 异步请求快照；快照在工作线程中生成，
+      到达后由 deliver(snapshot) 分发给全局刷新项和对应页面的刷新函数
+    - 刷新函数只读取快照，不访问 STATUS，也不持有任何锁
+    - 被跳过的页面标记为过期，切换到过期页面时立即补请求一次
+
+    帧节奏：上一帧的快照到达并绘制完成后才安排下一帧，请求不会堆积；
+    绘制耗时超过预算 (间隔 * REFRESH_BUDGET_RATIO) 时拉长间隔，有余量时逐步恢复。
+    """
+
+    def __init__(self, tab_widget: QTabWidget, request_snapshot: Callable[[Set[str]], None]):
+        self._tab_widget = tab_widget
+        self._request_snapshot = request_snapshot
+        self._globals: List[_TabUpdater] = []
+        self._tabs: List[_TabUpdater] = []
+        self._forced: Set[str] = set()      # 下一帧必须包含的分区
+        self._outstanding = False           # 是否有尚未到达的快照请求
+        self._requested_at = 0.0
+        tab_widget.currentChanged.connect(self._on_current_changed)
+
+        self.interval_ms = REFRESH_INTERVAL_MS
+        self.frame_ms = 0.0                    # 每帧绘制耗时的平滑值
+        self.snapshot_ms = 0.0                 # 从请求到快照到达的平滑延迟
+        self._timings: Dict[str, float] = {}   # {刷新函数名: 平滑耗时 ms}
+        self._timer = QTimer(tab_widget)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._tick)
+
+    def add_global(self, updater: Callable):
+        self._globals.append(_TabUpdater(None, None, updater, None))
+
+    def add_tab(self, page: QWidget, section: str, updater: Callable, background_ms: Optional[int] = None):
+        """注册选项卡页面的刷新函数，page 为加入 QTabWidget 的页面，section 为其需要的快照分区"""
+        self._tabs.append(_TabUpdater(page, section, updater, background_ms))
+
+    # --- 帧节奏 ---
+
+    def start(self):
+        self._timer.start(self.interval_ms)
+
+    def stop(self):
+        self._timer.stop()
+
+    def request_refresh(self):
+        """请求尽快刷新；在下一帧执行前的多次请求合并为一次"""
+        if not self._outstanding and self._timer.remainingTime() != 0:
+            self._timer.start(0)
+
+    def refresh(self, page: QWidget):
+        """立即刷新指定页面（例如页面内的视图选项改变时）"""
+        for entry in self._tabs:
+            if entry.page is page:
+                self._forced.add(entry.section)
+        self.request_refresh()
+
+    def _tick(self):
+        now = time.monotonic()
+        if self._outstanding and (now - self._requested_at) * 1000 < SNAPSHOT_TIMEOUT_MS:
+            # 上一帧的快照还没到，本帧合并到那一帧
+            self._timer.start(self.interval_ms)
+            return
+
+        sections = set(self._forced)
+        self._forced.clear()
+        for entry in self._tabs:
+            if entry.page.isVisible():
+                sections.add(entry.section)
+            elif entry.background_ms is not None and (now - entry.last_run) * 1000 >= entry.background_ms:
+                sections.add(entry.section)
+
+        self._outstanding = True
+        self._requested_at = now
+        self._request_snapshot(sections)
+
+    def deliver(self, snapshot):
+        """快照到达 (GUI 线程)：分发给刷新函数，然后安排下一帧"""
+        now = time.monotonic()
+        if self._outstanding:
+            self.snapshot_ms = self._smooth(self.snapshot_ms, (now - self._requested_at) * 1000)
+        self._outstanding = False
+
+        start = time.perf_counter()
+        for entry in self._globals:
+            self._call(entry, snapshot)
+        for entry in self._tabs:
+            if entry.section in snapshot.sections:
+                self._call(entry, snapshot)
+                entry.last_run = now
+                entry.stale = False
+            else:
+                entry.stale = True
+        cost = (time.perf_counter() - start) * 1000
+        self.frame_ms = self._smooth(self.frame_ms, cost)
+
+        # 按预算调整间隔：超预算立即放慢，有余量时每帧最多加快 20%
+        target = min(REFRESH_INTERVAL_MAX_MS, max(REFRESH_INTERVAL_MS, self.frame_ms / REFRESH_BUDGET_RATIO))
+        if target > self.interval_ms:
+            self.interval_ms = int(target)
+        else:
+            self.interval_ms = int(max(target, self.interval_ms * 0.8))
+        if self._forced:
+            self._timer.start(0)
+        else:
+            self._timer.start(self.interval_ms)
+
+    def frame_stats(self) -> Dict[str, object]:
+        """刷新耗时统计：当前间隔、每帧绘制耗时、快照延迟以及各刷新函数的平滑耗时 (ms)"""
+        return {
+            'interval_ms': self.interval_ms,
+            'frame_ms': self.frame_ms,
+            'snapshot_ms': self.snapshot_ms,
+            'updaters': dict(self._timings),
+        }
+
+    @staticmethod
+    def _smooth(old: float, new: float) -> float:
+        if old == 0.0:
+            return new
+        return old + (new - old) * REFRESH_TIMING_SMOOTHING
+
+    # --- 刷新 ---
+
+    def _on_current_changed(self, index):
+        # 切换到的页面如果错过了更新，立即补请求
+        page = self._tab_widget.widget(index)
+        for entry in self._tabs:
+            if entry.page is page and entry.stale:
+                self._forced.add(entry.section)
+        if self._forced:
+            self.request_refresh()
+
+    def _call(self, entry: _TabUpdater, snapshot):
+        # 单个页面出错不影响其他页面的刷新
+        start = time.perf_counter()
+        try:
+            entry.updater(snapshot)
+        except Exception as e:
+            print(f"Update Error: {e}")
+        cost = (time.perf_counter() - start) * 1000
+        self._timings[entry.name] = self._smooth(self._timings.get(entry.name, 0.0), cost)
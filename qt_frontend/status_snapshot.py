@@ -0,0 +1,242 @@
+# qt_frontend/status_snapshot.py
+# 状态快照引擎：在工作线程中读取全局状态，生成界面所需的快照与增量
+
+from array import array
+from collections import defaultdict, namedtuple
+from typing import Dict, List, Optional
+
+from config import NUM_CPUS, ARCHIVE_PAGE_SIZE
+from src.system_status import STATUS
+from src.process_model import ProcessState
+from src.modules_extension import extension_rtos
+from src.modules_extension.rtos_nvic import irq_pid
+from qt_frontend.process_table_model import process_signature, archive_signature
+
+# 状态图使用的进程只读视图
+ProcessView = namedtuple('ProcessView', ['pid', 'state', 'remaining_time', 'cpu_id'])
+# RTOS 面板使用的任务只读视图
+# stack 为任务栈的 (峰值, 大小)，中断和没有任务栈的进程为 None
+RTOSTaskView = namedtuple('RTOSTaskView', ['pid', 'priority', 'state', 'is_isr', 'block_reason', 'stack'],
+                          defaults=(None,))
+
+
+class StatusSnapshot:
+    """
+    一次快照。全局字段每次都有，其余字段只在 sections 包含对应分区时填充：
+    - 'table': 活跃进程表的增量 (table_upserts / table_removed)，或归档模式下的归档分页
+    - 'states': 状态图使用的进程视图
+    - 'scheduler': 甘特图数据与分析指标
+    - 'rtos': 新增的 RTOS 事件、任务视图、寄存器与延迟统计
+    """
+
+    def __init__(self, sections):
+        self.sections = frozenset(sections)
+        self.global_timer = 0.0
+        self.ready_count = 0
+        self.blocked_count = 0
+        self.archived_count = 0
+
+        self.table_upserts: List[tuple] = []
+        self.table_removed: List[int] = []
+        self.archive_mode = False
+        self.archive_rows: List[tuple] = []
+        self.archive_page = 0
+
+        self.process_views: List[ProcessView] = []
+
+        self.gantt_data: Dict[int, List[Dict]] = {}
+        self.analysis: Dict[str, object] = {}
+
+        self.rtos_events: List[Dict] = []
+        self.rtos_reset = False
+        self.rtos_tasks: List[RTOSTaskView] = []
+        self.rtos_tasks_changed = False  # 任务视图与上一次发出的是否不同
+        self.rtos_registers: Optional[array] = None  # CPU 寄存器文件的副本 (整数，显示时再格式化)
+        self.rtos_cpu: Dict[str, object] = {}  # 上下文切换次数与周期统计
+        self.rtos_memory: Dict[str, Dict] = {}  # 主栈与任务栈内存池的使用情况
+        self.rtos_latency: Optional[Dict] = None  # 延迟统计汇总，没有新样本时为 None
+
+
+def convert_cpu_history_to_gantt_data(history, current_time):
+    """把各核心的调度事件转换为甘特图区间 {cpu_id: [{'pid', 'start', 'end'}, ...]}"""
+    data = defaultdict(list)
+    for cpu_id, events in history.items():
+        start_t = 0
+        curr_pid = -1
+        sorted_events = sorted(events, key=lambda x: x['time'])
+
+        for ev in sorted_events:
+            t, pid, type_ = ev['time'], ev['pid'], ev['event']
+            if curr_pid != -1 and t > start_t:
+                data[cpu_id].append({'pid': curr_pid, 'start': start_t, 'end': t})
+
+            if type_ == "RUNNING":
+                curr_pid = pid
+                start_t = t
+            else:
+                curr_pid = -1
+                start_t = t
+
+        if curr_pid != -1 and current_time > start_t:
+            data[cpu_id].append({'pid': curr_pid, 'start': start_t, 'end': current_time})
+    return dict(data)
+
+
+class StatusSnapshotEngine:
+    """
+    快照引擎，只在快照工作线程中使用。
+    持锁期间只复制需要的原始数据，排序、区间转换和增量对比都在释放锁之后完成。
+    活跃进程表以"上一次发出的内容"为基准计算增量，因此暂停某个分区后再恢复也不会丢失变化。
+    """
+
+    def __init__(self):
+        self._table: Dict[int, tuple] = {}  # 上一次发出的进程表 {pid: 行签名}
+        self._rtos_cursor = 0               # 已发出的最后一个 RTOS 事件 ID
+        self._rtos_generation = 0           # RTOS 事件缓冲区的 generation，变化说明已被清空
+        self._rtos_tasks: List[RTOSTaskView] = []
+        self._rtos_latency_samples = -1     # 上一次发出延迟统计时的样本总数
+        self.archive_mode = False
+        self.archive_page = 0
+
+    def set_archive_view(self, enabled, page=0):
+        self.archive_mode = enabled
+        self.archive_page = page
+        return []
+
+    def build(self, sections):
+        """生成一次快照，返回 [StatusSnapshot]"""
+        snap = StatusSnapshot(sections)
+        signatures = None
+        history = None
+
+        # 锁顺序与 RTOS 线程一致：先 rtos_lock，再 STATUS._lock
+        with extension_rtos.rtos_lock, STATUS._lock:
+            snap.global_timer = STATUS.global_timer
+            snap.ready_count = len(STATUS.ready_queue)
+            snap.blocked_count = len(STATUS.blocked_queue)
+            archive = STATUS.process_archive
+            snap.archived_count = len(archive)
+            processes = STATUS.all_processes.values()
+
+            if 'table' in sections:
+                snap.archive_mode = self.archive_mode
+                if self.archive_mode:
+                    last_page = max(0, (len(archive) - 1) // ARCHIVE_PAGE_SIZE)
+                    self.archive_page = min(self.archive_page, last_page)
+                    snap.archive_page = self.archive_page
+                    snap.archive_rows = archive.rows(self.archive_page * ARCHIVE_PAGE_SIZE, ARCHIVE_PAGE_SIZE)
+                else:
+                    signatures = [process_signature(p) for p in processes]
+
+            if 'states' in sections:
+                snap.process_views = [
+                    ProcessView(p.pid, p.state, p.remaining_time, getattr(p, 'cpu_id', None)) for p in processes
+                ]
+
+            if 'scheduler' in sections:
+                history = {cpu_id: list(events) for cpu_id, events in STATUS.cpu_history.items()}
+                snap.analysis = self._collect_analysis(processes, archive)
+
+            if 'rtos' in sections:
+                self._collect_rtos(snap, processes)
+
+        if signatures is not None:
+            self._diff_table(snap, signatures)
+        if history is not None:
+            snap.gantt_data = convert_cpu_history_to_gantt_data(history, snap.global_timer)
+        if snap.archive_rows:
+            snap.archive_rows = [archive_signature(row) for row in snap.archive_rows]
+        return [snap]
+
+    def _diff_table(self, snap, signatures):
+        previous = self._table
+        current = {}
+        for sig in signatures:
+            current[sig[0]] = sig
+            if previous.get(sig[0]) != sig:
+                snap.table_upserts.append(sig)
+        if len(current) != len(previous) or snap.table_upserts:
+            snap.table_removed = [pid for pid in previous if pid not in current]
+        self._table = current
+
+    @staticmethod
+    def _collect_analysis(processes, archive):
+        """一次遍历统计分析报告需要的全部指标 (调用方持有 STATUS._lock)"""
+        finished_count = len(archive)
+        state_counts = dict.fromkeys(ProcessState, 0)
+        state_counts[ProcessState.TERMINATED] = finished_count
+        total_response = archive.total_response
+        response_count = finished_count
+        long_job_waiting = low_prio_starving = long_job_starving = False
+        live_count = 0
+
+        for p in processes:
+            live_count += 1
+            state_counts[p.state] += 1
+            if p.response_time is not None:
+                total_response += p.response_time
+                response_count += 1
+            if p.state == ProcessState.READY:
+                if p.remaining_time > 10:
+                    long_job_waiting = True
+                if p.priority > 5 and p.wait_time > 10:
+                    low_prio_starving = True
+                if p.burst_time > 10 and p.wait_time > 15:
+                    long_job_starving = True
+
+        active_cores = sum(1 for p in STATUS.running_processes.values() if p is not None)
+        return {
+            'finished_count': finished_count,
+            'total_wait': archive.total_wait,
+            'total_turnaround': archive.total_turnaround,
+            'total_procs': live_count + finished_count,
+            'cpu_util': (active_cores / NUM_CPUS) * 100,
+            'state_counts': state_counts,
+            'avg_response': total_response / response_count if response_count > 0 else 0.0,
+            'long_job_waiting': long_job_waiting,
+            'low_prio_starving': low_prio_starving,
+            'long_job_starving': long_job_starving,
+        }
+
+    def _collect_rtos(self, snap, processes):
+        """复制新增的 RTOS 事件和任务状态 (调用方持有 rtos_lock 与 STATUS._lock)"""
+        timeline = STATUS.rtos_timeline
+        # 缓冲区被清空过 (RTOS 重置)，从头开始发送
+        if timeline.generation != self._rtos_generation:
+            self._rtos_generation = timeline.generation
+            self._rtos_cursor = 0
+            snap.rtos_reset = True
+
+        new_events = timeline.events_since(self._rtos_cursor)
+        if new_events:
+            self._rtos_cursor = new_events[-1]['id']
+        snap.rtos_events = new_events
+
+        tasks = [
+            RTOSTaskView(t.pid, t.priority, t.state, getattr(t, 'is_isr', False), getattr(t, 'block_reason', '-'),
+                         (t.stack.peak, t.stack.size) if getattr(t, 'stack', None) is not None else None)
+            for t in processes
+        ]
+        # 中断不是任务，由 NVIC 的执行栈和挂起位图生成视图
+        nvic = extension_rtos.nvic
+        active = nvic.active_irqs()
+        for depth, irq in enumerate(active):
+            top = depth == len(active) - 1
+            tasks.append(RTOSTaskView(irq_pid(irq), nvic.lines[irq].priority,
+                                      ProcessState.RUNNING if top else ProcessState.READY, True,
+                                      "Hard IRQ" if top else "被嵌套抢占"))
+        for irq in nvic.pending_irqs():
+            tasks.append(RTOSTaskView(irq_pid(irq), nvic.lines[irq].priority, ProcessState.READY, True, "挂起"))
+        snap.rtos_tasks = tasks
+        if tasks != self._rtos_tasks or snap.rtos_reset:
+            snap.rtos_tasks_changed = True
+            self._rtos_tasks = tasks
+        snap.rtos_registers = array('I', extension_rtos.cpu.regs)
+        snap.rtos_cpu = extension_rtos.cpu.summary()
+        snap.rtos_memory = {'main_stack': extension_rtos.main_stack.summary(),
+                            'stack_pool': extension_rtos.stack_pool.summary()}
+        # 直方图由内核在 rtos_lock 下更新，只在有新样本 (或被清空) 时汇总
+        samples = extension_rtos.latency_stats.samples
+        if samples != self._rtos_latency_samples or snap.rtos_reset:
+            self._rtos_latency_samples = samples
+            snap.rtos_latency = extension_rtos.latency_stats.summary()
@@ -0,0 +1,121 @@
+# qt_frontend/visuals/qt_analysis_panel.py
+# 功能：实时调度分析报告面板 (常驻控件，只更新变化的值)
+
+from typing import Dict, List, Tuple
+
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QGridLayout, QLabel
+from PyQt6.QtCore import Qt
+
+# 报告的分组与条目：(分组标题, [(键, 显示名), ...])
+REPORT_SECTIONS = [
+    ("系统总体状态", [
+        ('time', "时间"), ('total', "进程总数"), ('finished', "已完成"),
+        ('ready', "就绪队列"), ('blocked', "阻塞队列"),
+    ]),
+    ("进程状态分布", [
+        ('new', "新建"), ('state_ready', "就绪"), ('running', "运行"),
+        ('state_blocked', "阻塞"), ('terminated', "终止"),
+    ]),
+    ("性能指标", [
+        ('cpu_util', "CPU利用率"), ('avg_wait', "平均等待时间"),
+        ('avg_turnaround', "平均周转时间"), ('avg_response', "平均响应时间"),
+    ]),
+]
+
+# 算法特性分析条目的级别 -> 样式
+NOTE_STYLES = {
+    'normal': "color: #333333;",
+    'warning': "color: orange;",
+    'alert': "color: red;",
+}
+MAX_NOTES = 3
+
+
+class QtAnalysisPanel(QWidget):
+    """
+    调度分析报告。
+    所有标签在创建时一次性布局好，刷新时只对文字发生变化的标签调用 setText，
+    样式只在条目级别改变时才重新设置，避免每帧重建 HTML 文档和重新解析样式表。
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setAttribute(Qt.WidgetAttribute.WA_StyledBackground, True)
+        self.setStyleSheet(
+            "QtAnalysisPanel { background-color: #FDFEFE; border: 1px solid #E0E0E0; border-radius: 3px; }"
+            "QLabel { font-family: Consolas; font-size: 9.5pt; }"
+        )
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(8, 5, 8, 5)
+        layout.setSpacing(4)
+
+        self.lbl_title = QLabel()
+        self.lbl_title.setStyleSheet("color: #2E86C1; font-size: 11pt; font-weight: bold;")
+        layout.addWidget(self.lbl_title)
+
+        self._values: Dict[str, QLabel] = {}
+        self._texts: Dict[QLabel, str] = {}  # 每个标签当前显示的文字
+
+        for title, items in REPORT_SECTIONS:
+            layout.addWidget(self._section_label(title))
+            grid = QGridLayout()
+            grid.setContentsMargins(12, 0, 0, 0)
+            grid.setVerticalSpacing(2)
+            for row, (key, name) in enumerate(items):
+                name_lbl = QLabel(f"{name}:")
+                name_lbl.setStyleSheet("font-weight: bold;")
+                value_lbl = QLabel()
+                value_lbl.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter)
+                grid.addWidget(name_lbl, row, 0)
+                grid.addWidget(value_lbl, row, 1)
+                self._values[key] = value_lbl
+            grid.setColumnStretch(1, 1)
+            layout.addLayout(grid)
+
+        layout.addWidget(self._section_label("算法特性分析"))
+        self._notes: List[QLabel] = []
+        self._note_levels: List[str] = []
+        for _ in range(MAX_NOTES):
+            lbl = QLabel()
+            lbl.setWordWrap(True)
+            lbl.setContentsMargins(12, 0, 0, 0)
+            lbl.setStyleSheet(NOTE_STYLES['normal'])
+            lbl.hide()
+            layout.addWidget(lbl)
+            self._notes.append(lbl)
+            self._note_levels.append('normal')
+
+        layout.addStretch(1)
+
+    @staticmethod
+    def _section_label(title):
+        lbl = QLabel(title)
+        lbl.setStyleSheet("font-weight: bold; margin-top: 6px;")
+        return lbl
+
+    def _set_text(self, label: QLabel, text: str):
+        if self._texts.get(label) != text:
+            self._texts[label] = text
+            label.setText(text)
+
+    def set_title(self, algo: str):
+        self._set_text(self.lbl_title, f"算法实时分析: {algo}")
+
+    def update_values(self, values: Dict[str, str]):
+        """values: {条目键: 显示文字}，只更新文字变化的条目"""
+        for key, text in values.items():
+            self._set_text(self._values[key], text)
+
+    def set_notes(self, notes: List[Tuple[str, str]]):
+        """notes: [(级别, 文字), ...]，级别为 NOTE_STYLES 中的键"""
+        for i, lbl in enumerate(self._notes):
+            if i < len(notes):
+                level, text = notes[i]
+                if self._note_levels[i] != level:
+                    self._note_levels[i] = level
+                    lbl.setStyleSheet(NOTE_STYLES[level])
+                self._set_text(lbl, text)
+                if lbl.isHidden():
+                    lbl.show()
+            elif not lbl.isHidden():
+                lbl.hide()
@@ -8,16 +8,23 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtGui import QTextCursor
 from PyQt6.QtCore import (
-    Qt, QRectF, QPointF, QTimer, QTime, QPropertyAnimation, 
-    QEasingCurve, QDateTime
+    Qt, QRectF, QPointF, QTime, QPropertyAnimation, 
+    QEasingCurve, QDateTime, pyqtSignal
 )
 from PyQt6.QtGui import (
     QBrush, QPen, QFont, QColor, QPainter, QLinearGradient, 
     QRadialGradient, QFontMetrics, QPalette
 )
-from src.system_status import STATUS
+import time
+
+from src.modules_core.module_2_ipc import MessageQueueEngine, SharedMemoryEngine
+from qt_frontend.engine_workers import EngineWorker
+from qt_frontend.frame_clock import FrameClock
 
 class QtIpcVisualization(QWidget):
+    # 队列内容变化时发出 (消息列表)，供主窗口的日志框显示
+    queue_changed = pyqtSignal(list)
+
     def __init__(self, parent=None):
         super().__init__(parent)
         
@@ -52,21 +59,16 @@ class QtIpcVisualization(QWidget):
         self.consumer_breathing = False
         self.queue_warning = False
         
-        # 定时器
-        self.producer_timer = QTimer()
-        self.producer_timer.timeout.connect(self.produce_message)
-        
-        self.consumer_timer = QTimer()
-        self.consumer_timer.timeout.connect(self.consume_message)
-       # 启动动画定时器
-        self.animation_timer = QTimer()
-        self.animation_timer.timeout.connect(self.update_animations)
-        self.animation_timer.setInterval(16)  # ~60 FPS
-        
-        # 启动呼吸灯定时器
-        self.breathing_timer = QTimer()
-        self.breathing_timer.timeout.connect(self.update_breathing_effect)
-        self.breathing_timer.start(50)  # 20 FPS
+        # 生产/消费逻辑在工作线程中推进，这里只接收增量并播放动画
+        self.engine = MessageQueueEngine(self.produce_interval, self.consume_interval, self.max_queue_size)
+        self.worker = EngineWorker(self.engine, step_ms=20, name="ipc-queue")
+        self.worker.deltas_ready.connect(self.apply_deltas)
+        self.worker.start()
+
+        # 动画与呼吸灯由全局帧时钟驱动，页面隐藏时自动暂停
+        clock = FrameClock.instance()
+        self.animation_timer = clock.subscribe(self, self.update_animations, fps=60, active=False)  # 有动画时才启动
+        self.breathing_timer = clock.subscribe(self, self.update_breathing_effect, fps=20)
         
         self.breathing_progress = 0
         
@@ -232,22 +234,17 @@ class QtIpcVisualization(QWidget):
         if self.simulation_running:
             # 暂停
             self.simulation_running = False
-            self.producer_timer.stop()
-            self.consumer_timer.stop()
+            self.worker.call(self.engine.stop)
             
             # 更新生产者和消费者状态为已停止
             self.producer_running = False
             self.consumer_running = False
             
             self.add_log("模拟已暂停")
-            
-            # 更新状态显示
-            self.update_status_display()
         else:
             # 启动
             self.simulation_running = True
-            self.producer_timer.start(self.produce_interval)
-            self.consumer_timer.start(self.consume_interval)
+            self.worker.call(self.engine.start, time.monotonic())
             
             # 更新生产者和消费者状态为运行中
             self.producer_running = True
@@ -255,24 +252,22 @@ class QtIpcVisualization(QWidget):
             
             self.add_log("模拟已启动")
             
-            # 更新状态显示
-            self.update_status_display()
+        # 更新状态显示
+        self.update_status_display()
     
     def reset_simulation(self):
         """重置模拟"""
-        # 停止所有定时器
         self.simulation_running = False
-        self.producer_timer.stop()
-        self.consumer_timer.stop()
+        self.worker.call(self.engine.reset)
         self.animation_timer.stop()
         
         # 重置状态
         self.message_queue.clear()
+        self.last_queue_size = 0
         self.producer_running = False
         self.consumer_running = False
         self.producer_blocked = False
         self.consumer_blocked = False
-        self.message_id = 1
         
         # 清除所有消息项
         for message_item, message_text in self.message_items:
@@ -284,99 +279,69 @@ class QtIpcVisualization(QWidget):
         self.animations.clear()
         self.is_animating = False
         
-        # 重置UI - 已移除start_button，无需重置
-        
         # 更新状态显示
         self.update_status_display()
-        
-        # 日志组件已删除，不再清除日志
-        
-    def produce_message(self):
-        """生产者生成消息"""
-        if len(self.message_queue) < self.max_queue_size:
-            # 队列未满，生成消息
-            message = f"消息 {self.message_id}"
-            self.message_queue.append(message)
-            self.message_id += 1
-            
-            # 更新可视化
-            self.update_visualization(self.message_queue)
-            
-            # 记录日志
-            self.add_log(f"生产者生成: {message} 队列大小: {len(self.message_queue)}")
-            
-            # 更新状态
-            self.producer_running = True
-            self.producer_blocked = False
-            
-            # 启动呼吸灯
-            self.producer_breathing = True
-            
-        else:
-            # 队列已满，生产者阻塞
-            self.producer_running = False
-            self.producer_blocked = True
-            self.add_log(f"队列已满 ({len(self.message_queue)}/{self.max_queue_size})，生产者阻塞")
-            
-            # 启动队列警告动画
-            self.queue_warning = True
-        
-        # 更新状态显示
-        self.update_status_display()
-        
-    def consume_message(self):
-        """消费者消费消息"""
-        if self.message_queue:
-            # 队列有消息，消费消息
-            message = self.message_queue.pop(0)
-            
-            # 更新可视化
-            self.update_visualization(self.message_queue)
-            
-            # 记录日志
-            self.add_log(f"消费者接收: {message} 队列大小: {len(self.message_queue)}")
-            
-            # 更新状态
-            self.consumer_running = True
-            self.consumer_blocked = False
-            
-            # 启动呼吸灯
-            self.consumer_breathing = True
-            
-            # 如果生产者之前阻塞，现在检查是否可以恢复
-            if self.producer_blocked and len(self.message_queue) < self.max_queue_size:
-                self.producer_blocked = False
+        self.queue_changed.emit([])
+
+    def apply_deltas(self, deltas):
+        """应用工作线程送来的一批增量：更新本地队列镜像、播放动画、刷新状态"""
+        changed = False
+        for delta in deltas:
+            op = delta['op']
+            if op == 'reset':
+                continue
+            if op == 'produce':
+                self.message_queue.append(delta['message'])
+                self.update_visualization(self.message_queue)
+                self.add_log(f"生产者生成: {delta['message']} 队列大小: {delta['size']}")
                 self.producer_running = True
-                self.add_log(f"队列有空闲 ({len(self.message_queue)}/{self.max_queue_size})，生产者恢复")
-                
+                # 启动呼吸灯
+                self.producer_breathing = True
+                changed = True
+            elif op == 'produce_blocked':
+                # 队列已满，生产者阻塞；启动队列警告动画
+                self.producer_running = False
+                self.add_log(f"队列已满 ({delta['size']}/{delta['max_size']})，生产者阻塞")
+                self.queue_warning = True
+            elif op == 'consume':
+                if self.message_queue:
+                    self.message_queue.pop(0)
+                self.update_visualization(self.message_queue)
+                self.add_log(f"消费者接收: {delta['message']} 队列大小: {delta['size']}")
+                self.consumer_running = True
+                self.consumer_breathing = True
+                changed = True
+            elif op == 'consume_blocked':
+                self.consumer_running = False
+                self.add_log("队列为空，消费者阻塞")
+            elif op == 'producer_resumed':
+                self.producer_running = True
+                self.add_log(f"队列有空闲 ({delta['size']}/{delta['max_size']})，生产者恢复")
                 # 停止队列警告
                 self.queue_warning = False
-        else:
-            # 队列为空，消费者阻塞
-            self.consumer_running = False
-            self.consumer_blocked = True
-            self.add_log("队列为空，消费者阻塞")
-        
-        # 更新状态显示
+            self.producer_blocked = delta['producer_blocked']
+            self.consumer_blocked = delta['consumer_blocked']
+
         self.update_status_display()
+        if changed:
+            self.queue_changed.emit(list(self.message_queue))
     
     def update_produce_interval(self, value):
         """更新生产间隔"""
         self.produce_interval = value
-        if self.simulation_running:
-            self.producer_timer.setInterval(value)
+        self.worker.call(self.engine.set_intervals, value, None)
         self.add_log(f"生产间隔更新为 {value} ms")
     
     def update_consume_interval(self, value):
         """更新消费间隔"""
         self.consume_interval = value
-        if self.simulation_running:
-            self.consumer_timer.setInterval(value)
+        self.worker.call(self.engine.set_intervals, None, value)
         self.add_log(f"消费间隔更新为 {value} ms")
     
     def update_queue_size(self, value):
         """更新队列大小"""
         self.max_queue_size = value
+        self.worker.call(self.engine.set_max_queue_size, value)
         self.add_log(f"队列容量更新为 {value} 条")
         
         # 重新初始化场景以更新队列槽位
@@ -418,10 +383,7 @@ class QtIpcVisualization(QWidget):
         else:
             self.consumer_status_label.setText(f"消费者: 已停止")
             self.consumer_status_label.setStyleSheet("color: #6b7280; padding: 8px 15px; border-radius: 20px; background-color: #f3f4f6;")
-        
-        # 更新全局状态
-        with STATUS._lock:
-            STATUS.message_queue = self.message_queue
+
     
     def draw_background(self):
         """绘制背景装饰"""
@@ -848,16 +810,16 @@ class QtSharedMemoryVisualization(QWidget):
         
         self.init_scene()
         
-        # 动画定时器 (用于刷新可视化)
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_visualization)
-        self.timer.start(50) # 20 FPS
+        # 刷新可视化 (由全局帧时钟驱动，页面隐藏时自动暂停)
+        self.timer = FrameClock.instance().subscribe(self, self.update_visualization, fps=20)
         
-        # 操作定时器 (用于控制读写操作频率)
-        self.operation_timer = QTimer()
-        self.operation_timer.timeout.connect(self.perform_operation)
-        self.operation_interval = 500  # 每500ms执行一次操作
-        self.operation_timer.start(self.operation_interval)
+        # 读写操作在工作线程中执行 (每500ms一次)，这里只接收操作记录
+        self.block_values = ['00'] * len(self.memory_blocks)
+        self.recent_ops = []  # 最近的操作记录，用于高亮
+        self.engine = SharedMemoryEngine(operation_interval=500)
+        self.worker = EngineWorker(self.engine, step_ms=50, name="ipc-shm")
+        self.worker.deltas_ready.connect(self.apply_deltas)
+        self.worker.start()
 
     def init_scene(self):
         self.scene.clear()
@@ -940,23 +902,14 @@ class QtSharedMemoryVisualization(QWidget):
         self.simulation_running = not self.simulation_running
         if self.simulation_running:
             print("共享内存模拟已启动")
-            # 初始化共享内存数据
-            import random
-            with STATUS._lock:
-                STATUS.shm_data = ['00'] * 16
+            self.worker.call(self.engine.start, time.monotonic())
         else:
             print("共享内存模拟已停止")
+            self.worker.call(self.engine.stop)
         
     def reset_simulation(self):
         self.simulation_running = False
-        with STATUS._lock:
-            # 重置共享内存数据
-            STATUS.shm_data = ['00'] * 16
-            # 清除操作历史
-            STATUS.shm_ops.clear()
-            # 清除旧的单操作记录（向后兼容）
-            if hasattr(STATUS, 'shm_last_op'):
-                STATUS.shm_last_op = None
+        self.worker.call(self.engine.reset)
         
         # 清除日志
         self.write_log.clear()
@@ -966,74 +919,42 @@ class QtSharedMemoryVisualization(QWidget):
         
         # 重新初始化场景
         self.init_scene()
+        self.block_values = ['00'] * len(self.memory_blocks)
+        self.recent_ops.clear()
     
-    def perform_operation(self):
-        """每隔一段时间执行一次读写操作"""
-        import random
-        import time
-        
-        # 如果模拟正在运行，随机执行读写操作
-        if self.simulation_running:
-            with STATUS._lock:
-                # 确保shm_data存在
-                if not hasattr(STATUS, 'shm_data'):
-                    STATUS.shm_data = ['00'] * 16
-                
-                # 随机选择写或读操作
-                op_type = random.choice(['WRITE', 'READ'])
-                addr = random.randint(0, 15)
-                
-                if op_type == 'WRITE':
-                    # 随机生成两个字符作为数据
-                    new_data = random.choice(['01', '02', '03', '04', '05', '06', '07', '08', '09', '10'])
-                    STATUS.shm_data[addr] = new_data
-                    # 将操作追加到操作列表
-                    STATUS.shm_ops.append({
-                        'type': 'WRITE',
-                        'addr': addr,
-                        'val': new_data,
-                        'time': time.time()
-                    })
-                    # 保持操作列表不超过20个元素
-                    if len(STATUS.shm_ops) > 20:
-                        STATUS.shm_ops.pop(0)
-                    # 记录写入日志
-                    timestamp = time.strftime('%H:%M:%S')
-                    log_msg = f"[{timestamp}] 写入地址0x{addr:X}: {new_data}\n"
-                    self.write_log.insertPlainText(log_msg)
-                    self.write_log.moveCursor(QTextCursor.MoveOperation.End)
-                else:
-                    # 将操作追加到操作列表
-                    STATUS.shm_ops.append({
-                        'type': 'READ',
-                        'addr': addr,
-                        'val': STATUS.shm_data[addr],
-                        'time': time.time()
-                    })
-                    # 保持操作列表不超过20个元素
-                    if len(STATUS.shm_ops) > 20:
-                        STATUS.shm_ops.pop(0)
-                    # 记录读取日志
-                    timestamp = time.strftime('%H:%M:%S')
-                    data = STATUS.shm_data[addr]
-                    log_msg = f"[{timestamp}] 读取地址0x{addr:X}: {data}\n"
-                    self.read_log.insertPlainText(log_msg)
-                    self.read_log.moveCursor(QTextCursor.MoveOperation.End)
+    def apply_deltas(self, deltas):
+        """应用工作线程送来的读写操作：更新内存块镜像并追加日志"""
+        for op in deltas:
+            if op['op'] == 'reset':
+                self.block_values = list(op['data'])
+                self.recent_ops.clear()
+                continue
+
+            addr = op['addr']
+            timestamp = time.strftime('%H:%M:%S', time.localtime(op['time']))
+            if op['op'] == 'WRITE':
+                self.block_values[addr] = op['val']
+                self.write_log.insertPlainText(f"[{timestamp}] 写入地址0x{addr:X}: {op['val']}\n")
+                self.write_log.moveCursor(QTextCursor.MoveOperation.End)
+            else:
+                self.read_log.insertPlainText(f"[{timestamp}] 读取地址0x{addr:X}: {op['val']}\n")
+                self.read_log.moveCursor(QTextCursor.MoveOperation.End)
+            self.recent_ops.append(op)
+
+        # 保持操作列表不超过20个元素
+        del self.recent_ops[:-20]
 
     def update_visualization(self):
         """每帧刷新，更新可视化显示"""
-        import time
-        
-        # 更新可视化显示
-        if hasattr(STATUS, 'shm_data') and STATUS.shm_data:
-            with STATUS._lock:
-                # 1. 更新所有内存块的文本内容
-                for i, val in enumerate(STATUS.shm_data):
-                    if i < len(self.memory_blocks):
-                        self.memory_blocks[i][1].setPlainText(str(val))
-                
-                # 2. 获取最近的操作列表
-                recent_ops = STATUS.shm_ops.copy()
+        # 更新可视化显示 (只读取本地镜像，不访问全局状态)
+        if self.block_values:
+            # 1. 更新所有内存块的文本内容
+            for i, val in enumerate(self.block_values):
+                if i < len(self.memory_blocks):
+                    self.memory_blocks[i][1].setPlainText(str(val))
+            
+            # 2. 获取最近的操作列表
+            recent_ops = self.recent_ops
                 
             current_time = time.time()
             # 记录需要高亮的内存块及其操作类型
@@ -1057,7 +978,7 @@ class QtSharedMemoryVisualization(QWidget):
             for addr, op in highlight_ops.items():
                 if 0 <= addr < len(self.memory_blocks):
                     rect, _ = self.memory_blocks[addr]
-                    op_type = op.get('type')
+                    op_type = op.get('op')
                     
                     if op_type == 'WRITE':
                         # 写操作：红色高亮
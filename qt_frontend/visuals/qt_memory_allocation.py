@@ -6,9 +6,21 @@ from PyQt6.QtGui import QPainter, QColor, QPen, QFont, QBrush
 from PyQt6.QtCore import Qt, QRectF
 from typing import List, Dict
 
-from src.modules_extension.extension_memory import initialize_memory, first_fit_allocate, best_fit_allocate, worst_fit_allocate, deallocate_memory
-from src.system_status import STATUS
+from src.modules_extension.extension_memory import (initialize_memory, first_fit_allocate, best_fit_allocate, worst_fit_allocate,
+                                                     buddy_allocate, slab_allocate, select_allocator,
+                                                     deallocate_memory, get_memory_layout, get_allocated_pids,
+                                                     get_allocator_stats)
 from config import MEMORY_SIZE
+from qt_frontend.frame_clock import FrameClock
+
+# 界面中的算法名 -> (分配策略, 分配函数)
+ALGORITHMS = {
+    "First Fit": ("first_fit", first_fit_allocate),
+    "Best Fit": ("best_fit", best_fit_allocate),
+    "Worst Fit": ("worst_fit", worst_fit_allocate),
+    "Buddy": ("buddy", buddy_allocate),
+    "Slab": ("slab", slab_allocate),
+}
 
 class QtMemoryAllocation(QWidget):
     def __init__(self, parent=None):
@@ -16,8 +28,9 @@ class QtMemoryAllocation(QWidget):
         self.setMinimumSize(800, 500)
         self.setStyleSheet("background-color: #f8f8f8;")
         
-        # 初始化内存
-        initialize_memory()
+        # 初始化内存 (页表属于页面置换页，两个页面的构建顺序不固定，这里不重置页表)
+        select_allocator(ALGORITHMS["First Fit"][0])
+        initialize_memory(reset_pages=False)
         
         # 当前选中的内存分配算法
         self.current_algorithm = "First Fit"
@@ -45,12 +58,16 @@ class QtMemoryAllocation(QWidget):
         self.free_memory_label = QLabel("空闲内存: 0 MB")
         self.free_blocks_label = QLabel("空闲块数: 0")
         self.allocated_blocks_label = QLabel("已分配块数: 0")
+        self.internal_frag_label = QLabel("内部碎片: 0.0%")
+        self.external_frag_label = QLabel("外部碎片: 0.0%")
         
         stats_layout.addWidget(self.total_memory_label)
         stats_layout.addWidget(self.used_memory_label)
         stats_layout.addWidget(self.free_memory_label)
         stats_layout.addWidget(self.free_blocks_label)
         stats_layout.addWidget(self.allocated_blocks_label)
+        stats_layout.addWidget(self.internal_frag_label)
+        stats_layout.addWidget(self.external_frag_label)
         
         main_layout.addWidget(stats_group)
         
@@ -88,13 +105,13 @@ class QtMemoryAllocation(QWidget):
         # 算法选择
         algorithm_label = QLabel("分配算法:")
         self.algorithm_combo = QComboBox()
-        self.algorithm_combo.addItems(["First Fit", "Best Fit", "Worst Fit"])
+        self.algorithm_combo.addItems(list(ALGORITHMS))
         self.algorithm_combo.currentTextChanged.connect(self.on_algorithm_changed)
         
         # 内存分配
         allocate_label = QLabel("分配大小 (MB):")
         self.allocate_size_combo = QComboBox()
-        self.allocate_size_combo.addItems(["64", "128", "256", "512"])
+        self.allocate_size_combo.addItems(["4", "16", "32", "64", "100", "128", "256", "512"])
         
         self.allocate_button = QPushButton("分配内存")
         self.allocate_button.clicked.connect(self.on_allocate_memory)
@@ -132,6 +149,10 @@ class QtMemoryAllocation(QWidget):
         """
         self.current_algorithm = text
         self.log_text.append(f"切换到{text}分配算法")
+        # 动态分区、伙伴、slab 使用不同的分配器，之间切换时内存被重置
+        if select_allocator(ALGORITHMS[text][0]):
+            self.log_text.append("分配器已更换，内存已重置")
+            self.update_deallocate_combo()
     
     def on_allocate_memory(self):
         """
@@ -140,19 +161,11 @@ class QtMemoryAllocation(QWidget):
         try:
             size = int(self.allocate_size_combo.currentText())
             
-            # 生成一个新的进程ID（简单实现）
-            with STATUS._lock:
-                # 找到最大的PID
-                max_pid = max([block[3] for block in STATUS.memory_layout if block[3] != -1], default=0)
-                new_pid = max_pid + 1
+            # 生成一个新的进程ID（简单实现）：最大的 PID 加一
+            new_pid = max(get_allocated_pids(), default=0) + 1
             
             # 根据选择的算法分配内存
-            if self.current_algorithm == "First Fit":
-                success = first_fit_allocate(new_pid, size)
-            elif self.current_algorithm == "Best Fit":
-                success = best_fit_allocate(new_pid, size)
-            elif self.current_algorithm == "Worst Fit":
-                success = worst_fit_allocate(new_pid, size)
+            success = ALGORITHMS[self.current_algorithm][1](new_pid, size)
             
             if success:
                 self.log_text.append(f"使用{self.current_algorithm}成功分配{size}MB内存给PID{new_pid}")
@@ -202,62 +215,36 @@ class QtMemoryAllocation(QWidget):
         """
         更新回收内存时的进程选择下拉框
         """
-        with STATUS._lock:
-            # 获取所有已分配的进程ID
-            allocated_pids = set()
-            for block in STATUS.memory_layout:
-                if block[2] and block[3] != -1:
-                    allocated_pids.add(block[3])
-            
-            # 更新下拉框
-            self.deallocate_combo.clear()
-            for pid in sorted(allocated_pids):
-                self.deallocate_combo.addItem(f"PID {pid}")
+        # 更新下拉框
+        self.deallocate_combo.clear()
+        for pid in sorted(get_allocated_pids()):
+            self.deallocate_combo.addItem(f"PID {pid}")
     
     def update_memory_stats(self):
         """
-        更新内存统计信息
+        更新内存统计信息 (已用内存为请求的大小之和，伙伴 / slab 的取整计入内部碎片)
         """
-        with STATUS._lock:
-            used_memory = 0
-            free_memory = 0
-            free_blocks = 0
-            allocated_blocks = 0
-            
-            for block in STATUS.memory_layout:
-                if block[2]:  # 已分配
-                    used_memory += block[1]
-                    allocated_blocks += 1
-                else:  # 空闲
-                    free_memory += block[1]
-                    free_blocks += 1
-            
-            self.used_memory_label.setText(f"已用内存: {used_memory} MB")
-            self.free_memory_label.setText(f"空闲内存: {free_memory} MB")
-            self.free_blocks_label.setText(f"空闲块数: {free_blocks}")
-            self.allocated_blocks_label.setText(f"已分配块数: {allocated_blocks}")
+        stats = get_allocator_stats()
+        self.used_memory_label.setText(f"已用内存: {stats['used_memory']} MB")
+        self.free_memory_label.setText(f"空闲内存: {stats['free_memory']} MB")
+        self.free_blocks_label.setText(f"空闲块数: {stats['free_blocks']}")
+        self.allocated_blocks_label.setText(f"已分配块数: {stats['allocated_blocks']}")
+        self.internal_frag_label.setText(f"内部碎片: {stats['internal_fragmentation']:.1%}")
+        self.external_frag_label.setText(f"外部碎片: {stats['external_fragmentation']:.1%}")
     
     def update_timer(self):
         """
         更新定时器，用于定期刷新可视化界面
         """
-        from PyQt6.QtCore import QTimer
-        
-        self.timer = QTimer(self)
-        self.timer.setInterval(1000)  # 1秒刷新一次
-        self.timer.timeout.connect(self.refresh_visualization)
-        self.timer.start()
+        # 1秒刷新一次，由全局帧时钟驱动，页面隐藏时暂停
+        self.timer = FrameClock.instance().subscribe(self, self.refresh_visualization, fps=1)
     
     def refresh_visualization(self):
         """
         刷新可视化界面
         """
-        with STATUS._lock:
-            # 更新内存可视化
-            self.memory_visualization.update_memory(STATUS.memory_layout)
-            
-            # 更新内存统计信息
-            self.update_memory_stats()
+        self.memory_visualization.update_memory(get_memory_layout())
+        self.update_memory_stats()
 
 
 class MemoryVisualizationWidget(QWidget):
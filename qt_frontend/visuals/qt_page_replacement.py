@@ -10,6 +10,7 @@ import random
 from src.modules_extension.extension_memory import initialize_page_table, access_page, get_page_table_status, get_page_access_history
 from src.system_status import STATUS
 from config import PAGE_SIZE
+from qt_frontend.frame_clock import FrameClock
 
 class QtPageReplacement(QWidget):
     def __init__(self, parent=None):
@@ -243,12 +244,8 @@ class QtPageReplacement(QWidget):
         """
         更新定时器，用于定期刷新可视化界面
         """
-        from PyQt6.QtCore import QTimer
-        
-        self.timer = QTimer(self)
-        self.timer.setInterval(500)  # 500ms刷新一次
-        self.timer.timeout.connect(self.refresh_visualization)
-        self.timer.start()
+        # 500ms刷新一次，由全局帧时钟驱动，页面隐藏时暂停
+        self.timer = FrameClock.instance().subscribe(self, self.refresh_visualization, fps=2)
     
     def refresh_visualization(self):
         """
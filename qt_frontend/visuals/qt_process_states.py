@@ -2,19 +2,31 @@
 # 功能：新页面 - 进程状态转换图与实时数据看板
 
 from PyQt6.QtWidgets import (QWidget, QHBoxLayout, QVBoxLayout, QLabel, 
-                             QListWidget, QListWidgetItem, QGroupBox, QSplitter)
-from PyQt6.QtGui import QPainter, QColor, QPen, QFont, QBrush, QPolygonF
-from PyQt6.QtCore import Qt, QPointF, QRectF
+                             QTableView, QHeaderView, QAbstractItemView, QGroupBox, QSplitter)
+from PyQt6.QtGui import QPainter, QColor, QPen, QFont, QBrush, QPolygonF, QPainterPath, QPixmap, QStaticText
+from PyQt6.QtCore import Qt, QPointF, QRectF, QAbstractListModel, QModelIndex
 import math
+from config import STATE_DIAGRAM_DOT_LIMIT
 from src.process_model import ProcessState
 
 class QtProcessStateDiagram(QWidget):
     """左侧：绘制状态转换图"""
+    DOT_RADIUS = 7
+    DOTS_PER_RING = 8
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setMinimumWidth(500)
         self.setStyleSheet("background-color: white;")
-        self.processes = []
+        self.state_counts = {s: 0 for s in ProcessState}  # 各状态的进程数
+        self.state_pids = {s: [] for s in ProcessState}   # 各状态逐个绘制的进程 PID
+        self.total_count = 0
+        self.archived_count = 0  # 已归档（终止）进程数量
+
+        self._static_layer = None  # 静态层缓存 (QPixmap)
+        self._offset_cache = {}    # {进程点数: 各点相对状态中心的偏移}
+        self._pid_text_cache = {}  # {PID: QStaticText}
+        self._pid_font = QFont("Arial", 7, QFont.Weight.Bold)
         
         # 优化布局坐标定义，使整体更加平衡
         cx, cy = 350, 280 # 中心点
@@ -36,15 +48,59 @@ class QtProcessStateDiagram(QWidget):
         
         self.radius = 50 # 增加节点半径，使文字更易显示
 
-    def update_data(self, processes):
-        self.processes = processes
+    def update_data(self, processes, archived_count=0):
+        # 只统计各状态的进程数，并为每个状态保留前 STATE_DIAGRAM_DOT_LIMIT 个 PID 用于逐个绘制
+        counts = {s: 0 for s in ProcessState}
+        pids = {s: [] for s in ProcessState}
+        for p in processes:
+            counts[p.state] += 1
+            if counts[p.state] <= STATE_DIAGRAM_DOT_LIMIT:
+                pids[p.state].append(p.pid)
+        self.state_counts = counts
+        self.state_pids = pids
+        self.total_count = len(processes)
+        self.archived_count = archived_count
         self.update() # 触发重绘
 
+    def resizeEvent(self, event):
+        # 尺寸变化时丢弃静态层缓存，下次绘制时重建
+        self._static_layer = None
+        super().resizeEvent(event)
+
     def paintEvent(self, event):
         painter = QPainter(self)
+
+        # 1. 静态层：连线与状态大圆不随数据变化，缓存为位图
+        dpr = self.devicePixelRatioF()
+        if self._static_layer is None or self._static_layer.devicePixelRatio() != dpr:
+            self._static_layer = self._render_static_layer(dpr)
+        painter.drawPixmap(0, 0, self._static_layer)
+
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        # 2. 进程数不超过上限的状态逐个绘制进程小点，超过上限的状态绘制计数热力环
+        self._draw_process_dots(painter)
+        for state, count in self.state_counts.items():
+            if count > STATE_DIAGRAM_DOT_LIMIT:
+                self._draw_heat_ring(painter, self.nodes[state], count)
+
+        # 3. 终止状态的进程已归档，只显示数量
+        if self.archived_count:
+            pos = self.nodes[ProcessState.TERMINATED]
+            painter.setPen(QColor("#555"))
+            painter.setFont(QFont("Microsoft YaHei", 9))
+            text_rect = QRectF(pos.x() - self.radius * 2, pos.y() + self.radius + 5, self.radius * 4, 20)
+            painter.drawText(text_rect, Qt.AlignmentFlag.AlignCenter, f"已归档 {self.archived_count} 个")
+
+    def _render_static_layer(self, dpr):
+        """把连线 (箭头) 和状态大圆绘制到透明位图中"""
+        pixmap = QPixmap(max(1, round(self.width() * dpr)), max(1, round(self.height() * dpr)))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(pixmap)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
 
-        # 1. 绘制连线 (箭头)
+        # 连线 (箭头)
         self._draw_arrow(painter, ProcessState.NEW, ProcessState.READY)
         self._draw_arrow(painter, ProcessState.READY, ProcessState.RUNNING)
         self._draw_arrow(painter, ProcessState.RUNNING, ProcessState.READY, offset=20) # 抢占
@@ -52,7 +108,7 @@ class QtProcessStateDiagram(QWidget):
         self._draw_arrow(painter, ProcessState.BLOCKED, ProcessState.READY)
         self._draw_arrow(painter, ProcessState.RUNNING, ProcessState.TERMINATED)
 
-        # 2. 绘制状态大圆
+        # 状态大圆
         for state, pos in self.nodes.items():
             # 阴影
             painter.setBrush(QColor(0,0,0,20))
@@ -70,8 +126,8 @@ class QtProcessStateDiagram(QWidget):
             text_rect = QRectF(pos.x()-self.radius, pos.y()-self.radius, self.radius*2, self.radius*2)
             painter.drawText(text_rect, Qt.AlignmentFlag.AlignCenter, state.value)
 
-        # 3. 绘制进程小点
-        self._draw_process_dots(painter)
+        painter.end()
+        return pixmap
 
     def _draw_arrow(self, painter, start_state, end_state, offset=0):
         start = self.nodes[start_state]
@@ -109,64 +165,143 @@ class QtProcessStateDiagram(QWidget):
         painter.setBrush(QColor("#666"))
         painter.drawPolygon(arrow_head)
 
+    def _dot_offsets(self, count):
+        """
+        count 个进程点相对状态中心的偏移 (按数量缓存，绘制时不再做三角运算)。
+        每圈最多 8 个点，进程多时由内向外分成多圈，各圈均匀分配。
+        """
+        offsets = self._offset_cache.get(count)
+        if offsets is None:
+            offsets = []
+            rings = (count + self.DOTS_PER_RING - 1) // self.DOTS_PER_RING
+            for ring in range(rings):
+                n = count // rings + (1 if ring < count % rings else 0)
+                orbit = self.radius + 12 + ring * (2 * self.DOT_RADIUS + 4)
+                for i in range(n):
+                    # 相邻两圈错开半个间隔，避免点沿径向排成一列
+                    angle = 2 * math.pi * (i + (ring % 2) / 2) / n
+                    offsets.append(QPointF(orbit * math.cos(angle), orbit * math.sin(angle)))
+            self._offset_cache[count] = offsets
+        return offsets
+
+    def _pid_text(self, pid):
+        """PID 文字的预排版缓存"""
+        text = self._pid_text_cache.get(pid)
+        if text is None:
+            if len(self._pid_text_cache) > 4 * len(ProcessState) * STATE_DIAGRAM_DOT_LIMIT:
+                self._pid_text_cache.clear()
+            text = QStaticText(str(pid))
+            text.prepare(font=self._pid_font)
+            self._pid_text_cache[pid] = text
+        return text
+
     def _draw_process_dots(self, painter):
-        """在状态节点周围绘制代表进程的小圆点，优化显示避免重叠"""
-        # 按状态分组
-        grouped = {s: [] for s in ProcessState}
-        for p in self.processes:
-            grouped[p.state].append(p)
-            
-        dot_radius = 7
-        orbit_radius = self.radius + 12
-        
-        for state, procs in grouped.items():
+        """在状态节点周围绘制代表进程的小圆点：所有点合并为一条路径一次绘制，PID 使用预排版文字"""
+        dot_radius = self.DOT_RADIUS
+        placed = []
+        dots = QPainterPath()
+        for state, pids in self.state_pids.items():
+            if not pids or self.state_counts[state] > STATE_DIAGRAM_DOT_LIMIT:
+                continue
             center = self.nodes[state]
-            count = len(procs)
-            if count == 0: continue
-            
-            # 优化角度分布，避免拥挤
-            if count <= 8:
-                angle_step = 360 / count
-            elif count <= 16:
-                angle_step = 360 / (count / 2)
-                orbit_radius_outer = orbit_radius + 2 * dot_radius + 4
-            else:
-                angle_step = 360 / (count / 3)
-                orbit_radius_outer = orbit_radius + 2 * dot_radius + 4
-                orbit_radius_outer2 = orbit_radius_outer + 2 * dot_radius + 4
-            
-            for i, p in enumerate(procs):
-                angle_deg = (i % (count if count <= 8 else (count//2 if count <=16 else count//3))) * angle_step
-                angle_rad = math.radians(angle_deg)
-                
-                # 根据进程数量选择不同的轨道半径
-                if count <= 8:
-                    current_orbit_radius = orbit_radius
-                elif i < count//2:
-                    current_orbit_radius = orbit_radius
-                elif i < count and count <=16:
-                    current_orbit_radius = orbit_radius_outer
-                elif i < count//3:
-                    current_orbit_radius = orbit_radius
-                elif i < 2*count//3:
-                    current_orbit_radius = orbit_radius_outer
-                else:
-                    current_orbit_radius = orbit_radius_outer2
-                
-                x = center.x() + current_orbit_radius * math.cos(angle_rad)
-                y = center.y() + current_orbit_radius * math.sin(angle_rad)
-                
-                # 绘制小点 - 深色背景确保白色文字清晰可见
-                painter.setBrush(QColor("#2980B9"))  # 更深的蓝色背景
-                painter.setPen(QColor("white"))
-                painter.drawEllipse(QPointF(x, y), dot_radius, dot_radius)
-                
-                # PID - 确保数字清晰可见
-                painter.setPen(QColor("white"))
-                painter.setFont(QFont("Arial", 7, QFont.Weight.Bold))
-                pid_text = str(p.pid)
-                text_rect = QRectF(x-dot_radius, y-dot_radius, dot_radius*2, dot_radius*2)
-                painter.drawText(text_rect, Qt.AlignmentFlag.AlignCenter, pid_text)
+            for pid, offset in zip(pids, self._dot_offsets(len(pids))):
+                pos = center + offset
+                dots.addEllipse(pos, dot_radius, dot_radius)
+                placed.append((pid, pos))
+        if not placed:
+            return
+
+        # 深色背景确保白色文字清晰可见
+        painter.setBrush(QColor("#2980B9"))
+        painter.setPen(QColor("white"))
+        painter.drawPath(dots)
+
+        painter.setFont(self._pid_font)
+        for pid, pos in placed:
+            text = self._pid_text(pid)
+            size = text.size()
+            painter.drawStaticText(QPointF(pos.x() - size.width() / 2, pos.y() - size.height() / 2), text)
+
+    def _draw_heat_ring(self, painter, center, count):
+        """
+        进程过多时用热力环代替逐个的小点：
+        圆弧长度为该状态进程占全部进程的比例，颜色随进程数量 (对数) 由浅变深，环外标注数量。
+        """
+        orbit = self.radius + 12
+        ring_rect = QRectF(center.x() - orbit, center.y() - orbit, orbit * 2, orbit * 2)
+
+        # 底环
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        painter.setPen(QPen(QColor(0, 0, 0, 25), 10))
+        painter.drawEllipse(ring_rect)
+
+        # 占比圆弧，从正上方顺时针
+        share = count / self.total_count if self.total_count else 0
+        heat = min(1.0, math.log10(count) / 4)  # 10 个进程为浅色，10000 个进程为最深色
+        low, high = QColor("#F5B041"), QColor("#C0392B")
+        color = QColor(
+            round(low.red() + (high.red() - low.red()) * heat),
+            round(low.green() + (high.green() - low.green()) * heat),
+            round(low.blue() + (high.blue() - low.blue()) * heat),
+        )
+        pen = QPen(color, 10)
+        pen.setCapStyle(Qt.PenCapStyle.FlatCap)
+        painter.setPen(pen)
+        painter.drawArc(ring_rect, 90 * 16, -max(1, round(share * 360 * 16)))
+
+        # 数量标注
+        painter.setPen(color.darker(130))
+        painter.setFont(QFont("Arial", 9, QFont.Weight.Bold))
+        label_rect = QRectF(center.x() - orbit, center.y() - orbit - 24, orbit * 2, 16)
+        painter.drawText(label_rect, Qt.AlignmentFlag.AlignCenter, f"{count} 个进程")
+
+
+class ProcessInfoModel(QAbstractListModel):
+    """右侧实时数据列表的模型：只保存每个进程的原始值，显示时才格式化"""
+
+    # 各状态的背景色 (文字均为黑色)
+    STATE_BACKGROUNDS = {
+        ProcessState.RUNNING:    QColor("#E74C3C"),  # 红色背景
+        ProcessState.READY:      QColor("#F9E79F"),  # 黄色背景
+        ProcessState.BLOCKED:    QColor("#8E44AD"),  # 紫色背景
+        ProcessState.TERMINATED: QColor("#ECF0F1"),  # 灰色背景
+        ProcessState.NEW:        QColor("#A9DFBF"),  # 绿色背景
+    }
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []  # [(pid, state, remaining_time, cpu_id)]，按 PID 排序
+        self._foreground = QColor("black")
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        pid, state, remaining, cpu_id = self._rows[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            # 改进文本格式，确保信息完整显示
+            item_text = f"PID: {pid} | 状态: {state.value} | 剩余: {remaining:.1f}s"
+            if state == ProcessState.RUNNING:
+                # RTOS 任务没有绑定核心，其 cpu_id 为 None
+                if cpu_id is not None:
+                    item_text += f" [CPU-{cpu_id}]"
+            elif state == ProcessState.BLOCKED:
+                item_text += " [IO]"
+            return item_text
+        if role == Qt.ItemDataRole.BackgroundRole:
+            return self.STATE_BACKGROUNDS.get(state)
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return self._foreground
+        return None
+
+    def set_processes(self, processes):
+        rows = sorted(((p.pid, p.state, p.remaining_time, getattr(p, 'cpu_id', None)) for p in processes),
+                      key=lambda row: row[0])
+        self.beginResetModel()
+        self._rows = rows
+        self.endResetModel()
 
 
 class QtProcessStates(QWidget):
@@ -193,9 +328,21 @@ class QtProcessStates(QWidget):
         right_layout.addWidget(title_label)
         
         # 设置列表控件的样式和属性
-        self.info_list = QListWidget()
+        # 使用模型/视图：进程很多时只格式化可见行，不再为每个进程创建列表项。
+        # 单列无表头的表格视图行高固定，刷新时不需要像 QListView 那样逐行布局
+        self.info_model = ProcessInfoModel(self)
+        self.info_list = QTableView()
+        self.info_list.setModel(self.info_model)
+        self.info_list.horizontalHeader().hide()
+        self.info_list.horizontalHeader().setStretchLastSection(True)
+        self.info_list.verticalHeader().hide()
+        self.info_list.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.info_list.verticalHeader().setDefaultSectionSize(40)
+        self.info_list.setShowGrid(False)
+        self.info_list.setWordWrap(False)
+        self.info_list.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         self.info_list.setStyleSheet("""
-            QListWidget {
+            QTableView {
                 border: 1px solid #E0E0E0;
                 border-radius: 5px;
                 font-family: Arial, sans-serif;
@@ -203,12 +350,12 @@ class QtProcessStates(QWidget):
                 padding: 5px;
                 background-color: #FAFAFA;
             }
-            QListWidget::item {
+            QTableView::item {
                 padding: 10px;
                 margin: 2px 0;
                 border-radius: 3px;
             }
-            QListWidget::item:hover {
+            QTableView::item:hover {
                 background-color: #E3F2FD;
             }
         """)
@@ -223,43 +370,9 @@ class QtProcessStates(QWidget):
         
         layout.addWidget(splitter)
 
-    def update_processes(self, processes):
+    def update_processes(self, processes, archived_count=0):
         # 更新左侧图
-        self.diagram.update_data(processes)
+        self.diagram.update_data(processes, archived_count)
         
-        # 更新右侧列表
-        self.info_list.clear()
-        # 按 PID 排序
-        sorted_procs = sorted(processes, key=lambda x: x.pid)
-        
-        for p in sorted_procs:
-            # 改进文本格式，确保信息完整显示
-            state_text = p.state.value  # 显示完整状态名称
-            item_text = f"PID: {p.pid} | 状态: {state_text} | 剩余: {p.remaining_time:.1f}s"
-            if p.state == ProcessState.RUNNING:
-                # 检查对象是否有cpu_id属性（避免RTOS_Task对象出现AttributeError）
-                if hasattr(p, 'cpu_id'):
-                    item_text += f" [CPU-{p.cpu_id}]"
-            elif p.state == ProcessState.BLOCKED:
-                item_text += " [IO]"
-                
-            item = QListWidgetItem(item_text)
-            
-            # 设置背景和文字颜色
-            if p.state == ProcessState.RUNNING:
-                item.setForeground(QColor("black"))  # 黑色字体
-                item.setBackground(QColor("#E74C3C"))  # 红色背景
-            elif p.state == ProcessState.READY:
-                item.setForeground(QColor("black"))  # 黑色字体
-                item.setBackground(QColor("#F9E79F"))  # 黄色背景
-            elif p.state == ProcessState.BLOCKED:
-                item.setForeground(QColor("black"))  # 黑色字体
-                item.setBackground(QColor("#8E44AD"))  # 紫色背景
-            elif p.state == ProcessState.TERMINATED:
-                item.setForeground(QColor("black"))  # 黑色字体
-                item.setBackground(QColor("#ECF0F1"))  # 灰色背景
-            else:
-                item.setForeground(QColor("black"))  # 黑色字体
-                item.setBackground(QColor("#A9DFBF"))  # 绿色背景
-                
-            self.info_list.addItem(item)
\ No newline at end of file
+        # 更新右侧列表 (按 PID 排序)
+        self.info_model.set_processes(processes)
@@ -1,15 +1,123 @@
 # visuals/qt_rtos_timeline.py
 # 修复版 V6：使用 ID 过滤日志，解决时间戳冲突导致的日志丢失问题
 
+from bisect import bisect_left, bisect_right
+
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QGroupBox, 
-                             QLabel, QTableWidget, QTableWidgetItem, QTextEdit, 
+                             QLabel, QTableWidget, QTableWidgetItem, QPlainTextEdit, 
                              QPushButton, QGridLayout, QHeaderView, QSplitter)
 from PyQt6.QtGui import QPainter, QColor, QPen, QFont, QBrush
 from PyQt6.QtCore import Qt, QRectF
 
-from src.system_status import STATUS
+from config import RTOS_LOG_MAX_LINES
 from src.process_model import ProcessState
-from src.modules_extension.extension_rtos import cpu_registers, trigger_external_interrupt, reset_rtos_data
+from src.modules_extension.extension_rtos import trigger_external_interrupt, reset_rtos_data, LATENCY_METRICS
+from src.modules_extension.rtos_nvic import IRQ_PID_BASE, is_irq_pid
+from src.modules_extension.rtos_context import REG_INDEX
+
+# 画布保留的运行区间数量 (与 STATUS.rtos_timeline 的事件上限无关，画布按增量累积)
+MAX_TIMELINE_INTERVALS = 50000
+
+# 结束当前运行区间的事件类型，以及开始新运行区间的事件类型
+_STOP_EVENTS = frozenset(["SWITCH_START", "IDLE", "BLOCKED", "TASK_FINISH", "JOB_FINISH"])
+_RUN_EVENTS = frozenset(["TASK_SWITCH", "ISR_EXEC", "ISR_FINISH"])  # ISR_FINISH 的 next_pid 为返回的上下文
+
+# 延迟统计的显示单位：{单位: 以纳秒计的大小}
+_DURATION_UNITS = {"ns": 1, "us": 1000, "ms": 1000000}
+
+
+def _context_label(pid):
+    """事件中的上下文 pid -> 显示名 (任务、中断或空闲)"""
+    if pid == -1:
+        return "空闲"
+    if is_irq_pid(pid):
+        return f"IRQ{pid - IRQ_PID_BASE}"
+    return f"P{pid}"
+
+
+def _format_duration(value, unit):
+    """把 unit 单位的数值换算为最合适的单位显示"""
+    if value is None:
+        return "-"
+    ns = value * _DURATION_UNITS[unit]
+    for name in ("ms", "us"):
+        if ns >= _DURATION_UNITS[name]:
+            return f"{ns / _DURATION_UNITS[name]:.3g} {name}"
+    return f"{ns:.3g} ns"
+
+
+class TimelineIntervals:
+    """
+    运行区间索引。
+    新增事件到达时按事件顺序增量生成 (pid, 开始, 结束) 区间；同一任务首尾相接的区间合并为一个。
+    区间互不重叠且按时间递增，开始和结束时间分别保存在有序列表中，
+    查询可见窗口时用 bisect 定位，代价只与窗口内的区间数有关。
+    """
+
+    def __init__(self, max_intervals=MAX_TIMELINE_INTERVALS):
+        self.max_intervals = max_intervals
+        self.clear()
+
+    def clear(self):
+        self.starts = []
+        self.ends = []
+        self.pids = []
+        self.last_seen = {}     # {pid: 最近一次出现在事件中的时间}，用于确定需要显示的行
+        self.running_pid = -1   # 最近一次切换事件后正在运行的 pid (-1 表示无)
+        self._open_pid = -1     # 尚未结束的区间
+        self._last_time = 0
+
+    def extend(self, events):
+        last_seen = self.last_seen
+        for ev in events:
+            ev_time = ev['time']
+            if ev_time > self._last_time and self._open_pid != -1:
+                self._append(self._open_pid, self._last_time, ev_time)
+
+            ev_type = ev['type']
+            if ev_type in _STOP_EVENTS:
+                self._open_pid = -1
+            elif ev_type == "DEADLINE_MISS" and ev['prev_pid'] == self._open_pid:
+                # 正在运行的作业超过截止时间被丢弃
+                self._open_pid = -1
+            elif ev_type in _RUN_EVENTS:
+                self._open_pid = ev['next_pid']
+            self._last_time = ev_time
+
+            if ev['prev_pid'] != -1: last_seen[ev['prev_pid']] = ev_time
+            if ev['next_pid'] != -1: last_seen[ev['next_pid']] = ev_time
+            self.running_pid = ev['next_pid'] if ev_type in _RUN_EVENTS else -1
+
+        if len(self.starts) > self.max_intervals * 5 // 4:
+            self._trim()
+
+    def _append(self, pid, start, end):
+        if self.pids and self.pids[-1] == pid and self.ends[-1] == start:
+            self.ends[-1] = end
+            return
+        self.starts.append(start)
+        self.ends.append(end)
+        self.pids.append(pid)
+
+    def _trim(self):
+        # 超出上限 25% 时一次性删除最早的区间，均摊后每个区间只移动常数次
+        excess = len(self.starts) - self.max_intervals
+        del self.starts[:excess]
+        del self.ends[:excess]
+        del self.pids[:excess]
+        oldest = self.starts[0]
+        self.last_seen = {pid: t for pid, t in self.last_seen.items() if t >= oldest}
+
+    def visible(self, start_t, end_t, current_time):
+        """返回与 [start_t, end_t] 相交的区间 [(pid, 开始, 结束)]，包括延伸到 current_time 的未结束区间"""
+        # 区间按时间递增且互不重叠：第一个结束时间大于 start_t 的区间即窗口内的第一个区间
+        first = bisect_right(self.ends, start_t)
+        last = bisect_left(self.starts, end_t, lo=first)
+        result = list(zip(self.pids[first:last], self.starts[first:last], self.ends[first:last]))
+        if self._open_pid != -1 and current_time > self._last_time and self._last_time < end_t:
+            result.append((self._open_pid, self._last_time, current_time))
+        return result
+
 
 # === 内部类 1: 逻辑分析仪绘图画布 ===
 class RTOSLogicAnalyzer(QWidget):
@@ -17,7 +125,9 @@ class RTOSLogicAnalyzer(QWidget):
         super().__init__(parent)
         self.setMinimumHeight(280)
         self.setStyleSheet("background-color: #1E1E1E;")
-        self.timeline_data = []
+        self.intervals = TimelineIntervals()  # 运行区间索引，由快照中的新增事件增量扩展
+        self.tasks = {}          # {pid: RTOSTaskView}
+        self.current_time = 0.0
         self.pixels_per_ms = 4 
         self.row_height = 40  
         self.left_margin = 120
@@ -30,8 +140,21 @@ class RTOSLogicAnalyzer(QWidget):
 
         self.current_running_pid = -1
 
-    def update_data(self, data):
-        self.timeline_data = data
+    def update_data(self, new_events, tasks, now, reset=False):
+        """追加新增事件；tasks 为 None 表示任务视图没有变化"""
+        if reset:
+            self.intervals.clear()
+        if new_events:
+            self.intervals.extend(new_events)
+        if tasks is not None:
+            self.tasks = {t.pid: t for t in tasks}
+        self.current_time = now
+        self.update()
+
+    def clear(self):
+        self.intervals.clear()
+        self.tasks = {}
+        self.current_time = 0.0
         self.update()
 
     def paintEvent(self, event):
@@ -39,32 +162,25 @@ class RTOSLogicAnalyzer(QWidget):
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         painter.fillRect(self.rect(), QColor("#1E1E1E"))
         
-        current_sim_time = STATUS.global_timer
-
-        self.current_running_pid = -1
-        if self.timeline_data:
-            last_evt = self.timeline_data[-1]
-            if last_evt['type'] in ['TASK_SWITCH', 'ISR_EXEC']:
-                self.current_running_pid = last_evt['next_pid']
+        current_sim_time = self.current_time
+        self.current_running_pid = self.intervals.running_pid
 
         view_w = (self.width() - self.left_margin) / self.pixels_per_ms
         end_t = current_sim_time + 10  
         start_t = max(0, end_t - view_w)
 
-        active_pids = set(STATUS.all_processes.keys())
-        for evt in self.timeline_data:
-            if evt['prev_pid'] != -1: active_pids.add(evt['prev_pid'])
-            if evt['next_pid'] != -1: active_pids.add(evt['next_pid'])
+        active_pids = set(self.tasks.keys())
+        active_pids.update(self.intervals.last_seen)
         
         sorted_pids = []
         normal_pids = []
         isr_pids = []
 
         for pid in active_pids:
-            task = STATUS.all_processes.get(pid)
+            task = self.tasks.get(pid)
             is_isr = False
-            if task and getattr(task, 'is_isr', False): is_isr = True
-            elif pid >= 90: is_isr = True
+            if task and task.is_isr: is_isr = True
+            elif is_irq_pid(pid): is_isr = True
             
             if is_isr: isr_pids.append(pid)
             else: normal_pids.append(pid)
@@ -77,7 +193,7 @@ class RTOSLogicAnalyzer(QWidget):
             pid_y_map[pid] = y
             self._draw_row_background(painter, pid, y)
 
-        self._draw_intervals(painter, pid_y_map, start_t, current_sim_time)
+        self._draw_intervals(painter, pid_y_map, start_t, end_t, current_sim_time)
         self._draw_ruler(painter, start_t, end_t)
         
         line_x = self.left_margin + (current_sim_time - start_t) * self.pixels_per_ms
@@ -91,11 +207,11 @@ class RTOSLogicAnalyzer(QWidget):
         painter.setPen(QPen(self.c_grid, 1))
         painter.drawLine(self.left_margin, int(y + self.row_height), self.width(), int(y + self.row_height))
 
-        task = STATUS.all_processes.get(pid)
-        is_isr = (task and getattr(task, 'is_isr', False)) or (pid >= 90)
+        task = self.tasks.get(pid)
+        is_isr = (task and task.is_isr) or is_irq_pid(pid)
         
         if is_isr:
-            txt = f"[ISR] IRQ-{pid}"
+            txt = f"[ISR] IRQ-{pid - IRQ_PID_BASE}"
             color = self.c_isr
         else:
             prio = task.priority if task else "?"
@@ -120,45 +236,25 @@ class RTOSLogicAnalyzer(QWidget):
             painter.drawEllipse(11, int(y + 11), 18, 18)
             painter.setOpacity(1.0)
 
-    def _draw_intervals(self, painter, pid_y_map, start_t, current_time):
-        if not self.timeline_data: return
-        intervals = []
-        last_time = 0
-        last_pid = -1
-        
-        for ev in self.timeline_data:
-            ev_time = ev['time']
-            if ev_time > last_time and last_pid != -1:
-                intervals.append({'pid': last_pid, 'start': last_time, 'end': ev_time})
-            if ev['type'] in ["SWITCH_START", "IDLE", "BLOCKED", "TASK_FINISH"]:
-                last_pid = -1
-            elif ev['type'] in ["TASK_SWITCH", "ISR_EXEC"]:
-                last_pid = ev['next_pid']
-            last_time = ev_time
-
-        if last_pid != -1 and current_time > last_time:
-            intervals.append({'pid': last_pid, 'start': last_time, 'end': current_time})
-
-        for seg in intervals:
-            pid = seg['pid']
+    def _draw_intervals(self, painter, pid_y_map, start_t, end_t, current_time):
+        painter.setPen(Qt.PenStyle.NoPen)
+        for pid, seg_start, seg_end in self.intervals.visible(start_t, end_t, current_time):
             if pid not in pid_y_map: continue
             y = pid_y_map[pid]
-            x_start = self.left_margin + (seg['start'] - start_t) * self.pixels_per_ms
-            x_end = self.left_margin + (seg['end'] - start_t) * self.pixels_per_ms
+            x_start = self.left_margin + (seg_start - start_t) * self.pixels_per_ms
+            x_end = self.left_margin + (seg_end - start_t) * self.pixels_per_ms
             draw_x = max(self.left_margin, x_start)
             draw_w = max(0, x_end - draw_x)
             if draw_w <= 0 or x_start > self.width(): continue
 
-            is_isr = (pid >= 90)
+            is_isr = is_irq_pid(pid)
             base_color = self.c_isr if is_isr else self.c_high
             
             painter.setBrush(base_color)
-            painter.setPen(Qt.PenStyle.NoPen)
             painter.drawRect(QRectF(draw_x, y + 10, draw_w, self.row_height - 20))
             if is_isr:
                 painter.setBrush(QColor(255, 255, 255, 100))
                 painter.drawRect(QRectF(draw_x, y + 10, draw_w, self.row_height - 20))
-
     def _draw_ruler(self, painter, start_t, end_t):
         painter.setFont(QFont("Consolas", 8))
         painter.setPen(QPen(self.c_text, 1))
@@ -182,88 +278,178 @@ class CpuStatePanel(QWidget):
         layout = QHBoxLayout(self)
         # === 核心修改：改为使用 ID 跟踪 ===
         self.last_processed_id = -1 
+        self._priorities = {}  # {pid: 优先级}，用于日志中的任务切换说明
 
         reg_group = QGroupBox("Cortex-M 寄存器状态")
         reg_layout = QGridLayout(reg_group)
-        self.reg_labels = {}
+        self.reg_labels = {}  # {寄存器在寄存器文件中的序号: 标签}
+        self._reg_values = {}  # {序号: 标签上显示的值}，值变化时才重新格式化
         regs = ["R0", "R1", "R2", "R3", "R12", "LR", "PC", "SP"]
         for i, r in enumerate(regs):
             reg_layout.addWidget(QLabel(f"{r}:"), i//2, (i%2)*2)
             lbl = QLabel("00000000")
             lbl.setStyleSheet("font-family: Consolas; color: #00FF7F; background: #333; border: 1px solid #555; padding: 2px;")
-            self.reg_labels[r] = lbl
+            self.reg_labels[REG_INDEX[r]] = lbl
             reg_layout.addWidget(lbl, i//2, (i%2)*2+1)
-        layout.addWidget(reg_group, 1)
+        self.switch_label = QLabel("上下文切换: 0 次")
+        reg_layout.addWidget(self.switch_label, (len(regs) + 1)//2, 0, 1, 4)
+        self.memory_label = QLabel("")
+        reg_layout.addWidget(self.memory_label, (len(regs) + 1)//2 + 1, 0, 1, 4)
+
+        # 延迟统计：每项先列出所有任务的汇总，再列出各任务 / 中断
+        latency_group = QGroupBox("延迟统计 (直方图)")
+        latency_layout = QVBoxLayout(latency_group)
+        self.latency_table = QTableWidget()
+        self.latency_table.setColumnCount(6)
+        self.latency_table.setHorizontalHeaderLabels(["指标", "对象", "样本", "p50", "p99", "最大"])
+        self.latency_table.verticalHeader().setVisible(False)
+        self.latency_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.latency_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        latency_layout.addWidget(self.latency_table)
+
+        left_column = QVBoxLayout()
+        left_column.addWidget(reg_group)
+        left_column.addWidget(latency_group, 1)
+        layout.addLayout(left_column, 1)
 
         report_group = QGroupBox("实时内核分析报告 (Real-time Log)")
         rep_layout = QVBoxLayout(report_group)
-        self.log_text = QTextEdit()
+        # 纯文本控件按块 (每个事件一块) 限制行数，超出时自动丢弃最早的日志
+        self.log_text = QPlainTextEdit()
         self.log_text.setReadOnly(True)
+        self.log_text.setMaximumBlockCount(RTOS_LOG_MAX_LINES)
         self.log_text.setStyleSheet("background-color: #2D2D30; color: #E0E0E0; font-family: 'Microsoft YaHei UI', Consolas; font-size: 10pt;")
         rep_layout.addWidget(self.log_text)
         layout.addWidget(report_group, 2) 
 
     def reset(self):
         self.log_text.clear()
+        self.latency_table.setRowCount(0)
         self.last_processed_id = -1 
-        self.update_state()
+        self._priorities = {}
+        self._reg_values = {}
+        self.switch_label.setText("上下文切换: 0 次")
+        self.memory_label.setText("")
 
-    def update_log(self, data):
+    def update_log(self, data, tasks=()):
+        """data 为按 ID 递增的新事件；本次的所有日志合并为一次插入"""
         if not data: return
-        # 按 ID 排序确保顺序正确
-        all_events = sorted(list(data), key=lambda x: x.get('id', -1))
-        
-        for evt in all_events:
-            # === 核心修改：使用 ID 判断新旧 ===
-            eid = evt.get('id', -1)
-            if eid > self.last_processed_id:
-                self._append_single_log(evt)
-                self.last_processed_id = eid
-
-    def _append_single_log(self, evt):
+        self._priorities = {t.pid: t.priority for t in tasks}
+
+        # === 核心修改：使用 ID 判断新旧 ===
+        new_events = [evt for evt in data if evt.get('id', -1) > self.last_processed_id]
+        if not new_events:
+            return
+        self.last_processed_id = new_events[-1]['id']
+        # 超出行数上限的部分插入后也会被丢弃，只格式化最后的 RTOS_LOG_MAX_LINES 个事件
+        lines = [line for line in map(self._format_event, new_events[-RTOS_LOG_MAX_LINES:]) if line]
+        if not lines:
+            return
+        self.log_text.appendHtml("".join(lines))
+        sb = self.log_text.verticalScrollBar()
+        sb.setValue(sb.maximum())
+
+    def _format_event(self, evt):
+        """事件 -> 一行日志的 HTML (一个 div 对应文本控件中的一块)，不需要显示的事件返回空串"""
         t = evt['time']
         msg = ""
         color = "#FFFFFF"
         reason = evt.get('info', '')
 
         if evt['type'] == "ISR_TRIGGER":
-            msg = f"[T={t}ms] 🚨 <b>中断触发 (IRQ)</b>: <br>&nbsp;&nbsp;检测到外部硬件中断! 系统准备响应..."
+            msg = f"[T={t}ms] 🚨 <b>中断触发 (IRQ)</b>: <br>&nbsp;&nbsp;{_context_label(evt['next_pid'])}: {reason}，等待 NVIC 响应..."
             color = "#FF0000" 
         elif evt['type'] == "ISR_EXEC":
-            msg = f"[T={t}ms] ⚡ <b>执行中断服务程序 (ISR)</b>: <br>&nbsp;&nbsp;P{evt['prev_pid']} 被抢占 -> 执行 ISR-{evt['next_pid']}<br>&nbsp;&nbsp;原因: {reason}"
+            msg = f"[T={t}ms] ⚡ <b>执行中断服务程序 (ISR)</b>: <br>&nbsp;&nbsp;{_context_label(evt['prev_pid'])} 被抢占 -> 执行 {_context_label(evt['next_pid'])}<br>&nbsp;&nbsp;原因: {reason}"
             color = "#FFA500" 
         elif evt['type'] == "ISR_FINISH":
-            msg = f"[T={t}ms] ✅ <b>中断结束</b>: <br>&nbsp;&nbsp;ISR 执行完毕，返回线程模式。"
+            next_pid = evt['next_pid']
+            if is_irq_pid(next_pid):
+                target = f"尾链 / 返回 {_context_label(next_pid)}"
+            else:
+                target = "返回线程模式"
+            msg = f"[T={t}ms] ✅ <b>中断结束</b>: <br>&nbsp;&nbsp;{_context_label(evt['prev_pid'])} 执行完毕，{target}。"
             color = "#32CD32" 
         elif evt['type'] == "TASK_SWITCH":
             next_task_info = ""
-            if 'next_pid' in evt and evt['next_pid'] != -1 and evt['next_pid'] in STATUS.all_processes:
-                task = STATUS.all_processes[evt['next_pid']]
-                next_task_info = f" (优先级: {task.priority})"
+            if 'next_pid' in evt and evt['next_pid'] != -1 and evt['next_pid'] in self._priorities:
+                next_task_info = f" (优先级: {self._priorities[evt['next_pid']]})"
             msg = f"[T={t}ms] 🔄 <b>任务切换</b>: P{evt['prev_pid']} -> P{evt['next_pid']}{next_task_info} ({reason})"
             color = "#00CED1" 
         elif evt['type'] == "BLOCKED":
-            msg = f"[T={t}ms] 🛑 <b>阻塞</b>: P{evt['prev_pid']} 等待资源"
+            msg = f"[T={t}ms] 🛑 <b>阻塞</b>: P{evt['prev_pid']} {reason}"
             color = "#808080" 
         elif evt['type'] == "WAKEUP":
-            msg = f"[T={t}ms] 🔔 <b>唤醒</b>: P{evt['next_pid']} 进入就绪"
+            msg = f"[T={t}ms] 🔔 <b>唤醒</b>: P{evt['next_pid']} 进入就绪 ({reason})"
             color = "#FFD700" 
+        elif evt['type'] == "MUTEX_LOCK":
+            msg = f"[T={t}ms] 🔒 <b>获得互斥量</b>: P{evt['next_pid']} 持有 {reason}"
+            color = "#DAA520"
+        elif evt['type'] == "MUTEX_UNLOCK":
+            msg = f"[T={t}ms] 🔓 <b>释放互斥量</b>: P{evt['prev_pid']} 释放 {reason}"
+            color = "#DAA520"
+        elif evt['type'] == "PRIO_CHANGE":
+            msg = f"[T={t}ms] ⇅ <b>优先级变化</b>: P{evt['next_pid']} 有效优先级 {reason}"
+            color = "#FF69B4"
+        elif evt['type'] == "TICKLESS":
+            msg = f"[T={t}ms] ⏩ <b>无节拍空闲</b>: 所有任务都阻塞，{reason}。"
+            color = "#808080"
         elif evt['type'] == "IDLE":
             msg = f"[T={t}ms] 💤 <b>系统空闲</b>: CPU 进入低功耗模式。"
             color = "#808080"
         elif evt['type'] == "TASK_FINISH":
             msg = f"[T={t}ms] 🎉 <b>任务完成</b>: P{evt['prev_pid']} 执行完毕。"
             color = "#9370DB" 
-
-        if msg:
-            self.log_text.append(f"<span style='color:{color}'>{msg}</span>")
-            sb = self.log_text.verticalScrollBar()
-            sb.setValue(sb.maximum())
+        elif evt['type'] == "RELEASE":
+            msg = f"[T={t}ms] ⏰ <b>作业释放</b>: P{evt['next_pid']} {reason} 进入就绪"
+            color = "#87CEFA"
+        elif evt['type'] == "JOB_FINISH":
+            msg = f"[T={t}ms] ✔ <b>作业完成</b>: P{evt['prev_pid']} {reason}，等待下一周期。"
+            color = "#9370DB"
+        elif evt['type'] == "DEADLINE_MISS":
+            msg = f"[T={t}ms] ❌ <b>截止时间错过</b>: P{evt['prev_pid']} {reason}，作业被丢弃。"
+            color = "#FF4500"
+
+        if not msg:
+            return ""
+        return f"<div><span style='color:{color}'>{msg}</span></div>"
     
-    def update_state(self):
-        for r, val in cpu_registers.items():
-            if r in self.reg_labels:
-                self.reg_labels[r].setText(val)
+    def update_latency(self, summary):
+        """summary 为 LatencyStats.summary() 的结果"""
+        rows = []
+        for metric, entry in summary.items():
+            name, unit = LATENCY_METRICS[metric][0], entry['unit']
+            if not entry['all']['count']:
+                continue
+            rows.append((name, "全部", entry['all'], unit))
+            for key, stats in entry['by_key'].items():
+                rows.append(("", key, stats, unit))
+
+        self.latency_table.setRowCount(len(rows))
+        for i, (name, key, stats, unit) in enumerate(rows):
+            values = [name, key, str(stats['count'])]
+            values += [_format_duration(stats[k], unit) for k in ('p50', 'p99', 'max')]
+            for col, text in enumerate(values):
+                self.latency_table.setItem(i, col, QTableWidgetItem(text))
+
+    def update_state(self, registers, cpu_stats=None, memory=None):
+        """registers 为寄存器文件 (整数数组)，只格式化显示的、值有变化的寄存器"""
+        if registers is None:
+            return
+        for index, lbl in self.reg_labels.items():
+            value = registers[index]
+            if self._reg_values.get(index) != value:
+                self._reg_values[index] = value
+                lbl.setText(f"0x{value:08X}")
+        if cpu_stats and cpu_stats['switches']:
+            self.switch_label.setText(f"上下文切换: {cpu_stats['switches']} 次，"
+                                      f"平均 {cpu_stats['mean_cycles']:.1f} 周期")
+        if memory:
+            msp, pool = memory['main_stack'], memory['stack_pool']
+            text = (f"主栈峰值: {msp['peak']}/{msp['size']} 字节，"
+                    f"任务栈内存池: {pool['used']}/{pool['blocks']} 块 ({pool['block_size']} 字节)")
+            if self.memory_label.text() != text:
+                self.memory_label.setText(text)
 
 # === 主类 ===
 class QtRTOSimeline(QWidget):
@@ -290,8 +476,8 @@ class QtRTOSimeline(QWidget):
         tcb_group = QGroupBox("任务控制块 (TCB)")
         tcb_layout = QVBoxLayout(tcb_group)
         self.tcb_table = QTableWidget()
-        self.tcb_table.setColumnCount(4)
-        self.tcb_table.setHorizontalHeaderLabels(["PID", "优先级", "状态", "说明"])
+        self.tcb_table.setColumnCount(5)
+        self.tcb_table.setHorizontalHeaderLabels(["PID", "优先级", "状态", "说明", "栈峰值 (字节)"])
         self.tcb_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         tcb_layout.addWidget(self.tcb_table)
         bottom_splitter.addWidget(tcb_group)
@@ -302,40 +488,53 @@ class QtRTOSimeline(QWidget):
         bottom_splitter.setSizes([350, 550])
         main_layout.addWidget(bottom_splitter, 1)
         
-        self.do_reset()
+        # 构建时只清空显示，不重置 RTOS 数据：页面可能在模拟运行后才第一次打开
+        self.clear_view()
 
     def do_reset(self):
         reset_rtos_data() 
-        self.analyzer.update_data([])
+        self.clear_view()
+
+    def clear_view(self):
+        self.analyzer.clear()
         self.cpu_panel.reset() 
         self.tcb_table.setRowCount(0)
     
     def reset_simulation(self):
         self.do_reset()
 
-    def update_timeline(self, data):
-        self.analyzer.update_data(data)
-        self.cpu_panel.update_state()
-        self.cpu_panel.update_log(data) 
+    def apply_snapshot(self, snap):
+        """应用快照中的 RTOS 分区：新增事件、任务视图和寄存器"""
+        if snap.rtos_reset:
+            self.cpu_panel.reset()
+        tasks = snap.rtos_tasks if snap.rtos_tasks_changed else None
+        self.analyzer.update_data(snap.rtos_events, tasks, snap.global_timer, snap.rtos_reset)
+        self.cpu_panel.update_state(snap.rtos_registers, snap.rtos_cpu, snap.rtos_memory)
+        self.cpu_panel.update_log(snap.rtos_events, snap.rtos_tasks)
+        if snap.rtos_latency is not None:
+            self.cpu_panel.update_latency(snap.rtos_latency)
+        if tasks is None:
+            # 任务状态没有变化时不重建 TCB 表
+            return
         
-        tasks = list(STATUS.all_processes.values())
-        tasks.sort(key=lambda x: (not getattr(x, 'is_isr', False), x.priority))
+        tasks = sorted(snap.rtos_tasks, key=lambda x: (not x.is_isr, x.priority))
         
         self.tcb_table.setRowCount(len(tasks))
         for i, t in enumerate(tasks):
             pid_item = QTableWidgetItem(str(t.pid))
-            if getattr(t, 'is_isr', False):
-                pid_item.setText(f"{t.pid} (ISR)")
+            if t.is_isr:
+                pid_item.setText(f"IRQ{t.pid - IRQ_PID_BASE} (ISR)")
             
             self.tcb_table.setItem(i, 0, pid_item)
             self.tcb_table.setItem(i, 1, QTableWidgetItem(str(t.priority)))
             
             state_str = t.state.value
-            if getattr(t, 'is_isr', False) and t.state == ProcessState.RUNNING:
+            if t.is_isr and t.state == ProcessState.RUNNING:
                 state_str = "RUNNING (ISR)"
             
             self.tcb_table.setItem(i, 2, QTableWidgetItem(state_str))
             
-            reason = getattr(t, 'block_reason', '-')
-            if getattr(t, 'is_isr', False): reason = "Hard IRQ"
-            self.tcb_table.setItem(i, 3, QTableWidgetItem(reason))
\ No newline at end of file
+            reason = t.block_reason
+            self.tcb_table.setItem(i, 3, QTableWidgetItem(reason))
+            stack = f"{t.stack[0]}/{t.stack[1]}" if t.stack else "-"
+            self.tcb_table.setItem(i, 4, QTableWidgetItem(stack))
\ No newline at end of file
@@ -8,15 +8,18 @@ from PyQt6.QtWidgets import (
     QGraphicsEllipseItem, QGraphicsLineItem, QGraphicsPathItem, QGraphicsItem,
     QSpinBox, QTextEdit, QGraphicsDropShadowEffect
 )
-from PyQt6.QtCore import Qt, QTimer, QRectF, QPointF, QLineF
+from PyQt6.QtCore import Qt, QRectF, QPointF, QLineF
 from PyQt6.QtGui import (
     QBrush, QPen, QColor, QFont, QPainter, QPainterPath, 
     QRadialGradient
 )
-import random
 import math
 import time
 
+from src.modules_core.module_3_sync_semaphores import SemaphoreModelEngine
+from qt_frontend.engine_workers import EngineWorker
+from qt_frontend.frame_clock import FrameClock
+
 # === 主题色彩 ===
 C_BG        = QColor("#FFFFFF")
 C_PANEL     = QColor("#F8F9FA")
@@ -126,32 +129,20 @@ class QtSemaphoreVisualization(QWidget):
         super().__init__()
         self.current_model = "producer_consumer"
         self.simulation_running = False
-        self.logic_timer = QTimer(self)
-        self.logic_timer.timeout.connect(self.run_logic_step)
-        self.anim_timer = QTimer(self)
-        self.anim_timer.timeout.connect(self.update_animations)
-        self.anim_timer.start(16)
-        self.state = self.create_initial_state()
+        self.reader_balls = {}
+        # 模型逻辑在工作线程中推进，界面只播放收到的增量；epoch 用于丢弃切换模型之前的事件
+        self.engine = SemaphoreModelEngine(self.current_model)
+        self.worker = EngineWorker(self.engine, step_ms=50, name="semaphore")
+        self.worker.deltas_ready.connect(self.apply_deltas)
+        self._epoch = 0
+        self._synced = True
+        # 动画由全局帧时钟驱动，页面隐藏时自动暂停
+        self.anim_timer = FrameClock.instance().subscribe(self, self.update_animations, fps=60)
         self.init_ui()
         self.draw_producer_consumer()
         # 默认隐藏读者-写者模型专用控件
         self.rw_controls_container.hide()
-
-    def create_initial_state(self):
-        return {
-            "buffer": [0]*5,
-            "semaphores": {},
-            "blocked_queue": [],
-            "blocked_requests": [],
-            "req_seq": 0,
-            "philosophers": [0]*5,
-            "fork_owners": [None]*5,
-            "fork_returning": [False]*5,
-            "readers": [],
-            "writer_active": False,
-            "writer_timer": 0,
-            "resource_request_queue": []
-        }
+        self.worker.start()
 
     def init_ui(self):
         main_layout = QHBoxLayout(self)
@@ -214,7 +205,7 @@ class QtSemaphoreVisualization(QWidget):
         self.spin_speed = QSpinBox()
         self.spin_speed.setRange(200, 3000)
         self.spin_speed.setValue(1000)
-        self.spin_speed.valueChanged.connect(lambda v: self.logic_timer.setInterval(v))
+        self.spin_speed.valueChanged.connect(lambda v: self.worker.call(self.engine.set_interval, v))
         self.spin_speed.setStyleSheet("background: white; color: #333; padding: 5px; border: 1px solid #CBD5E1; border-radius: 4px;")
         panel_layout.addWidget(self.spin_speed)
 
@@ -229,6 +220,7 @@ class QtSemaphoreVisualization(QWidget):
         self.combo_rw_strategy.addItems(["读者优先", "写者优先", "读写公平"])
         self.combo_rw_strategy.setCurrentIndex(0)
         self.combo_rw_strategy.setToolTip("选择读写优先策略：读者优先 / 写者优先 / 读写公平（先到先服务）")
+        self.combo_rw_strategy.currentIndexChanged.connect(self.update_rw_options)
         rw_controls_layout.addWidget(self.combo_rw_strategy)
 
         # === 新增：最大读者/写者数设置 ===
@@ -236,12 +228,14 @@ class QtSemaphoreVisualization(QWidget):
         self.spin_max_readers = QSpinBox()
         self.spin_max_readers.setRange(1, 50)
         self.spin_max_readers.setValue(10)
+        self.spin_max_readers.valueChanged.connect(self.update_rw_options)
         rw_controls_layout.addWidget(self.spin_max_readers)
 
         rw_controls_layout.addWidget(QLabel("最大写者数:"))
         self.spin_max_writers = QSpinBox()
         self.spin_max_writers.setRange(1, 50)
         self.spin_max_writers.setValue(5)
+        self.spin_max_writers.valueChanged.connect(self.update_rw_options)
         rw_controls_layout.addWidget(self.spin_max_writers)
 
         # 将容器添加到主面板布局
@@ -272,8 +266,6 @@ class QtSemaphoreVisualization(QWidget):
 
     def draw_producer_consumer(self):
         self.init_scene_background()
-        self.state = self.create_initial_state()
-        self.state["semaphores"] = {"mutex":1, "empty":5, "full":0}
         self.lbl_desc.setText("【生产者-消费者】\n\n工厂(左)生产数据块，放入传送带。消费者(右)取走。")
         sx, sy = 220, 200
         belt = QGraphicsRectItem(sx-10, sy, 380, 70)
@@ -307,10 +299,7 @@ class QtSemaphoreVisualization(QWidget):
 
     def draw_reader_writer(self):
         self.init_scene_background()
-        self.state = self.create_initial_state()
-        self.state["semaphores"] = {"rw_mutex":1, "mutex":1}
-        # 初始化读者计数器（虽然不再直接使用，但为了兼容现有代码保留）
-        self.state["read_count"] = 0
+        self.reader_balls = {}
         self.lbl_desc.setText("【读者-写者】\n\n可在右侧选择读写优先策略：读者优先 / 写者优先 / 读写公平。")
         lib_rect = QGraphicsRectItem(250, 100, 300, 200)
         self.visual_items["library"] = lib_rect
@@ -342,8 +331,6 @@ class QtSemaphoreVisualization(QWidget):
 
     def draw_philosophers(self):
         self.init_scene_background()
-        self.state = self.create_initial_state()
-        self.state["fork_owners"] = [None] * 5
         self.lbl_desc.setText("【哲学家就餐】\n\n观察叉子的移动。")
         cx, cy = 400, 250
         radius = 140
@@ -396,28 +383,61 @@ class QtSemaphoreVisualization(QWidget):
         self.visual_items["blocked_start_pos"] = QPointF(x+180, y+12)
 
 # ---------------- 第 3 段 ----------------
-    def run_logic_step(self):
-        if self.current_model == "producer_consumer":
-            self.step_producer_consumer()
-        elif self.current_model == "reader_writer":
-            self.step_reader_writer()
-        elif self.current_model == "philosopher_dining":
-            self.step_philosophers()
-        self.update_common_ui()
-
-    def update_common_ui(self):
-        for k, v in self.state["semaphores"].items():
+    def apply_deltas(self, deltas):
+        """应用工作线程送来的一批增量：只负责动画与显示，模型状态全部在引擎中"""
+        last = None
+        for delta in deltas:
+            op = delta['op']
+            if op == 'reset':
+                # 切换模型 / 重置之前发出的事件已经过时，直到收到本次请求对应的 reset 才继续应用
+                if delta['epoch'] == self._epoch:
+                    self._synced = True
+                    last = delta
+                continue
+            if not self._synced:
+                continue
+            last = delta
+            if op == 'log':
+                self.log(delta['msg'])
+            elif op == 'slot':
+                color = C_OK if delta['full'] else QColor("white")
+                self.visual_items["slots"][delta['index']].setBrush(QBrush(color))
+            elif op == 'reader_enter':
+                self.spawn_reader(delta['reader'])
+            elif op == 'reader_leave':
+                ball = self.reader_balls.pop(delta['reader'], None)
+                if ball is not None:
+                    ball.state = "leaving"
+                    ball.set_target(QPointF(800, 150))
+                    self.rearrange_readers_positions()
+            elif op == 'phil':
+                self.update_phil_visual(delta['pid'], delta['state'])
+            elif op == 'fork_take':
+                self.move_fork_to_philosopher(delta['fork'], delta['pid'], delta['side'])
+            elif op == 'fork_return':
+                fork = delta['fork']
+                self.visual_items["forks"][fork].set_target(self.fork_table_pos[fork])
+                self.visual_items["forks"][fork].set_rotation_angle((fork + 0.5) * 72 - 90 + 90)
+        if last is not None:
+            self.update_common_ui(last)
+
+    def update_common_ui(self, status):
+        for k, v in status['semaphores'].items():
             if k in self.sem_items:
                 self.sem_items[k].update_value(v)
+        if "library" in self.visual_items:
+            if status['writer_active']:
+                self.visual_items["library"].setBrush(QBrush(QColor(239, 68, 68, 40)))
+            else:
+                self.visual_items["library"].setBrush(QBrush(QColor(2, 132, 199, 30)))
+            self.lbl_rc.setPlainText(f"Read Count: {status['read_count']}")
         for item in self.scene.items():
             if hasattr(item, "is_blocked_viz"):
                 self.scene.removeItem(item)
         if self.current_model != "philosopher_dining":
             base = self.visual_items.get("blocked_start_pos", QPointF(0,0))
-            # 使用真实的请求信息而不是简化的blocked_queue
-            blocked_requests = self.state["blocked_requests"]
-            for i, req in enumerate(blocked_requests):
-                color = C_DANGER if req["type"] == "Writer" else C_ACCENT
+            for i, req_type in enumerate(status['blocked']):
+                color = C_DANGER if req_type == "Writer" else C_ACCENT
                 # 创建阻塞方块
                 rect = QGraphicsRectItem(base.x() + i*30, base.y(), 24, 24)
                 rect.setBrush(QBrush(color))
@@ -425,7 +445,7 @@ class QtSemaphoreVisualization(QWidget):
                 rect.is_blocked_viz = True
                 self.scene.addItem(rect)
                 # 创建请求标签
-                label = QGraphicsTextItem(req["type"][0])  # 只显示R或W
+                label = QGraphicsTextItem(req_type[0])  # 只显示R或W
                 label.setFont(QFont("Consolas", 12))
                 label.setDefaultTextColor(Qt.GlobalColor.white)
                 # 计算标签位置，使其居中显示在方块内
@@ -436,467 +456,45 @@ class QtSemaphoreVisualization(QWidget):
                 label.is_blocked_viz = True
                 self.scene.addItem(label)
 
-    # --- 生产者/消费者 ---
-    def step_producer_consumer(self):
-        sem = self.state["semaphores"]
-        buf = self.state["buffer"]
-        action = random.choice(["produce", "consume", "idle"])
-        if action == "produce":
-            if sem["empty"] > 0:
-                if sem["mutex"] > 0:
-                    sem["mutex"] -= 1
-                    sem["empty"] -= 1
-                    for i in range(5):
-                        if buf[i] == 0:
-                            buf[i] = 1
-                            self.visual_items["slots"][i].setBrush(QBrush(C_OK))
-                            self.log(f"生产 -> Slot {i}")
-                            break
-                    sem["mutex"] += 1
-                    sem["full"] += 1
-                else:
-                    self.add_blocked("Prod")
-            else:
-                self.add_blocked("Prod")
-        elif action == "consume":
-            if sem["full"] > 0:
-                if sem["mutex"] > 0:
-                    sem["mutex"] -= 1
-                    sem["full"] -= 1
-                    for i in range(5):
-                        if buf[i] == 1:
-                            buf[i] = 0
-                            self.visual_items["slots"][i].setBrush(QBrush(QColor("white")))
-                            self.log(f"消费 <- Slot {i}")
-                            break
-                    sem["mutex"] += 1
-                    sem["empty"] += 1
-                    self.pop_blocked("Prod")
-                else:
-                    self.add_blocked("Cons")
-            else:
-                self.add_blocked("Cons")
-        if sem["mutex"] == 1:
-            if sem["empty"] > 0: self.pop_blocked("Prod")
-            if sem["full"] > 0: self.pop_blocked("Cons")
-
-    # --- 读写辅助管理（新增） ---
-    def _get_strategy(self):
-        txt = self.combo_rw_strategy.currentText()
-        if txt == "写者优先": return "writer_priority"
-        if txt == "读写公平": return "fair"
-        return "reader_priority"
-
-    def add_blocked(self, name):
-        if len(self.state["blocked_queue"]) < 10:
-            self.state["blocked_queue"].append(name)
-
-    def add_blocked_request(self, req_type):
-        seq = self.state.get("req_seq", 0) + 1
-        self.state["req_seq"] = seq
-        label = f"{req_type}-{seq}"
-        if len(self.state["blocked_queue"]) < 10:
-            self.state["blocked_queue"].append(req_type)
-        self.state["blocked_requests"].append({
-            "type": req_type,
-            "seq": seq,
-            "label": label,
-            "time": time.time()
-        })
-        self.log(f"加入阻塞请求: {label}")
-        return label
-
-    def remove_blocked_request_by_label(self, label):
-        br = self.state["blocked_requests"]
-        for i, r in enumerate(br):
-            if r["label"] == label:
-                br.pop(i)
-                prefix = r["type"]
-                if prefix in self.state["blocked_queue"]:
-                    self.state["blocked_queue"].remove(prefix)
-                return True
-        return False
-
-    def pop_first_blocked_of_type(self, req_type):
-        br = self.state["blocked_requests"]
-        for i, r in enumerate(br):
-            if r["type"] == req_type:
-                req = br.pop(i)
-                if req_type in self.state["blocked_queue"]:
-                    self.state["blocked_queue"].remove(req_type)
-                return req
-        return None
-
-    def wake_next_on_resource_free(self):
-        strategy = self._get_strategy()
-        br = self.state["blocked_requests"]
-        if not br:
-            return
-        if strategy == "fair":
-            br.sort(key=lambda x: x["seq"])
-            head = br[0]
-            if head["type"] == "Writer":
-                # 检查当前是否有活跃读者
-                active_readers_count = len([b for b in self.state["readers"] if b.state != "leaving"])
-                if active_readers_count == 0:
-                    req = self.pop_first_blocked_of_type("Writer")
-                    if req:
-                        self._start_writer_from_request(req)
-            else:
-                # 计算当前活跃读者数量
-                active_readers_count = len([b for b in self.state["readers"] if b.state != "leaving"])
-                max_r = self.spin_max_readers.value()
-                available_slots = max_r - active_readers_count
-                
-                readers_to_wake = []
-                br_sorted = sorted(self.state["blocked_requests"], key=lambda x: x["seq"])
-                for r in br_sorted:
-                    if r["type"] == "Reader":
-                        if available_slots > 0:
-                            readers_to_wake.append(r)
-                            available_slots -= 1
-                    else:
-                        break
-                for r in readers_to_wake:
-                    self.remove_blocked_request_by_label(r["label"])
-                    self.spawn_reader(True, from_block=True, request_label=r["label"])
-            return
-        if strategy == "writer_priority":
-            if any(r["type"] == "Writer" for r in br):
-                req = self.pop_first_blocked_of_type("Writer")
-                if req:
-                    self._start_writer_from_request(req)
-                return
-            else:
-                # 计算当前活跃读者数量
-                active_readers_count = len([b for b in self.state["readers"] if b.state != "leaving"])
-                max_r = self.spin_max_readers.value()
-                available_slots = max_r - active_readers_count
-                
-                readers = [r for r in sorted(br, key=lambda x: x["seq"]) if r["type"] == "Reader"]
-                # 只唤醒可以容纳的读者数量
-                readers_to_wake = readers[:available_slots]
-                for r in readers_to_wake:
-                    self.remove_blocked_request_by_label(r["label"])
-                    self.spawn_reader(True, from_block=True, request_label=r["label"])
-                return
-        if strategy == "reader_priority":
-            # 计算当前活跃读者数量
-            active_readers_count = len([b for b in self.state["readers"] if b.state != "leaving"])
-            max_r = self.spin_max_readers.value()
-            
-            if active_readers_count > 0:
-                # 有活跃读者，按照读者优先策略，唤醒尽可能多的读者，但不超过最大读者数
-                readers = [r for r in sorted(br, key=lambda x: x["seq"]) if r["type"] == "Reader"]
-                available_slots = max_r - active_readers_count
-                
-                if available_slots > 0:
-                    # 只唤醒可以容纳的读者数量
-                    readers_to_wake = readers[:available_slots]
-                    for r in readers_to_wake:
-                        self.remove_blocked_request_by_label(r["label"])
-                        self.spawn_reader(True, from_block=True, request_label=r["label"])
-                return
-            else:
-                if self.state.get("writer_active", False):
-                    return
-                
-                # 没有活跃读者，先检查是否有读者等待
-                readers = [r for r in sorted(br, key=lambda x: x["seq"]) if r["type"] == "Reader"]
-                if readers:
-                    # 唤醒尽可能多的读者，但不超过最大读者数
-                    available_slots = max_r
-                    readers_to_wake = readers[:available_slots]
-                    for r in readers_to_wake:
-                        self.remove_blocked_request_by_label(r["label"])
-                        self.spawn_reader(True, from_block=True, request_label=r["label"])
-                    return
-                
-                # 没有读者等待，唤醒写者
-                if any(r["type"] == "Writer" for r in br):
-                    req = self.pop_first_blocked_of_type("Writer")
-                    if req:
-                        self._start_writer_from_request(req)
-                return
-
-    def _start_writer_from_request(self, req):
-        sem = self.state["semaphores"]
-        if sem.get("rw_mutex", 1) > 0 and not self.state.get("writer_active", False):
-            sem["rw_mutex"] = 0
-            self.state["writer_active"] = True
-            self.state["writer_timer"] = 3
-            if "library" in self.visual_items:
-                self.visual_items["library"].setBrush(QBrush(QColor(239, 68, 68, 40)))
-            self.log(f"唤醒写者 {req['label']} 开始写入")
-            return True
-        else:
-            return False
-
-    def spawn_reader(self, success, from_block=False, request_label=None):
-        if not success:
-            if not from_block:
-                self.add_blocked_request("Reader")
-            else:
-                pass
-            return
-
-        # 再次检查当前活跃读者数量是否已经超过最大读者数
-        max_r = self.spin_max_readers.value()
-        active_readers_count = len([b for b in self.state["readers"] if b.state != "leaving"])
-        if active_readers_count >= max_r:
-            # 如果已经超过最大读者数，将请求重新添加到阻塞队列中（如果是从阻塞队列唤醒的请求）
-            if from_block and request_label:
-                self.add_blocked_request("Reader")
-                self.log(f"读者 {request_label} 唤醒失败，已达到最大读者数限制")
-            return
-
+    # --- 读者 ---
+    def spawn_reader(self, reader_id):
         def on_done(b):
-            if b in self.state["readers"]:
-                self.state["readers"].remove(b)
             try:
                 self.scene.removeItem(b)
             except:
                 pass
-            # === 修复点：使用正确函数名 ===
-            self.rearrange_readers_positions()
 
         ball = ReaderBall(QPointF(50, 150), QPointF(310, 130))
         ball.callback_done = on_done
         self.scene.addItem(ball)
-        self.state["readers"].append(ball)
-        # 不再直接使用独立计数器，而是基于实际读者数量
-        pass
-        self.log(f"读者进入 {'(被唤醒:'+request_label+')' if from_block and request_label else ''}")
+        self.reader_balls[reader_id] = ball
         self.rearrange_readers_positions()
 
     def rearrange_readers_positions(self):
-        active_readers = [b for b in self.state["readers"] if b.state != "leaving"]
-        for i, reader in enumerate(active_readers):
+        # reader_balls 只保存仍在阅览区内的读者（按进入顺序）
+        for i, reader in enumerate(self.reader_balls.values()):
             rows = i // 5
             cols = i % 5
             target_x = 310 + cols * 40
             target_y = 130 + rows * 35
             reader.set_target(QPointF(target_x, target_y))
 
-# ---------------- 第 4 段 ----------------
-    def step_reader_writer(self):
-        sem = self.state["semaphores"]
-        r = random.random()
-
-        # 读者到达（30%）
-        if r < 0.3:
-            strategy = self._get_strategy()
-            # 最大读者限制
-            max_r = self.spin_max_readers.value()
-            # 计算当前活跃读者数量
-            active_readers_count = len([b for b in self.state["readers"] if b.state != "leaving"])
-            if active_readers_count >= max_r:
-                self.add_blocked_request("Reader")
-                self.log("读者达到最大上限，被阻塞")
-                return
-
-            if sem["mutex"] > 0:
-                sem["mutex"] = 0
-                can_enter = False
-                if strategy == "reader_priority":
-                    if self.state.get("writer_active", False):
-                        can_enter = False
-                    else:
-                        # 计算当前活跃读者数量
-                        active_readers_count = len([b for b in self.state["readers"] if b.state != "leaving"])
-                        if sem.get("rw_mutex", 1) == 0 and active_readers_count > 0:
-                            can_enter = True
-                        else:
-                            if sem.get("rw_mutex", 1) > 0:
-                                can_enter = True
-                            else:
-                                can_enter = False
-                elif strategy == "writer_priority":
-                    writers_waiting = any(req["type"] == "Writer" for req in self.state["blocked_requests"])
-                    if self.state.get("writer_active", False) or writers_waiting or sem.get("rw_mutex", 1) == 0:
-                        can_enter = False
-                    else:
-                        can_enter = True
-                else: # fair
-                    hypothetical_seq = self.state.get("req_seq", 0) + 1
-                    earliest_writer_seq = None
-                    for req in self.state["blocked_requests"]:
-                        if req["type"] == "Writer":
-                            if earliest_writer_seq is None or req["seq"] < earliest_writer_seq:
-                                earliest_writer_seq = req["seq"]
-                    if earliest_writer_seq is not None and earliest_writer_seq < hypothetical_seq:
-                        can_enter = False
-                    else:
-                        if self.state.get("writer_active", False):
-                            can_enter = False
-                        else:
-                            can_enter = True
-
-                if can_enter:
-                    # 计算当前活跃读者数量
-                    active_readers_count = len([b for b in self.state["readers"] if b.state != "leaving"])
-                    if active_readers_count == 0:
-                        if sem.get("rw_mutex", 1) > 0:
-                            sem["rw_mutex"] = 0
-                    self.spawn_reader(True)
-                    # 计算新的活跃读者数量（加1）
-                    new_active_readers_count = active_readers_count + 1
-                    self.log(f"读者进入 (第{new_active_readers_count}位)")
-                else:
-                    self.add_blocked_request("Reader")
-                    self.log("读者被阻塞 (加入等待队列)")
-                sem["mutex"] = 1
-            else:
-                self.add_blocked_request("Reader")
-                self.log("读者被阻塞 (mutex 不可用)")
-
-        # 读者离开（20%）
-        elif r < 0.5:
-            # 计算当前活跃读者数量
-            active_readers_count = len([b for b in self.state["readers"] if b.state != "leaving"])
-            if active_readers_count > 0:
-                if sem["mutex"] > 0:
-                    sem["mutex"] = 0
-                    active_readers = [b for b in self.state["readers"] if b.state == "reading"]
-                    if active_readers:
-                        b = active_readers[0]
-                        b.state = "leaving"
-                        b.set_target(QPointF(800, 150))
-                        # 计算离开后的活跃读者数量
-                        new_active_readers_count = len([b for b in self.state["readers"] if b.state != "leaving"]) - 1
-                        if new_active_readers_count <= 0:
-                            sem["rw_mutex"] = 1
-                            self.log("最后一位读者离开")
-                        # 无论是否是最后一位读者离开，都检查是否有等待的读者可以唤醒
-                        self.wake_next_on_resource_free()
-                    sem["mutex"] = 1
-
-        # 写者尝试（20%）
-        elif r < 0.7:
-            strategy = self._get_strategy()
-            # 最大写者限制（包括正在写的和队列中的写者）
-            max_w = self.spin_max_writers.value()
-            current_writers = (1 if self.state.get("writer_active", False) else 0) + \
-                              sum(1 for rr in self.state["blocked_requests"] if rr["type"] == "Writer")
-            if current_writers < max_w:
-                # 只有当当前写者数（包括正在写的和队列中的）小于最大写者数时，才允许新的写者请求
-                if sem.get("rw_mutex", 1) > 0 and not self.state.get("writer_active", False):
-                    allow_writer_now = True
-                    if strategy == "fair":
-                        hypothetical_seq = self.state.get("req_seq", 0) + 1
-                        earlier_reader = any(req["type"] == "Reader" and req["seq"] < hypothetical_seq for req in self.state["blocked_requests"])
-                        if earlier_reader:
-                            allow_writer_now = False
-                    # 计算当前活跃读者数量
-                    active_readers_count = len([b for b in self.state["readers"] if b.state != "leaving"])
-                    if allow_writer_now and active_readers_count == 0:
-                        sem["rw_mutex"] = 0
-                        self.state["writer_active"] = True
-                        self.state["writer_timer"] = 3
-                        if "library" in self.visual_items:
-                            self.visual_items["library"].setBrush(QBrush(QColor(239, 68, 68, 40)))
-                        self.log("写者正在写入...")
-                    else:
-                        label = self.add_blocked_request("Writer")
-                        self.log(f"写者被阻塞 (加入等待队列: {label})")
-                else:
-                    label = self.add_blocked_request("Writer")
-                    self.log(f"写者被阻塞 (加入等待队列: {label})")
-            else:
-                self.log(f"写者达到最大上限 ({current_writers}/{max_w})，拒绝新的写者请求")
-                return
-
-        # 写者处理（计时）
-        if self.state.get("writer_active", False):
-            self.state["writer_timer"] -= 1
-            if self.state["writer_timer"] <= 0:
-                self.state["writer_active"] = False
-                sem["rw_mutex"] = 1
-                if "library" in self.visual_items:
-                    self.visual_items["library"].setBrush(QBrush(QColor(2, 132, 199, 30)))
-                self.log("写者离开")
-                self.wake_next_on_resource_free()
-
-        # 计算实际活跃的读者数量（与小蓝圈数量一致）
-        active_readers_count = len([b for b in self.state["readers"] if b.state != "leaving"])
-        self.lbl_rc.setPlainText(f"Read Count: {active_readers_count}")
-
-    # --- 哲学家模型 ---
-    def step_philosophers(self):
-        owners = self.state["fork_owners"]
-        fork_returning = self.state["fork_returning"]
-        request_queue = self.state["resource_request_queue"]
-        for pid in range(5):
-            if self.state["philosophers"][pid] == 2:
-                left_fork = (pid + 4) % 5
-                right_fork = pid
-                if random.random() < 0.4:
-                    fork_returning[left_fork] = True
-                    fork_returning[right_fork] = True
-                    self.state["philosophers"][pid] = 0
-                    self.update_phil_visual(pid, 0)
-                    self.visual_items["forks"][left_fork].set_target(self.fork_table_pos[left_fork])
-                    self.visual_items["forks"][right_fork].set_target(self.fork_table_pos[right_fork])
-                    left_fork_angle = (left_fork + 0.5) * 72 - 90 + 90
-                    right_fork_angle = (right_fork + 0.5) * 72 - 90 + 90
-                    self.visual_items["forks"][left_fork].set_rotation_angle(left_fork_angle)
-                    self.visual_items["forks"][right_fork].set_rotation_angle(right_fork_angle)
-                    self.log(f"P{pid} 吃完了，开始归还左右两边的叉子")
-        thinking_pids = [pid for pid in range(5) if self.state["philosophers"][pid] == 0]
-        if thinking_pids and random.random() < 0.5:
-            pid = random.choice(thinking_pids)
-            self.state["philosophers"][pid] = 1
-            self.update_phil_visual(pid, 1)
-            if pid not in request_queue:
-                request_queue.append(pid)
-                self.log(f"P{pid} 饿了，加入请求队列，当前队列: {request_queue}")
-            else:
-                self.log(f"P{pid} 饿了，已在请求队列中")
-            self.try_to_eat(pid)
-        self.check_queue_and_eat()
-
-    def try_to_eat(self, pid):
-        if self.state["philosophers"][pid] != 1:
-            return False
-        owners = self.state["fork_owners"]
-        fork_returning = self.state["fork_returning"]
-        left_fork = (pid + 4) % 5
-        right_fork = pid
-        if (owners[left_fork] is None and owners[right_fork] is None and 
-            not fork_returning[left_fork] and not fork_returning[right_fork]):
-            owners[left_fork] = pid
-            owners[right_fork] = pid
-            self.state["philosophers"][pid] = 2
-            self.update_phil_visual(pid, 2)
-            if pid in self.state["resource_request_queue"]:
-                self.state["resource_request_queue"].remove(pid)
-            cx, cy = self.phil_pos[pid].x(), self.phil_pos[pid].y()
-            angle = pid * 72 - 90
-            rad = math.radians(angle)
-            offset_distance = 30
-            left_x = cx - offset_distance * math.cos(rad)
-            left_y = cy - offset_distance * math.sin(rad)
-            right_x = cx + offset_distance * math.cos(rad)
-            right_y = cy + offset_distance * math.sin(rad)
-            left_x += 5 * math.sin(rad)
-            left_y -= 5 * math.cos(rad)
-            right_x -= 5 * math.sin(rad)
-            right_y += 5 * math.cos(rad)
-            self.visual_items["forks"][left_fork].set_target(QPointF(left_x, left_y))
-            self.visual_items["forks"][right_fork].set_target(QPointF(right_x, right_y))
-            left_fork_angle = angle - 90
-            right_fork_angle = angle + 90
-            self.visual_items["forks"][left_fork].set_rotation_angle(left_fork_angle)
-            self.visual_items["forks"][right_fork].set_rotation_angle(right_fork_angle)
-            self.log(f"P{pid} 拿到左右两边的叉子，开始吃饭，队列剩余: {self.state['resource_request_queue']}")
-            return True
-        return False
-
-    def check_queue_and_eat(self):
-        queue_copy = self.state["resource_request_queue"].copy()
-        for pid in queue_copy:
-            if self.try_to_eat(pid):
-                break
+    # --- 哲学家 ---
+    def move_fork_to_philosopher(self, fork, pid, side):
+        cx, cy = self.phil_pos[pid].x(), self.phil_pos[pid].y()
+        angle = pid * 72 - 90
+        rad = math.radians(angle)
+        offset_distance = 30
+        if side == "left":
+            x = cx - offset_distance * math.cos(rad) + 5 * math.sin(rad)
+            y = cy - offset_distance * math.sin(rad) - 5 * math.cos(rad)
+            rotation = angle - 90
+        else:
+            x = cx + offset_distance * math.cos(rad) - 5 * math.sin(rad)
+            y = cy + offset_distance * math.sin(rad) + 5 * math.cos(rad)
+            rotation = angle + 90
+        self.visual_items["forks"][fork].set_target(QPointF(x, y))
+        self.visual_items["forks"][fork].set_rotation_angle(rotation)
 
     def update_phil_visual(self, pid, state_code):
         circle, txt = self.visual_items["phils"][pid]
@@ -910,18 +508,7 @@ class QtSemaphoreVisualization(QWidget):
             circle.setBrush(QBrush(C_OK))
             txt.setPlainText("Eating")
 
-    # --- 通用辅助 ---
-    def add_blocked_simple(self, name):
-        if len(self.state["blocked_queue"]) < 10:
-            self.state["blocked_queue"].append(name)
-
-    def pop_blocked(self, prefix):
-        for item in self.state["blocked_queue"]:
-            if item.startswith(prefix):
-                self.state["blocked_queue"].remove(item)
-                return True
-        return False
-
+# ---------------- 第 4 段 ----------------
     def log(self, msg):
         self.txt_log.append(f"> {msg}")
         sb = self.txt_log.verticalScrollBar()
@@ -930,27 +517,15 @@ class QtSemaphoreVisualization(QWidget):
     def update_animations(self):
         for item in self.scene.items():
             if isinstance(item, AnimatedGraphicsItem):
-                old_pos = item.current_pos
                 item.update_animation()
-                if isinstance(item, ForkItem):
-                    fork_id = -1
-                    for i, fork_item in enumerate(self.visual_items["forks"]):
-                        if fork_item is item:
-                            fork_id = i
-                            break
-                    if fork_id != -1:
-                        if self.state["fork_returning"][fork_id]:
-                            target_pos = self.fork_table_pos[fork_id]
-                            if (abs(item.current_pos.x() - target_pos.x()) < 0.5 and 
-                                abs(item.current_pos.y() - target_pos.y()) < 0.5):
-                                self.state["fork_returning"][fork_id] = False
-                                self.state["fork_owners"][fork_id] = None
-                                self.log(f"叉子 {fork_id} 已归还到桌子上，现在可以被使用")
-                                self.check_queue_and_eat()
+
+    def update_rw_options(self, *_):
+        strategies = ["reader_priority", "writer_priority", "fair"]
+        self.worker.call(self.engine.set_rw_options, strategies[self.combo_rw_strategy.currentIndex()],
+                         self.spin_max_readers.value(), self.spin_max_writers.value())
 
     def change_model(self, idx):
         self.simulation_running = False
-        self.logic_timer.stop()
         self.btn_control.setText("开始模拟")
         self.txt_log.clear()
         mods = ["producer_consumer", "reader_writer", "philosopher_dining"]
@@ -960,20 +535,21 @@ class QtSemaphoreVisualization(QWidget):
             self.rw_controls_container.hide()  # 隐藏读者-写者专用控件
         elif idx == 1:
             self.draw_reader_writer()
-            self.state["blocked_requests"] = []
-            self.state["blocked_queue"] = []
-            self.state["req_seq"] = 0
             self.rw_controls_container.show()  # 显示读者-写者专用控件
         elif idx == 2: 
             self.draw_philosophers()
             self.rw_controls_container.hide()  # 隐藏读者-写者专用控件
+        # 引擎切换模型后回送带同一 epoch 的 reset 事件，在此之前的事件都属于旧场景
+        self._epoch += 1
+        self._synced = False
+        self.worker.call(self.engine.set_model, self.current_model, self._epoch)
 
     def toggle_simulation(self):
         if self.simulation_running:
-            self.logic_timer.stop()
+            self.worker.call(self.engine.stop)
             self.btn_control.setText("开始模拟")
         else:
-            self.logic_timer.start(self.spin_speed.value())
+            self.worker.call(self.engine.start, time.monotonic())
             self.btn_control.setText("暂停模拟")
         self.simulation_running = not self.simulation_running
 
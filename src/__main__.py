@@ -0,0 +1,205 @@
+# src/__main__.py
+# 命令行入口：python -m src <引擎> [--seed N] [--config JSON] [--duration T]
+#            python -m src bench <基准> [--sizes N ...] [--steps N] [--seed N]
+#            python -m src analyze [--policy RM|EDF] [--taskset JSON | --tasks N --utilization U]
+#            python -m src trace [--distribution D --ops N | --trace FILE] [--algorithms A ...]
+# 无界面运行单个模拟引擎或性能基准，结果以 JSON 输出到 stdout，模块的日志输出转到 stderr
+
+import argparse
+import json
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+
+# 与 main.py 一致：保证可以导入项目根目录下的 config
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.headless_runner import RUNNERS, run
+from src.benchmark import BENCHMARKS, run_benchmark
+from src.memory_trace import DISTRIBUTIONS
+from src.modules_extension.rtos_memory import PoolExhausted
+
+
+def _load_config(value, defaults, parser):
+    """--config 可以是 JSON 文件路径，也可以直接是 JSON 字符串；只允许覆盖已有的配置项"""
+    config = dict(defaults)
+    if value is None:
+        return config
+    try:
+        if value.lstrip().startswith('{'):
+            overrides = json.loads(value)
+        else:
+            with open(value, encoding='utf-8') as f:
+                overrides = json.load(f)
+    except (OSError, ValueError) as e:
+        parser.error(f"无法读取配置 {value}: {e}")
+    if not isinstance(overrides, dict):
+        parser.error("配置必须是 JSON 对象")
+    unknown = sorted(set(overrides) - set(defaults))
+    if unknown:
+        parser.error(f"未知的配置项: {', '.join(unknown)} (可用: {', '.join(defaults)})")
+    config.update(overrides)
+    return config
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m src", description="无界面运行操作系统模拟引擎并输出 JSON 指标")
+    sub = parser.add_subparsers(dest='engine', required=True, metavar='engine')
+    for name, (_runner, defaults, duration, unit) in RUNNERS.items():
+        p = sub.add_parser(name, help=f"运行 {name} 引擎 (时长单位: {unit})")
+        p.add_argument('--seed', type=int, default=0, help="随机种子 (默认 0)")
+        p.add_argument('--config', help=f"JSON 文件路径或 JSON 字符串，默认: {json.dumps(defaults, ensure_ascii=False)}")
+        p.add_argument('--duration', type=float, default=duration, help=f"运行时长，单位为{unit} (默认 {duration})")
+
+    bench = sub.add_parser('bench', help="性能基准：测量每一步的耗时随规模的变化")
+    bench.add_argument('target', choices=sorted(BENCHMARKS), help="基准名")
+    bench.add_argument('--sizes', type=int, nargs='+', help="规模列表 (RTOS 为任务数，memory 为存活的内存块数)")
+    bench.add_argument('--steps', type=int, help="每个规模测量的步数")
+    bench.add_argument('--seed', type=int, default=0, help="随机种子 (默认 0)")
+
+    analyze = sub.add_parser('analyze', help="周期任务集的离线可调度性分析 (RM / EDF)")
+    analyze.add_argument('--policy', choices=["RM", "EDF"], default="RM", help="调度策略 (默认 RM)")
+    analyze.add_argument('--taskset', help='JSON 文件路径或 JSON 字符串：[{"C": 执行时间, "T": 周期, "D": 截止时间 (可选)}, ...]')
+    analyze.add_argument('--tasks', type=int, default=100, help="未给出 --taskset 时随机生成的任务数 (默认 100)")
+    analyze.add_argument('--utilization', type=float, default=0.7, help="随机任务集的总利用率 (默认 0.7)")
+    analyze.add_argument('--periods', type=int, nargs=2, default=[100, 100000], metavar=('MIN', 'MAX'),
+                         help="随机任务集的周期范围 (毫秒，默认 100 100000)")
+    analyze.add_argument('--seed', type=int, default=0, help="随机种子 (默认 0)")
+    analyze.add_argument('--per-task', action='store_true', help="输出 RM 下各任务的响应时间 (随机任务集以微秒为单位)")
+
+    trace = sub.add_parser('trace', help="生成 malloc / free 轨迹并在各内存分配算法上重放")
+    trace.add_argument('--distribution', choices=sorted(DISTRIBUTIONS), default='uniform', help="请求大小的分布 (默认 uniform)")
+    trace.add_argument('--ops', type=int, default=1000000, help="操作次数 (默认 1000000)")
+    trace.add_argument('--load', type=float, default=0.7, help="目标内存负载：存活块占总内存的比例 (默认 0.7)")
+    trace.add_argument('--seed', type=int, default=0, help="随机种子 (默认 0)")
+    trace.add_argument('--trace', help="重放已保存的轨迹文件 (忽略生成参数)")
+    trace.add_argument('--save', help="把生成的轨迹保存到文件")
+    trace.add_argument('--algorithms', nargs='+', help="分配策略 (默认全部)")
+    trace.add_argument('--samples', type=int, default=100, help="碎片率时间序列的采样点数 (默认 100)")
+    return parser
+
+
+def _main_bench(args, parser):
+    _bench, default_sizes, default_steps = BENCHMARKS[args.target]
+    sizes = args.sizes or list(default_sizes)
+    steps = args.steps or default_steps
+    try:
+        with redirect_stdout(sys.stderr):
+            results = run_benchmark(args.target, sizes, steps, args.seed)
+    except PoolExhausted as e:
+        parser.error(str(e))
+    json.dump({'bench': args.target, 'seed': args.seed, 'steps': steps, 'results': results},
+              sys.stdout, ensure_ascii=False)
+    sys.stdout.write("\n")
+    return 0
+
+
+def _load_taskset(value, parser):
+    """--taskset 解析为 [(pid, C, T, D)]，未给出 D 时取 D = T"""
+    try:
+        if value.lstrip().startswith('['):
+            items = json.loads(value)
+        else:
+            with open(value, encoding='utf-8') as f:
+                items = json.load(f)
+        params = []
+        for i, item in enumerate(items, start=1):
+            c, t = int(item['C']), int(item['T'])
+            params.append((int(item.get('pid', i)), c, t, int(item.get('D', t))))
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        parser.error(f"无法读取任务集 {value}: {e}")
+    for pid, c, t, d in params:
+        if not 0 < c <= d <= t:
+            parser.error(f"任务 {pid} 的参数需要满足 0 < C <= D <= T: C={c}, T={t}, D={d}")
+    return params
+
+
+def _main_analyze(args, parser):
+    from src.modules_extension import rtos_analysis
+
+    target = None
+    if args.taskset:
+        params = _load_taskset(args.taskset, parser)
+    else:
+        import random
+        random.seed(args.seed)
+        # 只生成 (C, T, D) 参数，不创建内核任务；以微秒为单位，执行时间的取整不会使利用率偏离目标
+        params = rtos_analysis.random_taskset(args.tasks, args.utilization, period_range=tuple(args.periods))
+        target = args.utilization
+
+    start = time.perf_counter()
+    result = rtos_analysis.analyze(params, args.policy, per_task=args.per_task, target_utilization=target)
+    if target is not None:
+        result['time_unit'] = "us"  # --taskset 的时间单位由输入决定，不输出
+    result['wall_ms'] = round((time.perf_counter() - start) * 1000, 3)
+    json.dump(result, sys.stdout, ensure_ascii=False)
+    sys.stdout.write("\n")
+    return 0
+
+
+def _main_trace(args, parser):
+    from src import memory_trace
+    from src.modules_extension.extension_memory import ALLOCATOR_STRATEGIES
+
+    unknown = sorted(set(args.algorithms or ()) - set(ALLOCATOR_STRATEGIES))
+    if unknown:
+        parser.error(f"未知的分配策略: {', '.join(unknown)} (可用: {', '.join(ALLOCATOR_STRATEGIES)})")
+    if args.trace:
+        try:
+            trace = memory_trace.load_trace(args.trace)
+        except (OSError, ValueError) as e:
+            parser.error(f"无法读取轨迹 {args.trace}: {e}")
+        source = {'trace': args.trace}
+    else:
+        if args.ops <= 0 or not 0 < args.load <= 1:
+            parser.error("--ops 需要为正数，--load 需要在 (0, 1] 内")
+        start = time.perf_counter()
+        trace = memory_trace.generate_trace(args.distribution, args.ops, args.seed, args.load)
+        source = {'distribution': args.distribution, 'seed': args.seed, 'load': args.load,
+                  'generate_ms': round((time.perf_counter() - start) * 1000, 3)}
+        if args.save:
+            memory_trace.save_trace(trace, args.save)
+
+    with redirect_stdout(sys.stderr):
+        result = memory_trace.run_trace(trace, args.algorithms, args.samples)
+    json.dump(dict(source, **result), sys.stdout, ensure_ascii=False)
+    sys.stdout.write("\n")
+    return 0
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.engine == 'bench':
+        return _main_bench(args, parser)
+    if args.engine == 'analyze':
+        return _main_analyze(args, parser)
+    if args.engine == 'trace':
+        return _main_trace(args, parser)
+    config = _load_config(args.config, RUNNERS[args.engine][1], parser)
+
+    start = time.perf_counter()
+    # 各模块用 print 输出运行日志，运行期间转到 stderr，保证 stdout 只有 JSON
+    try:
+        with redirect_stdout(sys.stderr):
+            metrics = run(args.engine, config, args.duration, args.seed)
+    except PoolExhausted as e:
+        parser.error(f"{e} (可通过 --config 调整 stack_blocks)")
+    result = {
+        'engine': args.engine,
+        'seed': args.seed,
+        'duration': args.duration,
+        'config': config,
+        'metrics': metrics,
+        'wall_ms': round((time.perf_counter() - start) * 1000, 3),
+    }
+    json.dump(result, sys.stdout, ensure_ascii=False)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
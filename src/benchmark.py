@@ -0,0 +1,100 @@
+# src/benchmark.py
+# 性能基准：在不同规模下单步推进模拟引擎，统计每一步的耗时 (微秒)
+
+import random
+import time
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+from config import RTOS_STACK_POOL_BLOCKS
+
+
+def _summarize(samples: List[float]) -> Dict[str, float]:
+    """耗时样本 (秒) -> 均值与分位数 (微秒)"""
+    samples = sorted(samples)
+    n = len(samples)
+    return {
+        'mean_us': round(sum(samples) / n * 1e6, 3),
+        'p50_us': round(samples[n // 2] * 1e6, 3),
+        'p99_us': round(samples[min(n - 1, n * 99 // 100)] * 1e6, 3),
+        'max_us': round(samples[-1] * 1e6, 3),
+    }
+
+
+def bench_rtos(task_count: int, steps: int) -> Dict[str, Any]:
+    """RTOS 内核：task_count 个任务下每个时间片 (RTOS_Scheduler.step) 的耗时"""
+    from src.modules_extension import extension_rtos as rtos
+    from src.system_status import STATUS
+
+    STATUS.reset_history()
+    rtos.reset_rtos_data()
+    # 任务栈内存池的块数随任务数扩大，保证大规模下也能为每个任务分配栈
+    rtos.stack_pool.reset(count=max(RTOS_STACK_POOL_BLOCKS, task_count))
+    tasks = rtos.generate_rtos_tasks(task_count)
+    # 剩余时间设为足够大，保证整个测量期间任务都不会完成，各规模下的工作量一致
+    for t in tasks:
+        t.remaining_time = t.burst_time = steps * 20 * 10
+    scheduler = rtos.RTOS_Scheduler(tasks)
+
+    samples = []
+    clock = time.perf_counter
+    for _ in range(steps):
+        start = clock()
+        scheduler.step(20)
+        samples.append(clock() - start)
+
+    result = {'tasks': task_count}
+    result.update(_summarize(samples))
+    return result
+
+
+def bench_memory(block_count: int, steps: int) -> Dict[str, Any]:
+    """
+    动态内存分配：先分配 block_count 个块，之后每一步随机释放一个块再分配一个新块，
+    统计各分配策略处理同一请求序列时每一步的耗时与失败次数
+    """
+    from src.modules_extension.extension_memory import ALLOCATOR_STRATEGIES, make_allocator
+
+    total = max(1024, block_count * 64)
+    sizes = [random.randint(1, 32) for _ in range(block_count + steps)]
+    victims = [random.random() for _ in range(steps)]
+
+    result = {'blocks': block_count}
+    clock = time.perf_counter
+    for strategy in ALLOCATOR_STRATEGIES:
+        allocator = make_allocator(strategy, total)
+        live = [start for pid in range(block_count)
+                if (start := allocator.allocate(pid, sizes[pid], strategy)) is not None]
+        samples = []
+        failures = 0
+        for i in range(steps):
+            begin = clock()
+            if live:
+                j = int(victims[i] * len(live))
+                allocator.free(live[j])
+                live[j] = live[-1]
+                live.pop()
+            start = allocator.allocate(block_count + i, sizes[block_count + i], strategy)
+            samples.append(clock() - begin)
+            if start is None:
+                failures += 1
+            else:
+                live.append(start)
+        result[strategy] = dict(_summarize(samples), failures=failures)
+    return result
+
+
+# {基准名: (测量函数, 默认规模列表, 默认步数)}
+BENCHMARKS: Dict[str, Tuple[Callable[[int, int], Dict[str, Any]], Sequence[int], int]] = {
+    'rtos': (bench_rtos, (5, 50, 500, 5000), 2000),
+    'memory': (bench_memory, (100, 1000, 10000), 5000),
+}
+
+
+def run_benchmark(name: str, sizes: Sequence[int], steps: int, seed: int) -> List[Dict[str, Any]]:
+    """对每个规模用相同的 seed 运行一次基准，返回各规模的耗时统计"""
+    bench = BENCHMARKS[name][0]
+    results = []
+    for size in sizes:
+        random.seed(seed)
+        results.append(bench(size, steps))
+    return results
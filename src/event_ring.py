@@ -0,0 +1,101 @@
+# src/event_ring.py
+# RTOS 事件环形缓冲区：预分配的列式存储，单写者、多读者，读者按事件 ID 游标增量读取
+
+from array import array
+from itertools import count
+from typing import Dict, List
+
+# 事件格式 (读取时生成)：{'id', 'time', 'type', 'prev_pid', 'next_pid', 'info'}
+
+_WRITING = -1  # 槽位正在被写入时的 ID 标记
+
+
+class EventRing:
+    """
+    固定容量的事件环形缓冲区。
+    - 每一列是预分配的 array / list，事件 ID 为槽位序号，写入新事件时覆盖最早的事件，不移动其他元素
+    - 事件 ID 单调递增，由缓冲区在写入时分配；clear() 后从 1 重新开始，并增加 generation
+    - 只允许一个写者 (RTOS 内核在 rtos_lock 下写入)，读者不加锁：
+      写者先把槽位 ID 置为 _WRITING，写完各列后再写入真实 ID，最后发布 last_id；
+      读者读取前后两次检查槽位 ID，不一致说明读取期间被覆盖，丢弃该事件 (seqlock)
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._ids = array('q', [0]) * capacity
+        self._times: List[float] = [0] * capacity  # 保留调用方的时间类型 (RTOS 内核使用整数毫秒)
+        self._prev = array('q', [0]) * capacity
+        self._next = array('q', [0]) * capacity
+        self._types: List[str] = [""] * capacity
+        self._infos: List[str] = [""] * capacity
+        self._counter = count(1)
+        self.last_id = 0      # 最后一个已发布事件的 ID (0 表示没有事件)
+        self.generation = 0   # 每次 clear() 加一，读者据此判断缓冲区被重置
+
+    def append(self, time: float, event_type: str, prev_pid: int, next_pid: int, info: str = "") -> int:
+        """写入一个事件并返回其 ID (只能由唯一的写者调用)"""
+        evt_id = next(self._counter)
+        slot = evt_id % self.capacity
+        self._ids[slot] = _WRITING
+        self._times[slot] = time
+        self._types[slot] = event_type
+        self._prev[slot] = prev_pid
+        self._next[slot] = next_pid
+        self._infos[slot] = info
+        self._ids[slot] = evt_id
+        self.last_id = evt_id
+        return evt_id
+
+    def clear(self):
+        """清空缓冲区；旧事件的槽位 ID 置零，正在读取的读者会丢弃它们"""
+        self._counter = count(1)
+        self.last_id = 0
+        for slot in range(self.capacity):
+            self._ids[slot] = 0
+        self.generation += 1
+
+    @property
+    def first_id(self) -> int:
+        """缓冲区中最早的事件 ID"""
+        return max(1, self.last_id - self.capacity + 1)
+
+    def __len__(self):
+        return self.last_id - self.first_id + 1 if self.last_id else 0
+
+    def events_since(self, cursor: int) -> List[Dict]:
+        """
+        返回 ID 大于 cursor 的事件，按 ID 递增。
+        游标早于缓冲区中最早的事件时 (读者落后超过容量)，从最早的事件开始返回。
+        """
+        last_id = self.last_id
+        first = max(cursor + 1, last_id - self.capacity + 1, 1)
+        events = []
+        for evt_id in range(first, last_id + 1):
+            slot = evt_id % self.capacity
+            if self._ids[slot] != evt_id:
+                continue
+            event = {
+                'id': evt_id,
+                'time': self._times[slot],
+                'type': self._types[slot],
+                'prev_pid': self._prev[slot],
+                'next_pid': self._next[slot],
+                'info': self._infos[slot],
+            }
+            if self._ids[slot] == evt_id:
+                events.append(event)
+        return events
+
+    def types_since(self, cursor: int) -> List[str]:
+        """只返回 ID 大于 cursor 的事件类型 (用于统计，不生成事件字典)"""
+        last_id = self.last_id
+        first = max(cursor + 1, last_id - self.capacity + 1, 1)
+        types = []
+        for evt_id in range(first, last_id + 1):
+            slot = evt_id % self.capacity
+            if self._ids[slot] != evt_id:
+                continue
+            event_type = self._types[slot]
+            if self._ids[slot] == evt_id:
+                types.append(event_type)
+        return types
@@ -0,0 +1,284 @@
+# src/headless_runner.py
+# 无界面运行器：按给定配置和随机种子单步推进各模拟引擎，返回 JSON 可序列化的指标
+
+import math
+import random
+from typing import Any, Callable, Dict, Tuple
+
+from config import NUM_CPUS, RTOS_STACK_SIZE, RTOS_STACK_POOL_BLOCKS
+
+# 注意：各引擎模块在对应的 run_* 函数中才导入，
+# 只运行一个引擎时不会加载其他模块，也不会加载 PyQt6。
+
+
+def _reset_status():
+    from src.system_status import STATUS
+    STATUS.reset_history()
+    return STATUS
+
+
+def _geometric(p: float) -> float:
+    """每次以概率 p 成功时，到第一次成功为止的次数 (p <= 0 时为 inf)"""
+    if p <= 0:
+        return math.inf
+    if p >= 1:
+        return 1
+    return 1 + int(math.log(1.0 - random.random()) / math.log(1.0 - p))
+
+
+def run_scheduler(config: Dict[str, Any], duration: float) -> Dict[str, Any]:
+    """多核进程调度：duration 为模拟时间 (秒)，所有进程完成后提前结束"""
+    from src.modules_core.module_1_process_state import generate_initial_processes
+    from src.modules_core.module_4_multicore_scheduler import SchedulerManager, SCHEDULER_INTERVAL
+
+    STATUS = _reset_status()
+    generate_initial_processes(config['processes'])
+    manager = SchedulerManager(num_cpus=config['num_cpus'], algorithm=config['algorithm'])
+
+    steps = 0
+    busy_slots = 0
+    max_steps = int(duration / SCHEDULER_INTERVAL + 0.5)
+    while steps < max_steps and STATUS.all_processes:
+        manager.step()
+        steps += 1
+        busy_slots += sum(1 for p in STATUS.running_processes.values() if p is not None)
+
+    archive = STATUS.process_archive
+    finished = len(archive)
+    dispatches = sum(1 for events in STATUS.cpu_history.values() for ev in events if ev['event'] == "RUNNING")
+    return {
+        'sim_time': round(STATUS.global_timer, 3),
+        'steps': steps,
+        'finished': finished,
+        'unfinished': len(STATUS.all_processes),
+        'dispatches': dispatches,
+        'avg_wait': archive.total_wait / finished if finished else 0.0,
+        'avg_turnaround': archive.total_turnaround / finished if finished else 0.0,
+        'avg_response': archive.total_response / finished if finished else 0.0,
+        'throughput': finished / STATUS.global_timer if STATUS.global_timer > 0 else 0.0,
+        'cpu_util': busy_slots / (steps * config['num_cpus']) if steps else 0.0,
+    }
+
+
+def run_memory(config: Dict[str, Any], duration: float) -> Dict[str, Any]:
+    """动态分区分配：duration 为分配/释放操作次数"""
+    from src.modules_extension import extension_memory as mem
+
+    allocators = {
+        'first_fit': mem.first_fit_allocate,
+        'best_fit': mem.best_fit_allocate,
+        'worst_fit': mem.worst_fit_allocate,
+        'buddy': mem.buddy_allocate,
+        'slab': mem.slab_allocate,
+    }
+    allocate = allocators[config['algorithm']]
+
+    _reset_status()
+    mem.select_allocator(config['algorithm'])
+    mem.initialize_memory()
+    live_pids = []
+    next_pid = 1
+    allocations = failures = frees = 0
+
+    for _ in range(int(duration)):
+        if live_pids and random.random() < config['free_ratio']:
+            pid = live_pids.pop(random.randrange(len(live_pids)))
+            mem.deallocate_memory(pid)
+            frees += 1
+            continue
+        size = random.randint(config['min_size'], config['max_size'])
+        if allocate(next_pid, size):
+            live_pids.append(next_pid)
+            allocations += 1
+        else:
+            failures += 1
+        next_pid += 1
+
+    stats = mem.get_memory_stats()
+    return {
+        'operations': int(duration),
+        'allocations': allocations,
+        'failures': failures,
+        'frees': frees,
+        'used_memory': stats['used_memory'],
+        'reserved_memory': stats['reserved_memory'],
+        'free_memory': stats['free_memory'],
+        'allocated_blocks': stats['allocated_blocks'],
+        'free_blocks': stats['free_blocks'],
+        'largest_free_block': stats['largest_free_block'],
+        # 内部碎片率：已分配块中超出请求大小的部分；外部碎片率：不能被最大空闲块满足的空闲内存占比
+        'internal_fragmentation': stats['internal_fragmentation'],
+        'external_fragmentation': stats['external_fragmentation'],
+    }
+
+
+def run_page(config: Dict[str, Any], duration: float) -> Dict[str, Any]:
+    """页面置换：duration 为页面访问次数，访问序列带有可配置的局部性"""
+    from src.modules_extension import extension_memory as mem
+
+    STATUS = _reset_status()
+    mem.initialize_page_table(mem.PAGE_FRAMES)
+    pages = config['pages']
+    working_set = min(config['working_set'], pages)
+    base = 0
+
+    for i in range(int(duration)):
+        STATUS.global_timer = float(i)  # 访问时间即访问序号
+        if random.random() < config['locality']:
+            page_id = base + random.randrange(working_set)
+        else:
+            page_id = random.randrange(pages)
+        # 工作集随时间缓慢漂移
+        if random.random() < config['drift']:
+            base = random.randrange(pages - working_set + 1)
+        mem.access_page(page_id, config['algorithm'])
+
+    stats = mem.get_memory_stats()
+    return {
+        'accesses': stats['total_accesses'],
+        'page_hits': stats['page_hits'],
+        'page_faults': stats['page_faults'],
+        'hit_rate': stats['hit_rate'],
+        'fault_rate': stats['fault_rate'],
+        'page_frames': stats['page_frames'],
+        'used_frames': stats['used_frames'],
+    }
+
+
+def run_rtos(config: Dict[str, Any], duration: float) -> Dict[str, Any]:
+    """
+    RTOS 内核：duration 为模拟时间 (ms)，每个时间片按 irq_rate 概率触发外部中断 irq_id。
+    periodic 为 True 时生成总利用率为 utilization 的周期任务集，policy 可选 PRIORITY / RM / EDF。
+    irq_lines 添加 (或覆盖) 中断线：[{"irq", "priority", "handler_ms", "rate_hz", "name"}]，
+    rate_hz 大于 0 的中断线按泊松过程随机触发，用于模拟中断风暴。
+    tickless 为 True 时所有任务都阻塞的时间片被直接跳过 (steps 仍按时间片计数)。
+    mutexes 大于 0 时创建互斥量 (协议为 mutex_protocol：NONE / INHERIT / CEILING)，
+    每个任务随机使用其中 0 ~ 2 个，输出阻塞时间与优先级反转时间的分布及最长阻塞链。
+    任务栈 (每个 stack_size 字节) 从固定块内存池分配，输出任务栈与主栈的峰值、高水位和内存池的使用情况；
+    内存池的块数为 stack_blocks，未给出时按任务数确定 (不少于 RTOS_STACK_POOL_BLOCKS)，块数不足时抛出 PoolExhausted。
+    """
+    from src.modules_extension import extension_rtos as rtos
+    from src.modules_extension.rtos_memory import stack_report
+
+    STATUS = _reset_status()
+    rtos.reset_rtos_data()
+    blocks = config['stack_blocks']
+    rtos.stack_pool.reset(config['stack_size'], max(RTOS_STACK_POOL_BLOCKS, config['tasks']) if blocks is None else blocks)
+    for line in config['irq_lines']:
+        rtos.nvic.configure(line['irq'], line.get('name', f"IRQ{line['irq']}_Handler"), line['priority'],
+                            line['handler_ms'], line.get('rate_hz', 0.0))
+    if config['periodic']:
+        tasks = rtos.generate_periodic_tasks(config['tasks'], config['utilization'], time_unit=config['time_unit'])
+    else:
+        tasks = rtos.generate_rtos_tasks(config['tasks'])
+    if config['mutexes']:
+        rtos.setup_mutexes(tasks, config['mutexes'], config['mutex_protocol'])
+    STATUS.rtos_running = True  # trigger_external_interrupt 只在运行时接受中断
+    scheduler = rtos.RTOS_Scheduler(tasks, config['policy'], config['tickless'])
+
+    event_counts: Dict[str, int] = {}
+    cursor = 0
+    steps = idle_steps = irqs = 0
+    time_unit = config['time_unit']
+    start = scheduler.simulation_timer
+    # 外部中断在每个时间片开始前以 irq_rate 的概率触发：预先抽样下一次触发的时间片序号，
+    # 无节拍模式跳过空闲时间片时不会越过它
+    next_irq = _geometric(config['irq_rate'])
+    while scheduler.simulation_timer + time_unit <= duration:
+        if steps + 1 == next_irq:
+            if rtos.trigger_external_interrupt(config['irq_id']):
+                irqs += 1
+            next_irq += _geometric(config['irq_rate'])
+        until = min(duration, start + (next_irq - 1) * time_unit)  # 触发前的最后一个时间片
+        slices = scheduler.step(time_unit, until)
+        steps += slices
+        idle_steps += slices - 1  # 跳过的时间片都是空闲的
+        if scheduler.current_task is None:
+            idle_steps += 1
+        # 按事件 ID 游标统计新增事件 (时间线只保留最近的事件，不能事后统计)
+        for event_type in STATUS.rtos_timeline.types_since(cursor):
+            event_counts[event_type] = event_counts.get(event_type, 0) + 1
+        cursor = STATUS.rtos_timeline.last_id
+    STATUS.rtos_running = False
+
+    return {
+        'sim_time': scheduler.simulation_timer,
+        'steps': steps,
+        'irqs': irqs,
+        'context_switches': event_counts.get("TASK_SWITCH", 0) + event_counts.get("ISR_EXEC", 0),
+        'switch_cycles': rtos.cpu.summary(),  # 任务间切换 (PendSV) 的模拟周期开销
+        'tasks_finished': event_counts.get("TASK_FINISH", 0),
+        'jobs_released': event_counts.get("RELEASE", 0),
+        'jobs_finished': event_counts.get("JOB_FINISH", 0),
+        'deadline_misses': event_counts.get("DEADLINE_MISS", 0),
+        'idle_ratio': idle_steps / steps if steps else 0.0,
+        'skipped_slices': scheduler.skipped_slices,
+        'semaphores': {sem.name: sem.summary() for _irq, sem in sorted(rtos.semaphores.items())},
+        'mutexes': {m.name: m.summary() for m in rtos.mutexes},
+        'memory': {
+            'task_stacks': stack_report(tasks),
+            'main_stack': rtos.main_stack.summary(),
+            'stack_pool': rtos.stack_pool.summary(),
+        },
+        'events': dict(sorted(event_counts.items())),
+        'nvic': rtos.nvic.summary(scheduler.simulation_timer),
+        # 延迟分布 (各任务 / 中断的直方图汇总)；switch_overhead 为实际耗时 (ns)，不随 seed 复现
+        'latency': rtos.latency_stats.summary(),
+    }
+
+
+def run_ipc(config: Dict[str, Any], duration: float) -> Dict[str, Any]:
+    """消息队列与共享内存：duration 为模拟时间 (秒)，以 tick_ms 为步长推进"""
+    from src.modules_core.module_2_ipc import MessageQueueEngine, SharedMemoryEngine
+
+    _reset_status()
+    queue = MessageQueueEngine(config['produce_interval'], config['consume_interval'], config['max_queue_size'])
+    shm = SharedMemoryEngine(config['shm_interval'])
+    queue.start(0.0)
+    shm.start(0.0)
+
+    op_counts: Dict[str, int] = {}
+    steps = 0
+    size_sum = max_size = 0
+    tick = config['tick_ms'] / 1000
+    now = 0.0
+    while now + tick <= duration:
+        now += tick
+        steps += 1
+        for delta in queue.step(now) + shm.step(now):
+            op_counts[delta['op']] = op_counts.get(delta['op'], 0) + 1
+        size_sum += len(queue.queue)
+        max_size = max(max_size, len(queue.queue))
+
+    return {
+        'sim_time': round(now, 3),
+        'produced': op_counts.get('produce', 0),
+        'consumed': op_counts.get('consume', 0),
+        'producer_blocked': op_counts.get('produce_blocked', 0),
+        'consumer_blocked': op_counts.get('consume_blocked', 0),
+        'avg_queue_size': size_sum / steps if steps else 0.0,
+        'max_queue_size': max_size,
+        'shm_writes': op_counts.get('WRITE', 0),
+        'shm_reads': op_counts.get('READ', 0),
+    }
+
+
+# {引擎名: (运行函数, 默认配置, 默认时长, 时长单位)}
+RUNNERS: Dict[str, Tuple[Callable, Dict[str, Any], float, str]] = {
+    'scheduler': (run_scheduler, {'algorithm': 'FCFS', 'processes': 10, 'num_cpus': NUM_CPUS}, 60.0, "模拟秒"),
+    'memory': (run_memory, {'algorithm': 'first_fit', 'min_size': 8, 'max_size': 128, 'free_ratio': 0.4}, 1000, "操作次数"),
+    'page': (run_page, {'algorithm': 'LRU', 'pages': 1024, 'working_set': 64, 'locality': 0.9, 'drift': 0.01}, 5000, "访问次数"),
+    'rtos': (run_rtos, {'tasks': 5, 'time_unit': 20, 'irq_rate': 0.02, 'irq_id': 99, 'irq_lines': [],
+                        'policy': 'PRIORITY', 'periodic': False, 'utilization': 0.7, 'tickless': False,
+                        'mutexes': 0, 'mutex_protocol': 'INHERIT', 'stack_size': RTOS_STACK_SIZE,
+                        'stack_blocks': None}, 5000.0, "模拟毫秒"),
+    'ipc': (run_ipc, {'produce_interval': 1000, 'consume_interval': 1500, 'max_queue_size': 5,
+                      'shm_interval': 500, 'tick_ms': 10}, 60.0, "模拟秒"),
+}
+
+
+def run(engine: str, config: Dict[str, Any], duration: float, seed: int) -> Dict[str, Any]:
+    """用 seed 初始化随机数后运行指定引擎，返回指标字典"""
+    runner = RUNNERS[engine][0]
+    random.seed(seed)
+    return runner(config, duration)
@@ -0,0 +1,107 @@
+# src/log_histogram.py
+# 对数分桶直方图：内存占用与样本数无关，用于长时间运行时统计延迟分布
+
+from typing import Dict, List, Optional
+
+# 每个 2 的幂区间划分的子桶数 (2^SUB_BUCKET_BITS)，相对误差不超过 1 / 2^SUB_BUCKET_BITS
+SUB_BUCKET_BITS = 4
+_SUB = 1 << SUB_BUCKET_BITS
+
+
+def bucket_index(value: int) -> int:
+    """
+    非负整数 -> 桶序号。小于 _SUB 的值各占一个桶 (精确)，
+    更大的值按所在的 2 的幂区间划分为 _SUB 个等宽子桶。
+    """
+    if value < _SUB:
+        return value
+    shift = value.bit_length() - SUB_BUCKET_BITS - 1
+    return ((shift + 1) << SUB_BUCKET_BITS) + (value >> shift) - _SUB
+
+
+def bucket_bounds(index: int):
+    """桶序号 -> 桶覆盖的闭区间 [low, high]"""
+    if index < _SUB:
+        return index, index
+    shift = (index >> SUB_BUCKET_BITS) - 1
+    low = ((index & (_SUB - 1)) + _SUB) << shift
+    return low, low + (1 << shift) - 1
+
+
+class LogHistogram:
+    """
+    对数分桶直方图 (HdrHistogram 的简化版)。
+    - 样本为非负整数 (负数按 0 记录)，只记录各桶的计数，64 位整数范围内最多 _SUB * (64 - SUB_BUCKET_BITS) 个桶
+    - 桶按需创建 (字典)，延迟通常集中在少数几个数量级内，实际占用远小于上限
+    - 分位数返回所在桶的上界 (不超过实际最大值)，相对误差不超过 1 / _SUB；min / max / 均值是精确值
+    只允许一个写者；读者不加锁读取时可能看到正在更新的计数，结果只影响一个样本。
+    """
+
+    __slots__ = ('counts', 'count', 'total', 'min', 'max')
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.min: Optional[int] = None
+        self.max: Optional[int] = None
+
+    def record(self, value):
+        value = max(0, int(value))
+        idx = bucket_index(value)
+        self.counts[idx] = self.counts.get(idx, 0) + 1
+        self.count += 1
+        self.total += value
+        if self.max is None or value > self.max:
+            self.max = value
+        if self.min is None or value < self.min:
+            self.min = value
+
+    def merge(self, other: 'LogHistogram'):
+        for idx, n in other.counts.items():
+            self.counts[idx] = self.counts.get(idx, 0) + n
+        self.count += other.count
+        self.total += other.total
+        if other.count:
+            self.max = other.max if self.max is None else max(self.max, other.max)
+            self.min = other.min if self.min is None else min(self.min, other.min)
+
+    def clear(self):
+        self.counts.clear()
+        self.count = self.total = 0
+        self.min = self.max = None
+
+    def percentile(self, p: float) -> Optional[int]:
+        """第 p 百分位数 (0 < p <= 100)，没有样本时返回 None"""
+        return self.percentiles(p)[0]
+
+    def percentiles(self, *ps: float) -> List[Optional[int]]:
+        """一次遍历计算多个百分位数 (ps 按升序给出)"""
+        if not self.count:
+            return [None] * len(ps)
+        ranks = [max(1, -(-self.count * p // 100)) for p in ps]  # 第 rank 个样本 (向上取整)
+        results = []
+        seen = 0
+        for idx in sorted(self.counts):
+            seen += self.counts[idx]
+            while len(results) < len(ranks) and seen >= ranks[len(results)]:
+                results.append(max(self.min, min(bucket_bounds(idx)[1], self.max)))
+            if len(results) == len(ranks):
+                break
+        return results + [self.max] * (len(ranks) - len(results))
+
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    def summary(self) -> Dict:
+        """{'count', 'min', 'mean', 'p50', 'p99', 'max'}"""
+        mean = self.mean()
+        p50, p99 = self.percentiles(50, 99)
+        return {
+            'count': self.count,
+            'min': self.min,
+            'mean': round(mean, 3) if mean is not None else None,
+            'p50': p50,
+            'p99': p99,
+            'max': self.max,
+        }
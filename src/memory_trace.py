@@ -0,0 +1,161 @@
+# src/memory_trace.py
+# 内存分配轨迹：按给定的大小分布生成长的 malloc / free 序列，并在各分配器上重放，统计吞吐量与碎片
+
+import math
+import random
+import time
+import zlib
+from array import array
+from typing import Any, Callable, Dict, Optional, Sequence
+
+from config import MEMORY_SIZE
+
+# 轨迹以 32 位整数数组保存，每个元素是一次操作：
+# 正数为 malloc (数值为请求大小，分配编号按 malloc 的顺序从 0 开始)，非正数 -k 为 free 第 k 次 malloc 得到的块
+TRACE_TYPECODE = 'i'
+
+
+def _uniform(rng: random.Random, i: int) -> int:
+    return rng.randint(1, 32)
+
+
+def _bimodal(rng: random.Random, i: int) -> int:
+    # 大量小对象与少量大缓冲区混合
+    return rng.randint(1, 4) if rng.random() < 0.8 else rng.randint(32, 64)
+
+
+def _power_law(rng: random.Random, i: int) -> int:
+    # Pareto 分布 (alpha = 1.5)：多数请求很小，偶尔出现很大的请求
+    return min(128, int((1.0 - rng.random()) ** (-1 / 1.5)))
+
+
+PHASE_LENGTH = 10000
+
+
+def _phase_change(rng: random.Random, i: int) -> int:
+    # 每 PHASE_LENGTH 次操作在小对象与大对象之间切换：前一阶段留下的块把空闲空间切碎
+    return rng.randint(1, 8) if (i // PHASE_LENGTH) % 2 == 0 else rng.randint(16, 64)
+
+
+# {分布名: 生成第 i 次操作的请求大小的函数}
+DISTRIBUTIONS: Dict[str, Callable[[random.Random, int], int]] = {
+    'uniform': _uniform,
+    'bimodal': _bimodal,
+    'power_law': _power_law,
+    'phase_change': _phase_change,
+}
+
+
+def generate_trace(distribution: str, ops: int, seed: int = 0, load: float = 0.7,
+                   total: int = MEMORY_SIZE) -> array:
+    """
+    生成 ops 次操作的轨迹。存活块的请求大小之和为 load * total 时 malloc 与 free 各占一半，
+    低于时偏向 malloc、高于时偏向 free，使内存负载稳定在 load 附近；free 的对象从存活块中均匀随机选取。
+    """
+    sample = DISTRIBUTIONS[distribution]
+    rng = random.Random(seed)
+    target = load * total
+    trace = array(TRACE_TYPECODE)
+    append = trace.append
+    live, live_sizes = [], []  # 存活块的分配编号与大小 (删除时与末尾交换)
+    live_bytes = 0
+    mallocs = 0
+    for i in range(ops):
+        if live and rng.random() < min(1.0, 0.5 * live_bytes / target):
+            j = int(rng.random() * len(live))
+            append(-live[j])
+            live_bytes -= live_sizes[j]
+            live[j], live_sizes[j] = live[-1], live_sizes[-1]
+            live.pop()
+            live_sizes.pop()
+        else:
+            size = sample(rng, i)
+            append(size)
+            live.append(mallocs)
+            live_sizes.append(size)
+            live_bytes += size
+            mallocs += 1
+    return trace
+
+
+def save_trace(trace: array, path: str):
+    with open(path, 'wb') as f:
+        trace.tofile(f)
+
+
+def load_trace(path: str) -> array:
+    trace = array(TRACE_TYPECODE)
+    with open(path, 'rb') as f:
+        trace.frombytes(f.read())
+    return trace
+
+
+def trace_digest(trace: array) -> str:
+    """轨迹内容的 CRC32，用于确认不同提交之间比较的是同一条轨迹"""
+    return f"{zlib.crc32(trace.tobytes()):08x}"
+
+
+def replay(trace: array, strategy: str, samples: int = 100, total: int = MEMORY_SIZE) -> Dict[str, Any]:
+    """
+    在新建的分配器上重放轨迹：失败的 malloc 对应的 free 被跳过。
+    碎片率每隔 len(trace) / samples 次操作采样一次 (峰值取采样点中的最大值)，ops_per_sec 包含采样的开销。
+    """
+    from src.modules_extension.extension_memory import make_allocator
+    from src.modules_extension.memory_allocator import fragmentation
+
+    allocator = make_allocator(strategy, total)
+    allocate, free = allocator.allocate, allocator.free
+    n = len(trace)
+    stride = max(1, math.ceil(n / samples)) if samples > 0 else n + 1
+    addrs = array('q')  # 第 k 次 malloc 得到的地址，失败为 -1
+    record = addrs.append
+    mallocs = failures = 0
+    series = []
+    peak_internal = peak_external = 0.0
+
+    start = time.perf_counter()
+    for i in range(n):
+        op = trace[i]
+        if op > 0:
+            addr = allocate(mallocs, op, strategy)
+            mallocs += 1
+            if addr is None:
+                failures += 1
+                record(-1)
+            else:
+                record(addr)
+        else:
+            addr = addrs[-op]
+            if addr >= 0:
+                free(addr)
+        if (i + 1) % stride == 0:
+            frag = fragmentation(allocator)
+            peak_internal = max(peak_internal, frag['internal'])
+            peak_external = max(peak_external, frag['external'])
+            series.append((i + 1, round(frag['internal'], 4), round(frag['external'], 4),
+                           allocator.used))
+    elapsed = time.perf_counter() - start
+
+    return {
+        'strategy': strategy,
+        'ops_per_sec': round(n / elapsed) if elapsed > 0 else None,
+        'wall_ms': round(elapsed * 1000, 3),
+        'mallocs': mallocs,
+        'failures': failures,
+        'failure_rate': failures / mallocs if mallocs else 0.0,
+        'peak_internal_fragmentation': round(peak_internal, 4) if series else None,
+        'peak_external_fragmentation': round(peak_external, 4) if series else None,
+        # 碎片率随时间的变化：[(操作序号, 内部碎片率, 外部碎片率, 请求的大小之和)]
+        'series': series,
+    }
+
+
+def run_trace(trace: array, strategies: Optional[Sequence[str]] = None, samples: int = 100) -> Dict[str, Any]:
+    """在每个分配策略上重放同一条轨迹"""
+    from src.modules_extension.extension_memory import ALLOCATOR_STRATEGIES
+
+    return {
+        'ops': len(trace),
+        'digest': trace_digest(trace),
+        'results': [replay(trace, strategy, samples) for strategy in (strategies or ALLOCATOR_STRATEGIES)],
+    }
@@ -29,9 +29,10 @@ def generate_initial_processes(count=10) -> List[Process]:
 
     with STATUS._lock:
         # 获取当前最大的 PID，确保 ID 不重复
-        max_pid = 0
+        # 已归档的进程也占用过 PID，需要一并考虑
+        max_pid = STATUS.process_archive.max_pid
         if STATUS.all_processes:
-            max_pid = max(STATUS.all_processes.keys())
+            max_pid = max(max_pid, max(STATUS.all_processes.keys()))
 
         start_pid = max_pid + 1
 
@@ -109,11 +110,16 @@ def transition_state(process: Process, new_state: ProcessState, cpu_id: Optional
             # 如果是第一次运行，记录开始时间
             if process.start_time == -1:
                 process.start_time = STATUS.global_timer
+                # 首次调度可能早于到达时间 (初始进程的到达时间是随机的)，响应时间不为负
+                process.response_time = max(0.0, process.start_time - process.arrival_time)
 
         elif new_state == ProcessState.TERMINATED:
             process.finish_time = STATUS.global_timer
             # 计算周转时间 = 完成时间 - 到达时间
             process.turnaround_time = process.finish_time - process.arrival_time
+            # 归档：活跃结构中只保留未终止的进程
+            STATUS.process_archive.append(process)
+            STATUS.all_processes.pop(process.pid, None)
 
     finally:
         if not already_locked:
@@ -108,6 +108,167 @@ def shm_reader_task(name="Reader"):
                 STATUS.shm_ops.pop(0)
 
 
+# === 3. 可单步推进的 IPC 引擎 (由 GUI 的工作线程驱动) ===
+
+class MessageQueueEngine:
+    """
+    生产者-消费者消息队列引擎。
+    step(now) 根据生产/消费间隔推进模拟，返回本步产生的增量事件列表：
+    {'op': 'produce' / 'produce_blocked' / 'consume' / 'consume_blocked' / 'producer_resumed' / 'reset', ...}
+    所有方法只在同一个工作线程中调用。
+    """
+
+    def __init__(self, produce_interval=1000, consume_interval=1500, max_queue_size=MAX_QUEUE_SIZE):
+        self.produce_interval = produce_interval  # 生产间隔（毫秒）
+        self.consume_interval = consume_interval  # 消费间隔（毫秒）
+        self.max_queue_size = max_queue_size
+        self.queue = []
+        self.message_id = 1
+        self.running = False
+        self.producer_blocked = False
+        self.consumer_blocked = False
+        self._next_produce = 0.0
+        self._next_consume = 0.0
+
+    def start(self, now):
+        self.running = True
+        self._next_produce = now + self.produce_interval / 1000
+        self._next_consume = now + self.consume_interval / 1000
+        return [self._status('started')]
+
+    def stop(self):
+        self.running = False
+        return [self._status('stopped')]
+
+    def reset(self):
+        self.running = False
+        self.queue.clear()
+        self.message_id = 1
+        self.producer_blocked = False
+        self.consumer_blocked = False
+        self._publish()
+        return [self._status('reset')]
+
+    def set_intervals(self, produce_interval=None, consume_interval=None):
+        if produce_interval is not None:
+            self.produce_interval = produce_interval
+        if consume_interval is not None:
+            self.consume_interval = consume_interval
+        return []
+
+    def set_max_queue_size(self, size):
+        self.max_queue_size = size
+        return []
+
+    def step(self, now):
+        if not self.running:
+            return []
+        deltas = []
+        if now >= self._next_produce:
+            self._next_produce = now + self.produce_interval / 1000
+            deltas.append(self._produce())
+        if now >= self._next_consume:
+            self._next_consume = now + self.consume_interval / 1000
+            deltas.extend(self._consume())
+        if deltas:
+            self._publish()
+        return deltas
+
+    def _produce(self):
+        if len(self.queue) < self.max_queue_size:
+            message = f"消息 {self.message_id}"
+            self.message_id += 1
+            self.queue.append(message)
+            self.producer_blocked = False
+            return self._status('produce', message=message, index=len(self.queue) - 1)
+        # 队列已满，生产者阻塞
+        self.producer_blocked = True
+        return self._status('produce_blocked')
+
+    def _consume(self):
+        if not self.queue:
+            self.consumer_blocked = True
+            return [self._status('consume_blocked')]
+        message = self.queue.pop(0)
+        self.consumer_blocked = False
+        deltas = [self._status('consume', message=message)]
+        # 生产者之前阻塞，现在队列有空位则恢复
+        if self.producer_blocked and len(self.queue) < self.max_queue_size:
+            self.producer_blocked = False
+            deltas.append(self._status('producer_resumed'))
+        return deltas
+
+    def _status(self, op, **fields):
+        fields.update({
+            'op': op,
+            'size': len(self.queue),
+            'max_size': self.max_queue_size,
+            'running': self.running,
+            'producer_blocked': self.producer_blocked,
+            'consumer_blocked': self.consumer_blocked,
+        })
+        return fields
+
+    def _publish(self):
+        # 同步到全局状态，供其他模块读取 (原地更新，保留 SystemStatus 声明的 deque，生产者 / 消费者线程仍可使用)
+        with STATUS._lock:
+            STATUS.message_queue.clear()
+            STATUS.message_queue.extend(self.queue)
+
+
+class SharedMemoryEngine:
+    """
+    共享内存读写引擎。
+    运行时每隔 operation_interval 毫秒随机执行一次读或写，
+    step(now) 返回本步的操作记录 {'op': 'WRITE'/'READ', 'addr', 'val', 'time'}。
+    """
+
+    WRITE_VALUES = ['01', '02', '03', '04', '05', '06', '07', '08', '09', '10']
+
+    def __init__(self, operation_interval=500):
+        self.operation_interval = operation_interval
+        self.running = False
+        self._next_op = 0.0
+
+    def start(self, now):
+        self.running = True
+        self._next_op = now + self.operation_interval / 1000
+        with STATUS._lock:
+            STATUS.shm_data = ['00'] * STATUS.shm_size
+        return [{'op': 'reset', 'data': ['00'] * STATUS.shm_size}]
+
+    def stop(self):
+        self.running = False
+        return []
+
+    def reset(self):
+        self.running = False
+        with STATUS._lock:
+            STATUS.shm_data = ['00'] * STATUS.shm_size
+            STATUS.shm_ops.clear()
+            # 清除旧的单操作记录（向后兼容）
+            if hasattr(STATUS, 'shm_last_op'):
+                STATUS.shm_last_op = None
+        return [{'op': 'reset', 'data': ['00'] * STATUS.shm_size}]
+
+    def step(self, now):
+        if not self.running or now < self._next_op:
+            return []
+        self._next_op = now + self.operation_interval / 1000
+
+        op_type = random.choice(['WRITE', 'READ'])
+        with STATUS._lock:
+            addr = random.randint(0, STATUS.shm_size - 1)
+            if op_type == 'WRITE':
+                STATUS.shm_data[addr] = random.choice(self.WRITE_VALUES)
+            op = {'op': op_type, 'addr': addr, 'val': STATUS.shm_data[addr], 'time': time.time()}
+            # 记录操作到操作列表，保持不超过20个元素
+            STATUS.shm_ops.append({'type': op_type, 'addr': addr, 'val': op['val'], 'time': op['time']})
+            if len(STATUS.shm_ops) > 20:
+                STATUS.shm_ops.pop(0)
+        return [op]
+
+
 # === 控制函数 ===
 
 def start_ipc_simulation():
@@ -83,4 +83,333 @@ def start_sync_simulation(num_threads=5):
     for i in range(num_threads):
         thread = start_simulation_thread(critical_section_task, args=(f"Thread-{i}",))
         threads.append(thread)
-    return threads
\ No newline at end of file
+    return threads
+
+class SemaphoreModelEngine:
+    """
+    经典信号量同步模型引擎：生产者-消费者、读者-写者 (读者优先 / 写者优先 / 读写公平)、哲学家就餐。
+    运行时每隔 interval 毫秒推进一步模型；读者进入阅览区、叉子放回桌面需要一段时间，由 step(now) 按时刻完成。
+    step(now) 返回本步产生的增量事件列表：
+    {'op': 'reset' / 'log' / 'slot' / 'reader_enter' / 'reader_leave' / 'phil' / 'fork_take' / 'fork_return', ...}，
+    每个事件都带有当前的信号量值、阻塞请求与读者数。
+    所有方法只在同一个工作线程中调用。
+    """
+
+    MODELS = ("producer_consumer", "reader_writer", "philosopher_dining")
+    RW_STRATEGIES = ("reader_priority", "writer_priority", "fair")
+    SLOTS = 5          # 生产者-消费者缓冲区槽位数
+    PHILOSOPHERS = 5
+    WRITE_STEPS = 3    # 写者占用资源的步数
+    ENTER_TIME = 0.5   # 读者进入阅览区所需时间（秒），之后才能离开
+    RETURN_TIME = 0.5  # 叉子放回桌面所需时间（秒），之后才能再被拿起
+
+    def __init__(self, model="producer_consumer", interval=1000):
+        self.interval = interval  # 推进间隔（毫秒）
+        self.strategy = "reader_priority"
+        self.max_readers = 10
+        self.max_writers = 5
+        self.running = False
+        self._now = 0.0
+        self._next_step = 0.0
+        self._reset_state(model)
+
+    def _reset_state(self, model):
+        if model not in self.MODELS:
+            raise ValueError(f"未知的同步模型: {model}")
+        self.model = model
+        if model == "producer_consumer":
+            self.semaphores = {"mutex": 1, "empty": self.SLOTS, "full": 0}
+        elif model == "reader_writer":
+            self.semaphores = {"rw_mutex": 1, "mutex": 1}
+        else:
+            self.semaphores = {}
+        self.buffer = [0] * self.SLOTS
+        self.blocked_requests = []  # [{'type': 'Reader'/'Writer', 'seq', 'label'}]
+        self.req_seq = 0
+        self.readers = {}  # {读者编号: 进入完成的时刻}，按进入顺序排列
+        self.next_reader = 1
+        self.writer_active = False
+        self.writer_timer = 0
+        self.philosophers = [0] * self.PHILOSOPHERS  # 0 思考, 1 饥饿, 2 就餐
+        self.fork_owners = [None] * self.PHILOSOPHERS
+        self.fork_returning = {}  # {叉子编号: 放回桌面的时刻}
+        self.request_queue = []
+
+    def start(self, now):
+        self.running = True
+        self._next_step = now + self.interval / 1000
+        return [self._status('started')]
+
+    def stop(self):
+        self.running = False
+        return [self._status('stopped')]
+
+    def reset(self, epoch=None):
+        return self.set_model(self.model, epoch)
+
+    def set_model(self, model, epoch=None):
+        """切换模型并回到初始状态；epoch 原样带回 reset 事件，供界面丢弃切换前发出的事件"""
+        self.running = False
+        self._reset_state(model)
+        return [self._status('reset', model=model, epoch=epoch)]
+
+    def set_interval(self, interval):
+        self.interval = interval
+        return []
+
+    def set_rw_options(self, strategy=None, max_readers=None, max_writers=None):
+        if strategy is not None:
+            if strategy not in self.RW_STRATEGIES:
+                raise ValueError(f"未知的读写策略: {strategy}")
+            self.strategy = strategy
+        if max_readers is not None:
+            self.max_readers = max_readers
+        if max_writers is not None:
+            self.max_writers = max_writers
+        return []
+
+    def step(self, now):
+        self._now = now
+        deltas = []
+        # 叉子放回桌面不受暂停影响
+        self._finish_fork_returns(deltas)
+        if self.running and now >= self._next_step:
+            self._next_step = now + self.interval / 1000
+            if self.model == "producer_consumer":
+                self._step_producer_consumer(deltas)
+            elif self.model == "reader_writer":
+                self._step_reader_writer(deltas)
+            else:
+                self._step_philosophers(deltas)
+        return deltas
+
+    def _status(self, op, **fields):
+        fields.update({
+            'op': op,
+            'running': self.running,
+            'semaphores': dict(self.semaphores),
+            'blocked': [r["type"] for r in self.blocked_requests],
+            'read_count': len(self.readers),
+            'writer_active': self.writer_active,
+        })
+        return fields
+
+    def _log(self, deltas, msg):
+        deltas.append(self._status('log', msg=msg))
+
+    # --- 生产者/消费者 ---
+    def _step_producer_consumer(self, deltas):
+        sem, buf = self.semaphores, self.buffer
+        action = random.choice(["produce", "consume", "idle"])
+        # 单步内 P(mutex) 与 V(mutex) 成对出现，步与步之间 mutex 总是 1
+        if action == "produce" and sem["empty"] > 0:
+            i = buf.index(0)
+            buf[i] = 1
+            sem["empty"] -= 1
+            sem["full"] += 1
+            deltas.append(self._status('slot', index=i, full=True))
+            self._log(deltas, f"生产 -> Slot {i}")
+        elif action == "consume" and sem["full"] > 0:
+            i = buf.index(1)
+            buf[i] = 0
+            sem["full"] -= 1
+            sem["empty"] += 1
+            deltas.append(self._status('slot', index=i, full=False))
+            self._log(deltas, f"消费 <- Slot {i}")
+
+    # --- 读者/写者 ---
+    def _add_blocked_request(self, req_type, deltas):
+        self.req_seq += 1
+        label = f"{req_type}-{self.req_seq}"
+        self.blocked_requests.append({"type": req_type, "seq": self.req_seq, "label": label})
+        self._log(deltas, f"加入阻塞请求: {label}")
+        return label
+
+    def _pop_first_blocked_of_type(self, req_type):
+        for i, r in enumerate(self.blocked_requests):
+            if r["type"] == req_type:
+                return self.blocked_requests.pop(i)
+        return None
+
+    def _wake_readers(self, requests, deltas):
+        for r in requests:
+            self.blocked_requests.remove(r)
+            self._spawn_reader(deltas, request_label=r["label"])
+
+    def _wake_next_on_resource_free(self, deltas):
+        br = self.blocked_requests
+        if not br:
+            return
+        br.sort(key=lambda x: x["seq"])
+        waiting_readers = [r for r in br if r["type"] == "Reader"]
+        available_slots = self.max_readers - len(self.readers)
+        if self.strategy == "fair":
+            if br[0]["type"] == "Writer":
+                if not self.readers:
+                    self._start_writer_from_request(self._pop_first_blocked_of_type("Writer"), deltas)
+            else:
+                # 按到达顺序唤醒队首连续的读者，遇到写者为止
+                wake = []
+                for r in br:
+                    if r["type"] != "Reader":
+                        break
+                    if len(wake) < available_slots:
+                        wake.append(r)
+                self._wake_readers(wake, deltas)
+        elif self.strategy == "writer_priority":
+            if any(r["type"] == "Writer" for r in br):
+                self._start_writer_from_request(self._pop_first_blocked_of_type("Writer"), deltas)
+            else:
+                self._wake_readers(waiting_readers[:max(0, available_slots)], deltas)
+        elif self.readers:
+            # 读者优先：已有读者在读，唤醒尽可能多的读者
+            self._wake_readers(waiting_readers[:max(0, available_slots)], deltas)
+        elif not self.writer_active:
+            if waiting_readers:
+                self._wake_readers(waiting_readers[:self.max_readers], deltas)
+            elif any(r["type"] == "Writer" for r in br):
+                self._start_writer_from_request(self._pop_first_blocked_of_type("Writer"), deltas)
+
+    def _start_writer_from_request(self, req, deltas):
+        if self.semaphores["rw_mutex"] > 0 and not self.writer_active:
+            self.semaphores["rw_mutex"] = 0
+            self.writer_active = True
+            self.writer_timer = self.WRITE_STEPS
+            self._log(deltas, f"唤醒写者 {req['label']} 开始写入")
+            return True
+        return False
+
+    def _spawn_reader(self, deltas, request_label=None):
+        if len(self.readers) >= self.max_readers:
+            # 已达到最大读者数，唤醒的请求重新排队
+            if request_label:
+                self._add_blocked_request("Reader", deltas)
+                self._log(deltas, f"读者 {request_label} 唤醒失败，已达到最大读者数限制")
+            return
+        if not self.readers:
+            self.semaphores["rw_mutex"] = 0
+        reader = self.next_reader
+        self.next_reader += 1
+        self.readers[reader] = self._now + self.ENTER_TIME
+        deltas.append(self._status('reader_enter', reader=reader))
+        if request_label:
+            self._log(deltas, f"读者进入 (被唤醒:{request_label})")
+
+    def _step_reader_writer(self, deltas):
+        sem = self.semaphores
+        r = random.random()
+
+        # 读者到达（30%）
+        if r < 0.3:
+            if len(self.readers) >= self.max_readers:
+                self._add_blocked_request("Reader", deltas)
+                self._log(deltas, "读者达到最大上限，被阻塞")
+                return
+            if self.strategy == "reader_priority":
+                can_enter = not self.writer_active and (sem["rw_mutex"] > 0 or bool(self.readers))
+            elif self.strategy == "writer_priority":
+                writers_waiting = any(req["type"] == "Writer" for req in self.blocked_requests)
+                can_enter = not (self.writer_active or writers_waiting or sem["rw_mutex"] == 0)
+            else:
+                # 读写公平：等待中的写者都比新到的读者先到
+                writers_waiting = any(req["type"] == "Writer" for req in self.blocked_requests)
+                can_enter = not writers_waiting and not self.writer_active
+            if can_enter:
+                self._spawn_reader(deltas)
+                self._log(deltas, f"读者进入 (第{len(self.readers)}位)")
+            else:
+                self._add_blocked_request("Reader", deltas)
+                self._log(deltas, "读者被阻塞 (加入等待队列)")
+
+        # 读者离开（20%），只有已进入阅览区的读者才能离开
+        elif r < 0.5:
+            reading = [reader for reader, ready in self.readers.items() if ready <= self._now]
+            if reading:
+                del self.readers[reading[0]]
+                deltas.append(self._status('reader_leave', reader=reading[0]))
+                if not self.readers:
+                    sem["rw_mutex"] = 1
+                    self._log(deltas, "最后一位读者离开")
+                self._wake_next_on_resource_free(deltas)
+
+        # 写者尝试（20%），正在写的和排队的写者总数受 max_writers 限制
+        elif r < 0.7:
+            current_writers = (1 if self.writer_active else 0) + \
+                sum(1 for req in self.blocked_requests if req["type"] == "Writer")
+            if current_writers >= self.max_writers:
+                self._log(deltas, f"写者达到最大上限 ({current_writers}/{self.max_writers})，拒绝新的写者请求")
+                return
+            # 读写公平：有更早到达的读者在等待时写者也要排队
+            allow_writer_now = not (self.strategy == "fair" and
+                                    any(req["type"] == "Reader" for req in self.blocked_requests))
+            if sem["rw_mutex"] > 0 and not self.writer_active and allow_writer_now and not self.readers:
+                sem["rw_mutex"] = 0
+                self.writer_active = True
+                self.writer_timer = self.WRITE_STEPS
+                self._log(deltas, "写者正在写入...")
+            else:
+                label = self._add_blocked_request("Writer", deltas)
+                self._log(deltas, f"写者被阻塞 (加入等待队列: {label})")
+
+        # 写者计时
+        if self.writer_active:
+            self.writer_timer -= 1
+            if self.writer_timer <= 0:
+                self.writer_active = False
+                sem["rw_mutex"] = 1
+                self._log(deltas, "写者离开")
+                self._wake_next_on_resource_free(deltas)
+
+    # --- 哲学家就餐 ---
+    def _step_philosophers(self, deltas):
+        for pid in range(self.PHILOSOPHERS):
+            if self.philosophers[pid] == 2 and random.random() < 0.4:
+                self.philosophers[pid] = 0
+                deltas.append(self._status('phil', pid=pid, state=0))
+                for fork in ((pid + 4) % self.PHILOSOPHERS, pid):
+                    self.fork_returning[fork] = self._now + self.RETURN_TIME
+                    deltas.append(self._status('fork_return', fork=fork))
+                self._log(deltas, f"P{pid} 吃完了，开始归还左右两边的叉子")
+        thinking = [pid for pid in range(self.PHILOSOPHERS) if self.philosophers[pid] == 0]
+        if thinking and random.random() < 0.5:
+            pid = random.choice(thinking)
+            self.philosophers[pid] = 1
+            deltas.append(self._status('phil', pid=pid, state=1))
+            if pid not in self.request_queue:
+                self.request_queue.append(pid)
+                self._log(deltas, f"P{pid} 饿了，加入请求队列，当前队列: {self.request_queue}")
+            else:
+                self._log(deltas, f"P{pid} 饿了，已在请求队列中")
+            self._try_to_eat(pid, deltas)
+        self._check_queue_and_eat(deltas)
+
+    def _finish_fork_returns(self, deltas):
+        returned = [fork for fork, due in self.fork_returning.items() if due <= self._now]
+        for fork in returned:
+            del self.fork_returning[fork]
+            self.fork_owners[fork] = None
+            self._log(deltas, f"叉子 {fork} 已归还到桌子上，现在可以被使用")
+            self._check_queue_and_eat(deltas)
+
+    def _try_to_eat(self, pid, deltas):
+        if self.philosophers[pid] != 1:
+            return False
+        left, right = (pid + 4) % self.PHILOSOPHERS, pid
+        owners = self.fork_owners
+        if owners[left] is not None or owners[right] is not None or \
+                left in self.fork_returning or right in self.fork_returning:
+            return False
+        owners[left] = owners[right] = pid
+        self.philosophers[pid] = 2
+        if pid in self.request_queue:
+            self.request_queue.remove(pid)
+        deltas.append(self._status('phil', pid=pid, state=2))
+        deltas.append(self._status('fork_take', fork=left, pid=pid, side='left'))
+        deltas.append(self._status('fork_take', fork=right, pid=pid, side='right'))
+        self._log(deltas, f"P{pid} 拿到左右两边的叉子，开始吃饭，队列剩余: {self.request_queue}")
+        return True
+
+    def _check_queue_and_eat(self, deltas):
+        for pid in list(self.request_queue):
+            if self._try_to_eat(pid, deltas):
+                break
@@ -12,6 +12,7 @@ from src.process_model import Process, ProcessState
 from src.modules_core.module_1_process_state import transition_state
 
 SCHEDULER_INTERVAL = 0.05  # 模拟步进时间间隔 (秒)
+IO_POLL_STEPS = 5  # IO 管理器每隔多少个调度步检查一次阻塞队列
 
 class IOManager(Thread):
     """
@@ -29,20 +30,23 @@ class IOManager(Thread):
     def run(self):
         print("IO Manager started.")
         while self._running:
-            time.sleep(SCHEDULER_INTERVAL * 5)  # IO 检查频率比 CPU 慢一些
-
-            with STATUS._lock:
-                if STATUS.blocked_queue:
-                    # 50% 的概率唤醒队首进程，模拟不确定的 IO 时间
-                    if random.random() > 0.5:
-                        proc = STATUS.blocked_queue[0] # 获取但不移除，通过 transition_state 移除
-                        # print(f"[IO Manager] Process {proc.pid} IO completed. Waking up...")
-                        transition_state(proc, ProcessState.READY, already_locked=True)
+            time.sleep(SCHEDULER_INTERVAL * IO_POLL_STEPS)  # IO 检查频率比 CPU 慢一些
+            self.poll()
             
             if not STATUS.scheduler_running:
                 # 如果主调度器停止了，IO 也暂停工作
                 pass
 
+    def poll(self):
+        """检查一次阻塞队列（线程模式和无界面单步模式共用）"""
+        with STATUS._lock:
+            if STATUS.blocked_queue:
+                # 50% 的概率唤醒队首进程，模拟不确定的 IO 时间
+                if random.random() > 0.5:
+                    proc = STATUS.blocked_queue[0] # 获取但不移除，通过 transition_state 移除
+                    # print(f"[IO Manager] Process {proc.pid} IO completed. Waking up...")
+                    transition_state(proc, ProcessState.READY, already_locked=True)
+
 class CPUScheduler(Thread):
     """
     CPU 核心调度线程：
@@ -138,11 +142,26 @@ class CPUScheduler(Thread):
                 # 记录甘特图
                 self._record_history(self.current_process.pid, STATUS.global_timer, "RUNNING")
 
+    def step(self):
+        """
+        无线程单步：按 run() 中一次循环的顺序执行检查、调度和执行，但不 sleep。
+        全局时钟由 SchedulerManager.step() 在所有核心执行完之后统一推进。
+        """
+        if self.cpu_id == 0:
+            self._check_new_processes()
+        if self.current_process is None:
+            self._dispatch_process()
+        if self.current_process:
+            self._run_slice(SCHEDULER_INTERVAL)
+
     def _execute_process(self):
         """执行逻辑"""
         step = SCHEDULER_INTERVAL
         time.sleep(step) # 模拟耗时
+        self._run_slice(step)
 
+    def _run_slice(self, step):
+        """当前进程执行 step 秒"""
         with STATUS._lock:
             if not self.current_process:
                 return
@@ -199,6 +218,9 @@ class SchedulerManager:
         self.algorithm = algorithm
         self.scheduler_threads: List[CPUScheduler] = []
         self.io_manager = IOManager()
+        # 无界面单步模式使用的核心对象 (不启动线程)
+        self.step_cores: List[CPUScheduler] = []
+        self.step_count = 0
         
     def update_algorithm(self, algorithm: str):
         """更新调度算法并应用到所有正在运行的调度器"""
@@ -230,6 +252,24 @@ class SchedulerManager:
                 scheduler.start()
             print(f"System started with {self.num_cpus} CPUs using {self.algorithm}.")
 
+    def step(self):
+        """
+        无界面单步模式：同步推进所有核心一个 SCHEDULER_INTERVAL，不创建线程也不 sleep。
+        首次调用时按当前算法创建核心对象；与 start_schedulers() 不能同时使用。
+        """
+        if not self.step_cores:
+            with STATUS._lock:
+                STATUS.running_processes = {i: None for i in range(self.num_cpus)}
+            self.step_cores = [CPUScheduler(cpu_id=i, algorithm=self.algorithm) for i in range(self.num_cpus)]
+            self.step_count = 0
+
+        for core in self.step_cores:
+            core.step()
+        self.step_cores[0]._advance_global_timer()
+        self.step_count += 1
+        if self.step_count % IO_POLL_STEPS == 0:
+            self.io_manager.poll()
+
     def stop_schedulers(self):
         STATUS.scheduler_running = False
         
@@ -1,14 +1,35 @@
 # src/modules_extension/extension_memory.py
 #动态内存分配与页面置换算法
 
-from config import MEMORY_SIZE, PAGE_SIZE
+from config import MEMORY_SIZE, PAGE_SIZE, MEMORY_BUDDY_MIN_BLOCK, MEMORY_SLAB_SIZE, MEMORY_SLAB_CLASSES
 from src.system_status import SystemStatus
+from src.modules_extension.memory_allocator import (FreeListAllocator, BuddyAllocator, SlabAllocator, MemoryBlock,
+                                                    fragmentation)
+from threading import Lock
 from typing import List, Dict, Tuple
 import random
 
 STATUS = SystemStatus()
-# 内存块状态定义：(start_addr, size, is_allocated, pid)
-MemoryBlock = Tuple[int, int, bool, int]
+
+# 所有分配策略：动态分区 (首次 / 最佳 / 最坏适应共用一个分配器)、伙伴、slab
+ALLOCATOR_STRATEGIES = FreeListAllocator.STRATEGIES + BuddyAllocator.STRATEGIES + SlabAllocator.STRATEGIES
+
+
+def make_allocator(strategy: str, total: int = MEMORY_SIZE):
+    """创建支持 strategy 的分配器"""
+    if strategy in FreeListAllocator.STRATEGIES:
+        return FreeListAllocator(total)
+    if strategy in BuddyAllocator.STRATEGIES:
+        return BuddyAllocator(total, MEMORY_BUDDY_MIN_BLOCK)
+    if strategy in SlabAllocator.STRATEGIES:
+        return SlabAllocator(total, MEMORY_SLAB_CLASSES, MEMORY_SLAB_SIZE, MEMORY_BUDDY_MIN_BLOCK)
+    raise ValueError(f"未知的分配策略: {strategy}")
+
+
+# 当前的分配器：由 memory_lock 保护，分配与回收不占用全局锁；
+# (start_addr, size, is_allocated, pid) 形式的内存布局由 get_memory_layout() 在显示时生成
+allocator = FreeListAllocator(MEMORY_SIZE)
+memory_lock = Lock()
 
 # 页面访问记录
 class PageAccessRecord:
@@ -18,19 +39,45 @@ class PageAccessRecord:
         self.access_time = access_time
 
 # 页面置换算法类型
-def initialize_memory():
+def initialize_memory(reset_pages: bool = True):
     """
     初始化内存：创建一个巨大的空闲块。
+    reset_pages 为 False 时保留页表和页面访问统计（由页面置换模块自行初始化）。
     """
-    with STATUS._lock:
+    with memory_lock:
         # 重置内存布局，假设起始地址为 0
-        STATUS.memory_layout = [(0, MEMORY_SIZE, False, -1)]
-        STATUS.page_table = {}
-        STATUS.next_free_frame = 0
-        STATUS.page_access_history = []
-        STATUS.page_fault_count = 0
-        STATUS.page_hit_count = 0
-        print(f"Memory initialized. Total size: {MEMORY_SIZE} MB.")
+        allocator.reset()
+    if reset_pages:
+        with STATUS._lock:
+            STATUS.page_table = {}
+            STATUS.next_free_frame = 0
+            STATUS.page_access_history = []
+            STATUS.page_fault_count = 0
+            STATUS.page_hit_count = 0
+    print(f"Memory initialized. Total size: {MEMORY_SIZE} MB.")
+
+
+def select_allocator(strategy: str) -> bool:
+    """
+    选择分配策略。当前分配器不支持该策略 (在动态分区、伙伴、slab 之间切换) 时换用新的分配器，
+    已分配的内存全部释放，返回 True。
+    """
+    global allocator
+    with memory_lock:
+        if strategy in allocator.STRATEGIES:
+            return False
+        allocator = make_allocator(strategy)
+    print(f"Switched to {type(allocator).__name__}, memory reset.")
+    return True
+
+
+def _allocate(pid: int, required_size: int, strategy: str, name: str) -> bool:
+    with memory_lock:
+        start = allocator.allocate(pid, required_size, strategy)
+    if start is None:
+        return False
+    print(f"PID {pid} allocated {required_size}MB using {name} at address {start}.")
+    return True
 
 
 def first_fit_allocate(pid: int, required_size: int) -> bool:
@@ -38,32 +85,7 @@ def first_fit_allocate(pid: int, required_size: int) -> bool:
     动态内存分配算法：First Fit (首次适应)。
     尝试找到第一个足够大的空闲块进行分配。
     """
-    with STATUS._lock:
-        new_layout: List[MemoryBlock] = []
-        allocated = False
-
-        for i, (start, size, is_alloc, block_pid) in enumerate(STATUS.memory_layout):
-            if not is_alloc and size >= required_size and not allocated:
-                # 找到第一个合适的空闲块
-
-                # 1. 分配：创建一个新的已分配块
-                new_layout.append((start, required_size, True, pid))
-
-                # 2. 剩余部分：如果还有剩余，创建一个新的空闲块
-                remaining_size = size - required_size
-                if remaining_size > 0:
-                    new_layout.append((start + required_size, remaining_size, False, -1))
-
-                allocated = True
-                print(f"PID {pid} allocated {required_size}MB using First Fit at address {start}.")
-
-            else:
-                # 保持原有的块不变
-                new_layout.append((start, size, is_alloc, block_pid))
-
-        # 更新全局内存状态
-        STATUS.memory_layout = new_layout
-        return allocated
+    return _allocate(pid, required_size, "first_fit", "First Fit")
 
 
 def best_fit_allocate(pid: int, required_size: int) -> bool:
@@ -71,39 +93,7 @@ def best_fit_allocate(pid: int, required_size: int) -> bool:
     动态内存分配算法：Best Fit (最佳适应)。
     尝试找到最小的足够大的空闲块进行分配。
     """
-    with STATUS._lock:
-        best_block_index = -1
-        best_block_size = float('inf')
-        new_layout: List[MemoryBlock] = list(STATUS.memory_layout)
-        allocated = False
-
-        # 找到最佳的空闲块
-        for i, (start, size, is_alloc, block_pid) in enumerate(STATUS.memory_layout):
-            if not is_alloc and size >= required_size and size < best_block_size:
-                best_block_index = i
-                best_block_size = size
-
-        if best_block_index != -1:
-            start, size, is_alloc, block_pid = STATUS.memory_layout[best_block_index]
-            new_layout.pop(best_block_index)
-            
-            # 1. 分配：创建一个新的已分配块
-            new_layout.append((start, required_size, True, pid))
-            
-            # 2. 剩余部分：如果还有剩余，创建一个新的空闲块
-            remaining_size = size - required_size
-            if remaining_size > 0:
-                new_layout.append((start + required_size, remaining_size, False, -1))
-            
-            # 按起始地址排序内存块
-            new_layout.sort(key=lambda x: x[0])
-            
-            allocated = True
-            print(f"PID {pid} allocated {required_size}MB using Best Fit at address {start}.")
-
-        # 更新全局内存状态
-        STATUS.memory_layout = new_layout
-        return allocated
+    return _allocate(pid, required_size, "best_fit", "Best Fit")
 
 
 def worst_fit_allocate(pid: int, required_size: int) -> bool:
@@ -111,71 +101,44 @@ def worst_fit_allocate(pid: int, required_size: int) -> bool:
     动态内存分配算法：Worst Fit (最坏适应)。
     尝试找到最大的空闲块进行分配。
     """
-    with STATUS._lock:
-        worst_block_index = -1
-        worst_block_size = -1
-        new_layout: List[MemoryBlock] = list(STATUS.memory_layout)
-        allocated = False
-
-        # 找到最坏的空闲块
-        for i, (start, size, is_alloc, block_pid) in enumerate(STATUS.memory_layout):
-            if not is_alloc and size >= required_size and size > worst_block_size:
-                worst_block_index = i
-                worst_block_size = size
-
-        if worst_block_index != -1:
-            start, size, is_alloc, block_pid = STATUS.memory_layout[worst_block_index]
-            new_layout.pop(worst_block_index)
-            
-            # 1. 分配：创建一个新的已分配块
-            new_layout.append((start, required_size, True, pid))
-            
-            # 2. 剩余部分：如果还有剩余，创建一个新的空闲块
-            remaining_size = size - required_size
-            if remaining_size > 0:
-                new_layout.append((start + required_size, remaining_size, False, -1))
-            
-            # 按起始地址排序内存块
-            new_layout.sort(key=lambda x: x[0])
-            
-            allocated = True
-            print(f"PID {pid} allocated {required_size}MB using Worst Fit at address {start}.")
-
-        # 更新全局内存状态
-        STATUS.memory_layout = new_layout
-        return allocated
+    return _allocate(pid, required_size, "worst_fit", "Worst Fit")
+
+
+def buddy_allocate(pid: int, required_size: int) -> bool:
+    """
+    伙伴分配：请求向上取整到 2 的幂，从更大的空闲块对半分裂得到；释放时与空闲的伙伴逐阶合并。
+    需要先通过 select_allocator("buddy") 选择伙伴分配器。
+    """
+    return _allocate(pid, required_size, "buddy", "Buddy")
+
+
+def slab_allocate(pid: int, required_size: int) -> bool:
+    """
+    slab 分配：小对象按大小类从 slab 的空闲槽中分配，大对象由后备的伙伴分配器分配。
+    需要先通过 select_allocator("slab") 选择 slab 分配器。
+    """
+    return _allocate(pid, required_size, "slab", "Slab")
 
 
 def deallocate_memory(pid: int):
     """
-    内存回收：释放指定 PID 的所有内存块，并尝试进行块合并。
+    内存回收：释放指定 PID 的所有内存块，并与相邻的空闲块合并。
     """
-    with STATUS._lock:
-        # 1. 释放所有属于该 PID 的块
-        current_layout = list(STATUS.memory_layout)
-        for i, (start, size, is_alloc, block_pid) in enumerate(current_layout):
-            if is_alloc and block_pid == pid:
-                current_layout[i] = (start, size, False, -1)  # 设置为未分配
-
-        # 2. 合并相邻的空闲块
-        merged_layout: List[MemoryBlock] = []
-        i = 0
-        while i < len(current_layout):
-            start, size, is_alloc, block_pid = current_layout[i]
-            if not is_alloc:
-                # 尝试合并后续的空闲块
-                j = i + 1
-                while j < len(current_layout) and not current_layout[j][2]:
-                    size += current_layout[j][1]
-                    j += 1
-                merged_layout.append((start, size, False, -1))
-                i = j
-            else:
-                merged_layout.append((start, size, is_alloc, block_pid))
-                i += 1
+    with memory_lock:
+        allocator.free_pid(pid)
+    print(f"PID {pid} memory deallocated.")
+
 
-        STATUS.memory_layout = merged_layout
-        print(f"PID {pid} memory deallocated.")
+def get_memory_layout() -> List[MemoryBlock]:
+    """按地址排列的内存布局 [(start_addr, size, is_allocated, pid)] (用于显示)"""
+    with memory_lock:
+        return allocator.layout()
+
+
+def get_allocated_pids():
+    """持有内存块的 PID 集合"""
+    with memory_lock:
+        return allocator.pids()
 
 
 # --- 页面置换模拟 ---
@@ -256,36 +219,38 @@ def _optimal_page_replacement(global_frames: Dict, current_pid: int, current_pag
     return random.choice(list(global_frames.keys()))
 
 
+def get_allocator_stats():
+    """
+    获取动态内存分配的统计信息 (不涉及页表)
+    """
+    with memory_lock:
+        frag = fragmentation(allocator)
+        return {
+            "total_memory": MEMORY_SIZE,
+            "used_memory": allocator.used,              # 请求的大小之和
+            "reserved_memory": allocator.reserved,      # 已分配块实际占用的空间 (含内部碎片)
+            "free_memory": allocator.free_memory,
+            "free_blocks": allocator.free_blocks,
+            "allocated_blocks": len(allocator.allocated),
+            "largest_free_block": allocator.largest_free,
+            "internal_fragmentation": frag['internal'],
+            "external_fragmentation": frag['external'],
+        }
+
+
 def get_memory_stats():
     """
     获取内存使用统计信息
     """
+    stats = get_allocator_stats()
+
     with STATUS._lock:
-        total_memory = MEMORY_SIZE
-        used_memory = 0
-        free_memory = 0
-        free_blocks = 0
-        allocated_blocks = 0
-        
-        for (start, size, is_alloc, pid) in STATUS.memory_layout:
-            if is_alloc:
-                used_memory += size
-                allocated_blocks += 1
-            else:
-                free_memory += size
-                free_blocks += 1
-        
         # 计算页面访问统计
         total_accesses = STATUS.page_hit_count + STATUS.page_fault_count
         hit_rate = STATUS.page_hit_count / total_accesses if total_accesses > 0 else 0
         fault_rate = STATUS.page_fault_count / total_accesses if total_accesses > 0 else 0
         
-        return {
-            "total_memory": total_memory,
-            "used_memory": used_memory,
-            "free_memory": free_memory,
-            "free_blocks": free_blocks,
-            "allocated_blocks": allocated_blocks,
+        stats.update({
             "page_frames": PAGE_FRAMES,
             "used_frames": len(STATUS.page_table),
             "free_frames": PAGE_FRAMES - len(STATUS.page_table),
@@ -294,7 +259,8 @@ def get_memory_stats():
             "total_accesses": total_accesses,
             "hit_rate": hit_rate,
             "fault_rate": fault_rate
-        }
+        })
+        return stats
 
 # 添加缺失的函数
 
@@ -349,10 +315,10 @@ def reset_memory():
     """
     重置所有内存，回收所有已分配的内存块
     """
-    with STATUS._lock:
+    with memory_lock:
         # 清空内存布局，只保留一个完整的空闲块
-        STATUS.memory_layout = [(0, MEMORY_SIZE, False, -1)]
-        print(f"All memory has been reset. Total memory: {MEMORY_SIZE} MB")
+        allocator.reset()
+    print(f"All memory has been reset. Total memory: {MEMORY_SIZE} MB")
 
 # 示例：
 # initialize_memory()
@@ -2,222 +2,923 @@
 # 修复版 V6：引入事件唯一ID机制，彻底解决同一时刻日志丢失问题
 
 import time
+import math
 import random
+import heapq
+from collections import deque
 from threading import Thread, Lock
 from src.process_model import RTOS_Task, ProcessState
 from src.system_status import SystemStatus
+from src.log_histogram import LogHistogram
+from src.modules_extension.rtos_nvic import NVIC, THREAD_CONTEXT, IRQ_PID_BASE
+from src.modules_extension.rtos_timer import TimingWheel
+from src.modules_extension.rtos_context import CpuContext, SRAM_BASE, R0, SP
+from src.modules_extension.rtos_memory import TaskStack, BlockPool, PoolExhausted, CONTEXT_FRAME_BYTES
+from src.modules_extension.rtos_analysis import uunifast
+from config import (RTOS_TICKLESS, RTOS_DELAY_RANGE_MS, RTOS_SEM_TIMEOUT_MS, RTOS_MUTEX_COUNT,
+                    RTOS_MUTEX_PROTOCOL, RTOS_CS_RANGE_MS, RTOS_STACK_SIZE, RTOS_STACK_POOL_BLOCKS,
+                    RTOS_MAIN_STACK_SIZE, RTOS_CALL_FRAME_BYTES, RTOS_MAX_CALL_DEPTH)
 
 STATUS = SystemStatus()
 rtos_lock = Lock()
 rtos_thread_handle = None  
 
-# === 全局事件计数器 (核心修复) ===
-global_event_counter = 0
+# 模拟 CPU：当前寄存器文件与上下文切换的周期统计
+cpu = CpuContext()
 
-def get_next_event_id():
-    """获取下一个全局唯一的事件ID"""
-    global global_event_counter
-    global_event_counter += 1
-    return global_event_counter
+# 非周期任务每个时间片主动阻塞 (vTaskDelay 或等待中断信号量) 的概率，其中一半为延时
+BLOCK_PROBABILITY = 0.05
 
-# 模拟寄存器
-cpu_registers = {f"R{i}": "0x00000000" for i in range(13)}
-cpu_registers.update({
-    "SP": "0x20001000", "LR": "0xFFFFFFFF", "PC": "0x08000000"
-})
+# 调度策略：PRIORITY 为原有的固定优先级调度；RM 按周期分配优先级 (周期越短越高)；EDF 按当前作业的绝对截止时间调度
+SCHED_POLICIES = ("PRIORITY", "RM", "EDF")
 
-pending_isr = None
+# 定时器类型：同一时刻先检查截止时间，再释放新作业，最后处理延时到期 / 等待超时
+_TIMER_DEADLINE = 0
+_TIMER_RELEASE = 1
+_TIMER_WAKE = 2
+
+# 互斥量协议：NONE 为普通互斥量；INHERIT 为优先级继承；CEILING 为优先级天花板 (立即天花板协议：加锁时即提升到天花板)
+MUTEX_PROTOCOLS = ("NONE", "INHERIT", "CEILING")
+
+# 使用互斥量的任务每执行一个时间片请求一次 (下一个) 互斥量的概率
+MUTEX_LOCK_PROBABILITY = 0.2
+
+# 周期任务作业完成或被丢弃后，等待下一次释放时的阻塞原因
+_WAIT_NEXT_PERIOD = "等待下一周期"
+
+# 延迟统计项：{名称: (显示名, 单位)}。上下文切换开销是内核切换代码的实际耗时，其余为模拟时间
+LATENCY_METRICS = {
+    'isr_latency': ("中断延迟", "ns"),          # 中断触发 (ISR_TRIGGER) -> 处理函数开始执行
+    'switch_overhead': ("上下文切换开销", "ns"),  # 保存上文、选择任务、恢复下文的耗时
+    'response_time': ("响应时间", "us"),        # 作业释放 / 任务到达 / 中断触发 -> 执行完成
+    'release_jitter': ("释放抖动", "us"),       # 周期作业的名义释放时刻 -> 第一次开始执行
+    'blocking_time': ("互斥量阻塞时间", "us"),   # 请求被占用的互斥量 -> 获得互斥量
+    'priority_inversion': ("优先级反转时间", "us"),  # 等待互斥量期间，名义优先级更低的任务占用 CPU 的时间
+}
+
+
+class LatencyStats:
+    """
+    按任务 / 中断分别统计的延迟直方图 {统计项: {对象: LogHistogram}}，对象为 "P<pid>" 或 "IRQ<n>"。
+    直方图只记录分桶计数，长时间运行时内存占用不随样本数增长。
+    内核在 rtos_lock 下写入；samples 为样本总数，读者据此判断统计是否有更新。
+    """
+
+    def __init__(self):
+        self.histograms = {metric: {} for metric in LATENCY_METRICS}
+        self.samples = 0
+
+    def record(self, metric, key, value):
+        hists = self.histograms[metric]
+        hist = hists.get(key)
+        if hist is None:
+            hist = hists[key] = LogHistogram()
+        hist.record(value)
+        self.samples += 1
+
+    def clear(self):
+        for hists in self.histograms.values():
+            hists.clear()
+        self.samples = 0
+
+    def summary(self, per_key=True):
+        """{统计项: {'unit', 'all': 汇总, 'by_key': {对象: 汇总}}}，汇总为 LogHistogram.summary() 的格式"""
+        result = {}
+        for metric, hists in self.histograms.items():
+            merged = LogHistogram()
+            for hist in hists.values():
+                merged.merge(hist)
+            entry = {'unit': LATENCY_METRICS[metric][1], 'all': merged.summary()}
+            if per_key:
+                entry['by_key'] = {key: hists[key].summary() for key in sorted(hists)}
+            result[metric] = entry
+        return result
+
+
+latency_stats = LatencyStats()
+
+# SRAM 布局：起始处为主栈 (中断处理使用，复位后 MSP 指向其栈顶)，随后是任务栈内存池 (每个任务一块)
+main_stack = TaskStack(SRAM_BASE, RTOS_MAIN_STACK_SIZE)
+stack_pool = BlockPool(SRAM_BASE + RTOS_MAIN_STACK_SIZE, RTOS_STACK_SIZE, RTOS_STACK_POOL_BLOCKS)
+
+# 中断控制器：中断不再作为任务调度，由 NVIC 在每个时间片内处理并占用线程的执行时间
+nvic = NVIC(stats=latency_stats, main_stack=main_stack)
+
+
+class RTOS_Semaphore:
+    """
+    计数信号量 (max_count 为 1 时为二值信号量)。
+    中断处理完成时释放对应中断线的信号量 (xSemaphoreGiveFromISR)，把中断的后续处理推迟到任务中；
+    没有任务等待时计数加一 (不超过 max_count)，否则唤醒等待者中调度优先级最高的一个。
+    """
+
+    def __init__(self, name, max_count=1):
+        self.name = name
+        self.max_count = max_count
+        self.count = 0
+        self.waiters = []  # 等待的任务 (按阻塞顺序)
+        self.takes = self.gives = self.timeouts = 0
+
+    def summary(self):
+        return {'count': self.count, 'waiting': len(self.waiters),
+                'takes': self.takes, 'gives': self.gives, 'timeouts': self.timeouts}
+
+
+# 各中断线的信号量 {IRQ 号: RTOS_Semaphore}，与中断控制器一样跨调度器保留 (暂停后继续时等待关系不变)
+semaphores = {}
+
+
+class RTOS_Mutex:
+    """
+    互斥量。释放时把所有权直接交给等待者中有效优先级最高的一个 (同优先级先等待者优先)。
+    - INHERIT：持有者的有效优先级不低于所有等待者，沿阻塞链 (等待者 -> 持有者 -> 持有者等待的互斥量 ...) 传递
+    - CEILING：天花板为所有使用者的最高名义优先级，加锁时持有者立即提升到天花板；
+      抢占式的固定优先级调度 (RM) 下，使用者在互斥量被占用时无法抢占持有者，因此不会在互斥量上阻塞
+    """
+
+    def __init__(self, index, protocol="NONE"):
+        if protocol not in MUTEX_PROTOCOLS:
+            raise ValueError(f"未知的互斥量协议: {protocol}")
+        self.index = index
+        self.name = f"M{index}"
+        self.protocol = protocol
+        self.owner = None
+        self.waiters = []
+        self.ceiling = None       # 使用者的最高名义优先级 (数值最小)，由内核在启动时计算
+        self.locks = 0            # 加锁次数
+        self.contentions = 0      # 请求时已被占用的次数
+        self.max_chain = 0        # 在该互斥量上阻塞时的最长阻塞链 (经过的互斥量数)
+
+    def summary(self):
+        return {'protocol': self.protocol, 'ceiling': self.ceiling, 'locks': self.locks,
+                'contentions': self.contentions, 'max_chain': self.max_chain,
+                'owner': self.owner.pid if self.owner else None, 'waiting': len(self.waiters)}
+
+
+# 互斥量 (序号即下标)，与信号量一样跨调度器保留
+mutexes = []
+
+
+def setup_mutexes(tasks, count, protocol="NONE"):
+    """创建 count 个互斥量，并为每个任务随机分配 0 ~ 2 个会使用的互斥量"""
+    mutexes[:] = [RTOS_Mutex(i, protocol) for i in range(count)]
+    for t in tasks:
+        t.resources = tuple(sorted(random.sample(range(count), random.randint(0, min(2, count))))) if count else ()
+    return mutexes
+
+
+def irq_semaphore(irq):
+    sem = semaphores.get(irq)
+    if sem is None:
+        sem = semaphores[irq] = RTOS_Semaphore(f"IRQ{irq} 信号量")
+    return sem
+
+
+def _latency_key(task):
+    return f"P{task.pid}"
+
+def _is_periodic(task):
+    """周期任务；普通进程 (Process) 没有 period 属性，按非周期任务处理"""
+    return getattr(task, 'period', 0) > 0
+
+def _allocate_stack(task):
+    """从内存池为任务分配栈，并预置第一次恢复时弹出的初始上下文 (与 FreeRTOS 的 pxPortInitialiseStack 一致)"""
+    base = stack_pool.alloc()
+    if base is None:
+        raise PoolExhausted(f"任务栈内存池已耗尽 ({stack_pool.count} 块)，无法创建任务 P{task.pid}")
+    task.stack = TaskStack(base, stack_pool.block_size)
+    task.stack.push(CONTEXT_FRAME_BYTES)
+
+def _set_call_depth(task, depth):
+    """任务的函数调用深度变为 depth：按深度的变化压栈或出栈 (普通进程没有任务栈，不记录)"""
+    stack = getattr(task, 'stack', None)
+    if stack is None:
+        return
+    delta = depth - task.call_depth
+    if delta > 0:
+        stack.push(delta * RTOS_CALL_FRAME_BYTES)
+    elif delta < 0:
+        stack.pop(-delta * RTOS_CALL_FRAME_BYTES)
+    task.call_depth = depth
+    if cpu.owner is task:
+        cpu.regs[SP] = stack.sp
 
 def generate_rtos_tasks(count=5):
     tasks = []
     STATUS.all_processes.clear() 
+    stack_pool.reset()  # 新的任务集取代原有的任务，原有的任务栈全部释放
     for i in range(1, count + 1):
         task = RTOS_Task(
             pid=i, arrival_time=0, burst_time=random.randint(50, 200),
             priority=random.randint(2, 8), period=0, deadline=0
         )
-        task.stack_base = 0x20000000 + (i * 0x400)
+        _allocate_stack(task)
         task.state = ProcessState.READY  
         tasks.append(task)
         STATUS.all_processes[task.pid] = task 
     return tasks
 
-def trigger_external_interrupt(isr_id=99):
-    global pending_isr
+def generate_periodic_tasks(count=5, utilization=0.7, period_range=(100, 1000), time_unit=20):
+    """
+    生成周期任务集 (隐式截止时间：deadline = period)。
+    周期和执行时间都取 time_unit 的整数倍，总利用率由于取整会与 utilization 略有偏差。
+    """
+    tasks = []
+    STATUS.all_processes.clear()
+    stack_pool.reset()
+    low, high = period_range[0] // time_unit, period_range[1] // time_unit
+    for i, u in enumerate(uunifast(count, utilization), start=1):
+        period = random.randint(low, high) * time_unit
+        wcet = max(1, round(u * period / time_unit)) * time_unit
+        task = RTOS_Task(
+            pid=i, arrival_time=0, burst_time=wcet,
+            priority=random.randint(2, 8), period=period, deadline=period
+        )
+        _allocate_stack(task)
+        # 作业由内核按周期释放，第一个作业释放前处于阻塞态
+        task.state = ProcessState.BLOCKED
+        task.block_reason = _WAIT_NEXT_PERIOD
+        tasks.append(task)
+        STATUS.all_processes[task.pid] = task
+    return tasks
+
+def trigger_external_interrupt(irq=99):
+    """触发外部中断线 irq (界面按钮 / 无界面运行的随机中断)，中断在下一个时间片开始时挂起"""
     if not STATUS.rtos_running:
         print(f"⚠️  RTOS未启动，无法触发中断！")
         return False
-    
+
     with rtos_lock:
-        if pending_isr is None:
-            burst = 300 
-            isr_task = RTOS_Task(
-                pid=isr_id, arrival_time=STATUS.global_timer, burst_time=burst, 
-                priority=0, period=0, deadline=0
-            )
-            isr_task.remaining_time = burst 
-            isr_task.is_isr = True
-            isr_task.name = "GPIO_IRQ_Handler"
-            isr_task.state = ProcessState.READY
-            
-            STATUS.all_processes[isr_id] = isr_task
-            pending_isr = isr_task
-            
-            # === 核心修改：添加 ID ===
-            evt_id = get_next_event_id()
-            with STATUS._lock:
-                STATUS.rtos_timeline.append({
-                    'id': evt_id, # 新增 ID
-                    'time': STATUS.global_timer,
-                    'type': 'ISR_TRIGGER',
-                    'prev_pid': -1,
-                    'next_pid': isr_id,
-                    'info': '外部硬件中断触发'
-                })
-            
-            print(f"!!! 硬件中断触发: {isr_task.name} (Event ID: {evt_id}) !!!")
-            return True
-        else:
-            print(f"⚠️  已有中断正在处理中")
+        if irq not in nvic.lines:
+            print(f"⚠️  未配置的中断线 IRQ{irq}")
             return False
+        if not nvic.raise_irq(irq):
+            print(f"⚠️  IRQ{irq} 已挂起，本次触发被合并")
+            return False
+        name = nvic.lines[irq].name
+
+    print(f"!!! 硬件中断触发: {name} (IRQ{irq}) !!!")
+    return True
 
 def reset_rtos_data():
     STATUS.rtos_running = False
     STATUS.global_timer = 0
     STATUS.rtos_timeline.clear()
     STATUS.all_processes.clear()
-    global pending_isr, global_event_counter
-    pending_isr = None
-    global_event_counter = 0 # 重置计数器
-    cpu_registers.update({f"R{i}": "0x00000000" for i in range(13)})
-    cpu_registers["PC"] = "0x08000000"
-    cpu_registers["SP"] = "0x20001000"
+    nvic.reset_lines()
+    semaphores.clear()
+    mutexes.clear()
+    cpu.reset()
+    stack_pool.reset()  # 主栈随 NVIC 一起清空
+    latency_stats.clear()
+
+class ReadyList:
+    """
+    就绪表 (FreeRTOS 风格)：每个优先级一个 FIFO 就绪队列，
+    另用一个整数位图记录哪些优先级的队列非空 (第 p 位对应优先级 p，数值越小优先级越高)。
+    取最高优先级任务只需取位图的最低置位，与任务总数无关。
+    """
+
+    def __init__(self):
+        self._queues = {}  # {priority: deque[RTOS_Task]}
+        self._bitmap = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def push(self, task, front=False):
+        """任务进入就绪态，排在同优先级队列的末尾 (front 为 True 时排在队首)"""
+        prio = task.priority
+        queue = self._queues.get(prio)
+        if queue is None:
+            queue = self._queues[prio] = deque()
+        if front:
+            queue.appendleft(task)
+        else:
+            queue.append(task)
+        self._bitmap |= 1 << prio
+        self._count += 1
+
+    def pop_highest(self):
+        """取出最高优先级队列的队首任务，没有就绪任务时返回 None"""
+        if not self._bitmap:
+            return None
+        prio = (self._bitmap & -self._bitmap).bit_length() - 1
+        queue = self._queues[prio]
+        task = queue.popleft()
+        if not queue:
+            self._bitmap &= ~(1 << prio)
+        self._count -= 1
+        return task
+
+    def peek_highest(self):
+        """最高优先级队列的队首任务 (不取出)"""
+        if not self._bitmap:
+            return None
+        return self._queues[(self._bitmap & -self._bitmap).bit_length() - 1][0]
+
+    def remove(self, task):
+        """把任务从就绪表中移除 (只需扫描同优先级的队列)，任务不在表中时返回 False"""
+        queue = self._queues.get(task.priority)
+        if not queue or task not in queue:
+            return False
+        queue.remove(task)
+        if not queue:
+            self._bitmap &= ~(1 << task.priority)
+        self._count -= 1
+        return True
+
+    @staticmethod
+    def key(task):
+        """调度键，越小越优先"""
+        return task.priority
+
+
+class DeadlineReadyList:
+    """
+    EDF 就绪表：按当前作业的绝对截止时间排序的小根堆，接口与 ReadyList 相同。
+    非周期任务没有截止时间，排在所有周期任务之后 (后台任务)。
+    移除任务时不在堆中查找：只删除该任务的有效序号，堆中的旧条目在出堆 / 查看堆顶时跳过 (延迟删除)，
+    旧条目超过有效条目数时整体重建一次堆。
+    """
+
+    def __init__(self):
+        self._heap = []  # [(绝对截止时间, 序号, 任务)]
+        self._live = {}  # {任务: 有效条目的序号}
+        self._seq = 0
+
+    def __len__(self):
+        return len(self._live)
+
+    def push(self, task, front=False):
+        """按截止时间排序，front 不起作用 (与 ReadyList 的接口一致)；任务已在表中时旧条目失效"""
+        self._seq += 1
+        self._live[task] = self._seq
+        heapq.heappush(self._heap, (self.key(task), self._seq, task))
+
+    def _drop_stale(self):
+        heap, live = self._heap, self._live
+        while heap and live.get(heap[0][2]) != heap[0][1]:
+            heapq.heappop(heap)
+
+    def pop_highest(self):
+        self._drop_stale()
+        if not self._heap:
+            return None
+        task = heapq.heappop(self._heap)[2]
+        del self._live[task]
+        return task
+
+    def peek_highest(self):
+        self._drop_stale()
+        return self._heap[0][2] if self._heap else None
+
+    def remove(self, task):
+        if self._live.pop(task, None) is None:
+            return False
+        if len(self._heap) > 2 * len(self._live) + 64:
+            live = self._live
+            self._heap = [entry for entry in self._heap if live.get(entry[2]) == entry[1]]
+            heapq.heapify(self._heap)
+        return True
+
+    @staticmethod
+    def key(task):
+        return task.absolute_deadline if _is_periodic(task) else math.inf
+
+
+def assign_rm_priorities(tasks):
+    """
+    速率单调优先级：周期任务按周期从短到长依次分配优先级 1, 2, ... (0 留给中断)，
+    非周期任务保持原有的相对顺序，排在所有周期任务之后。
+    """
+    periodic = sorted((t for t in tasks if _is_periodic(t)), key=lambda t: (t.period, t.pid))
+    for rank, t in enumerate(periodic, start=1):
+        t.priority = rank
+    offset = len(periodic)
+    for t in tasks:
+        if not _is_periodic(t):
+            # 保存原优先级，暂停后重新启动时不会重复偏移
+            if not hasattr(t, 'base_priority'):
+                t.base_priority = t.priority
+            t.priority = t.base_priority + offset
+
 
 class RTOS_Scheduler:
-    def __init__(self, tasks: list):
+    def __init__(self, tasks: list, policy="PRIORITY", tickless=RTOS_TICKLESS):
+        if policy not in SCHED_POLICIES:
+            raise ValueError(f"未知的调度策略: {policy}")
         self.tasks = tasks
+        self.policy = policy
+        self.tickless = tickless
+        self.skipped_slices = 0  # 无节拍模式跳过的时间片数
         self.current_task = None
         self.simulation_timer = STATUS.global_timer
+        self.tick_count = 0
+        # 中断控制器的时钟与内核对齐 (暂停期间触发的中断在恢复后的第一个时间片开始时处理)
+        nvic.now = max(nvic.now, self.simulation_timer)
+        if policy == "RM":
+            assign_rm_priorities(tasks)
+        if policy == "EDF" and any(m.protocol != "NONE" for m in mutexes):
+            raise ValueError("优先级继承 / 天花板协议只适用于固定优先级调度 (PRIORITY / RM)")
+        self.ready = DeadlineReadyList() if policy == "EDF" else ReadyList()
+        self._mutex_waiters = set()  # 正在等待互斥量的任务 (统计优先级反转时间)
+        self._init_mutexes()
+        # 内核定时器 (1 tick = 1ms)：周期任务的释放与截止时间检查、延时到期、信号量等待超时
+        self.timers = TimingWheel(self.simulation_timer)
+        self._wait_timers = {}  # {pid: 阻塞任务的唤醒定时器}，信号量被释放时取消
+        self._unreleased = []  # 尚未释放过作业的周期任务，在第一个时间片释放
         
         for t in self.tasks:
-            if t.state == ProcessState.RUNNING:
+            if _is_periodic(t):
+                if t.next_release is None:
+                    self._unreleased.append(t)
+                    continue
+                # 从暂停中恢复：重建定时器
+                self._add_timer(t.next_release, _TIMER_RELEASE, t, 0)
+                if t.remaining_time > 0 and t.state != ProcessState.TERMINATED:
+                    self._add_timer(t.absolute_deadline, _TIMER_DEADLINE, t, t.job_count)
+            if t.state == ProcessState.RUNNING and self.current_task is None:
                 self.current_task = t
-                break
-
-    def _update_registers(self, task):
-        global cpu_registers
-        base = getattr(task, 'stack_base', 0x20000000)
-        cpu_registers["SP"] = f"0x{base:08X}"
-        cpu_registers["PC"] = f"0x0800{task.pid:04X}"
-        cpu_registers["R0"] = f"0x{random.randint(0, 0xFFFFFFFF):08X}"
-
-    def _record_event(self, event_type, prev_pid, next_pid, extra_info=""):
-        # === 核心修改：自动分配 ID ===
-        evt_id = get_next_event_id()
-        
-        event = {
-            'id': evt_id, # 新增 ID
-            'time': self.simulation_timer,
-            'type': event_type, 
-            'prev_pid': prev_pid,
-            'next_pid': next_pid,
-            'info': extra_info
-        }
-        with STATUS._lock:
-            STATUS.rtos_timeline.append(event)
-            if len(STATUS.rtos_timeline) > 2000:
-                STATUS.rtos_timeline.pop(0)
+            elif t.state == ProcessState.READY:
+                self._make_ready(t)
+            elif t.state == ProcessState.BLOCKED and not _is_periodic(t) and t not in self._mutex_waiters:
+                # 从暂停中恢复：按原来的唤醒时刻重建定时器 (没有唤醒时刻的进程按一次延时处理)
+                wake_time = getattr(t, 'wake_time', None)
+                if wake_time is None:
+                    wake_time = self.simulation_timer + random.randint(*RTOS_DELAY_RANGE_MS)
+                self._arm_wait(t, wake_time)
+
+    def _init_mutexes(self):
+        """记录各任务的名义优先级并计算互斥量的天花板；从暂停中恢复时按持有的互斥量重新计算有效优先级"""
+        for t in self.tasks:
+            # RM 每次启动时重新分配优先级，其余策略保留第一次记录的名义优先级 (有效优先级可能已被提升)
+            if self.policy == "RM" or getattr(t, 'nominal_priority', None) is None:
+                t.nominal_priority = t.priority
+        for m in mutexes:
+            users = [t.nominal_priority for t in self.tasks if m.index in getattr(t, 'resources', ())]
+            m.ceiling = min(users) if users else None
+        for m in mutexes:
+            self._mutex_waiters.update(m.waiters)
+            if m.owner is not None:
+                self._refresh_priority(m.owner)
+
+    def _make_ready(self, task, front=False):
+        """任务进入就绪态并加入就绪表；剩余时间已耗尽的任务不再参与调度"""
+        task.state = ProcessState.READY
+        if task.remaining_time > 0:
+            self.ready.push(task, front)
+
+    def _add_timer(self, when, kind, task, job):
+        return self.timers.add(when, kind, task, job)
+
+    def _process_timers(self, now):
+        """推进时间轮，处理到期的定时器：截止时间检查、作业释放、延时到期与等待超时"""
+        if self._unreleased:
+            for t in self._unreleased:
+                self._release_job(t, now)
+            self._unreleased = []
+        for timer in self.timers.advance(now):
+            t = timer.task
+            if timer.kind == _TIMER_DEADLINE:
+                # 作业序号不同说明该作业已被新作业取代，剩余时间为 0 说明已按时完成
+                if t.job_count == timer.data and t.remaining_time > 0 and t.state != ProcessState.TERMINATED:
+                    self._miss_deadline(t)
+            elif timer.kind == _TIMER_RELEASE:
+                self._release_job(t, timer.expires)
+            else:
+                self._wait_expired(t)
+
+    # --- 延时与信号量 ---
+
+    def _arm_wait(self, task, wake_time):
+        """为阻塞任务设置唤醒 / 超时定时器"""
+        task.wake_time = wake_time
+        self._wait_timers[task.pid] = self._add_timer(wake_time, _TIMER_WAKE, task, 0)
+
+    def _block(self, task, reason, wake_time):
+        task.state = ProcessState.BLOCKED
+        task.block_reason = reason
+        self._arm_wait(task, wake_time)
+        self._record_event("BLOCKED", task.pid, -1, reason)
+        if task is self.current_task:
+            self.current_task = None
+
+    def task_delay(self, task, delay, now):
+        """vTaskDelay：任务阻塞 delay 毫秒"""
+        self._block(task, f"vTaskDelay({delay}ms)", now + delay)
+
+    def semaphore_take(self, task, sem, timeout, now):
+        """xSemaphoreTake：有可用计数时立即返回 True，否则阻塞等待，最多等待 timeout 毫秒"""
+        sem.takes += 1
+        if sem.count > 0:
+            sem.count -= 1
+            return True
+        sem.waiters.append(task)
+        self._block(task, f"等待 {sem.name}", now + timeout)
+        return False
+
+    def semaphore_give(self, sem, when=None):
+        """释放信号量：唤醒调度优先级最高的等待者 (同优先级先等待者优先)，没有等待者时计数加一"""
+        sem.gives += 1
+        if not sem.waiters:
+            sem.count = min(sem.count + 1, sem.max_count)
+            return
+        task = min(sem.waiters, key=self.ready.key)
+        sem.waiters.remove(task)
+        timer = self._wait_timers.pop(task.pid, None)
+        if timer is not None:
+            self.timers.cancel(timer)
+        self._wake(task, "Sem Given", when)
+
+    def _wait_expired(self, task):
+        """唤醒定时器到期：延时结束，或等待信号量超时"""
+        self._wait_timers.pop(task.pid, None)
+        if task.state != ProcessState.BLOCKED:
+            return
+        for sem in semaphores.values():
+            if task in sem.waiters:
+                sem.waiters.remove(task)
+                sem.timeouts += 1
+                self._wake(task, "Sem Timeout")
+                return
+        self._wake(task, "Delay 到期")
+
+    def _wake(self, task, reason, when=None):
+        task.wake_time = None
+        self._make_ready(task)
+        self._record_event("WAKEUP", -1, task.pid, reason, when)
+
+    # --- 互斥量 ---
+
+    def _set_priority(self, task, priority):
+        """修改有效优先级；就绪任务换到新优先级的就绪队列"""
+        requeue = task.state == ProcessState.READY and self.ready.remove(task)
+        old = task.priority
+        task.priority = priority
+        if requeue:
+            self.ready.push(task)
+        self._record_event("PRIO_CHANGE", -1, task.pid, f"{old} -> {priority}")
+
+    def _refresh_priority(self, task):
+        """按持有的互斥量重新计算有效优先级 (继承等待者 / 天花板)，优先级继承沿阻塞链传递"""
+        priority = task.nominal_priority
+        for m, _ in task.held_mutexes:
+            if m.protocol == "CEILING" and m.ceiling is not None:
+                priority = min(priority, m.ceiling)
+            elif m.protocol == "INHERIT":
+                for w in m.waiters:
+                    priority = min(priority, w.priority)
+        if priority == task.priority:
+            return
+        self._set_priority(task, priority)
+        waiting = task.waiting_mutex
+        if waiting is not None and waiting.owner is not None:
+            self._refresh_priority(waiting.owner)
+
+    def _blocking_chain(self, task, m):
+        """阻塞链：等待者 -> 互斥量 -> 持有者 -> 持有者等待的互斥量 -> ..."""
+        parts = [f"P{task.pid}"]
+        length = 0
+        while m is not None and m.owner is not None:
+            length += 1
+            parts += [m.name, f"P{m.owner.pid}"]
+            m = m.owner.waiting_mutex
+        return length, " → ".join(parts)
+
+    def _grant(self, task, m, cs):
+        m.owner = task
+        m.locks += 1
+        task.held_mutexes.append([m, cs])
+        self._record_event("MUTEX_LOCK", -1, task.pid, m.name)
+        self._refresh_priority(task)
+
+    def mutex_lock(self, task, m, cs, now):
+        """请求互斥量并在获得后执行 cs 毫秒的临界区；互斥量被占用时阻塞 (无超时) 并返回 False"""
+        if m.owner is None:
+            self._grant(task, m, cs)
+            return True
+        m.contentions += 1
+        m.waiters.append(task)
+        self._mutex_waiters.add(task)
+        task.waiting_mutex = m
+        task.pending_cs = cs
+        task.mutex_wait_start = now
+        task.mutex_inversion = 0
+        length, chain = self._blocking_chain(task, m)
+        m.max_chain = max(m.max_chain, length)
+        task.state = ProcessState.BLOCKED
+        task.block_reason = f"等待 {m.name} (P{m.owner.pid} 持有)"
+        self._record_event("BLOCKED", task.pid, -1, f"等待 {m.name}，阻塞链: {chain}")
+        if task is self.current_task:
+            self.current_task = None
+        self._refresh_priority(m.owner)
+        return False
+
+    def mutex_unlock(self, task, m, now):
+        """释放互斥量：所有权交给有效优先级最高的等待者，释放者恢复优先级"""
+        task.held_mutexes = [entry for entry in task.held_mutexes if entry[0] is not m]
+        m.owner = None
+        self._record_event("MUTEX_UNLOCK", task.pid, -1, m.name)
+        if m.waiters:
+            nxt = min(m.waiters, key=self.ready.key)
+            m.waiters.remove(nxt)
+            self._mutex_waiters.discard(nxt)
+            nxt.waiting_mutex = None
+            key = _latency_key(nxt)
+            latency_stats.record('blocking_time', key, (now - nxt.mutex_wait_start) * 1000)
+            latency_stats.record('priority_inversion', key, nxt.mutex_inversion * 1000)
+            self._grant(nxt, m, nxt.pending_cs)
+            self._wake(nxt, f"获得 {m.name}")
+        self._refresh_priority(task)
+
+    def _abandon_mutexes(self, task, now):
+        """作业完成或被丢弃：释放持有的互斥量 (从内层开始)，放弃正在等待的互斥量"""
+        for m, _ in reversed(getattr(task, 'held_mutexes', ())):
+            self.mutex_unlock(task, m, now)
+        m = getattr(task, 'waiting_mutex', None)
+        if m is not None:
+            m.waiters.remove(task)
+            self._mutex_waiters.discard(task)
+            task.waiting_mutex = None
+            if m.owner is not None:
+                self._refresh_priority(m.owner)
+
+    def _run_critical_sections(self, task, run_time, now):
+        """持有的临界区都执行了 run_time，执行完的临界区 (从内层开始) 释放互斥量"""
+        held = task.held_mutexes
+        for entry in held:
+            entry[1] -= run_time
+        while held and held[-1][1] <= 0:
+            self.mutex_unlock(task, held[-1][0], now)
+            held = task.held_mutexes
+
+    def _request_mutex(self, task, now):
+        """
+        使用互斥量的任务在执行一个时间片前，以 MUTEX_LOCK_PROBABILITY 的概率请求一个比已持有的序号更大的
+        互斥量 (嵌套临界区)，临界区从本时间片开始，长度不超过外层临界区和任务的剩余时间。
+        返回任务是否阻塞在互斥量上。
+        """
+        resources = getattr(task, 'resources', ())
+        if not resources or random.random() >= MUTEX_LOCK_PROBABILITY:
+            return False
+        held = task.held_mutexes
+        last = held[-1][0].index if held else -1
+        candidates = [i for i in resources if i > last]
+        if not candidates:
+            return False
+        m = mutexes[random.choice(candidates)]
+        cs = min(random.randint(*RTOS_CS_RANGE_MS), task.remaining_time)
+        if held:
+            cs = min(cs, held[-1][1])
+        return not self.mutex_lock(task, m, cs, now)
+
+    def _tickless_slices(self, time_unit, until):
+        """
+        无节拍模式：没有可运行的任务、也没有待处理的中断时，
+        返回可以直接跳过的时间片数 (跳到下一个定时器到期或中断到达的时间片，最多到 until)。
+        """
+        if self.current_task or len(self.ready) or self._unreleased:
+            return 0
+        start = self.simulation_timer + time_unit  # 下一个时间片的开始时刻
+        limit = until if until is not None else math.inf
+        expiry = self.timers.next_expiry()
+        if expiry is not None:
+            # 定时器在开始时刻不早于到期时刻的第一个时间片处理
+            limit = min(limit, start + max(0, -(-(expiry - start) // time_unit)) * time_unit)
+        arrival = nvic.next_event()
+        if arrival < math.inf:
+            # 中断在到达时刻所在的时间片处理
+            limit = min(limit, start + max(0, (arrival - start) // time_unit) * time_unit)
+        if limit == math.inf:
+            return 0
+        return max(0, int((limit - start) // time_unit))
+
+    def _release_job(self, task, when):
+        """释放周期任务的一个新作业，并安排下一次释放和本作业的截止时间检查"""
+        task.job_count += 1
+        task.remaining_time = task.burst_time
+        task.release_time = when
+        task.job_started = False
+        task.absolute_deadline = when + task.deadline
+        task.next_release = when + task.period
+        self._add_timer(task.next_release, _TIMER_RELEASE, task, 0)
+        self._add_timer(task.absolute_deadline, _TIMER_DEADLINE, task, task.job_count)
+        self._record_event("RELEASE", -1, task.pid, f"作业 #{task.job_count}")
+        if task.state == ProcessState.BLOCKED:
+            self._make_ready(task)
+
+    def _miss_deadline(self, task):
+        """作业错过截止时间：记录并丢弃该作业，任务等待下一次释放"""
+        self._abandon_mutexes(task, self.simulation_timer)
+        task.deadline_misses += 1
+        task.remaining_time = 0
+        _set_call_depth(task, 0)
+        if task is self.current_task:
+            self.current_task = None
+        elif task.state == ProcessState.READY:
+            self.ready.remove(task)
+        task.state = ProcessState.BLOCKED
+        task.block_reason = _WAIT_NEXT_PERIOD
+        self._record_event("DEADLINE_MISS", task.pid, -1, f"作业 #{task.job_count} 超过截止时间 {task.absolute_deadline}ms")
+
+    def _pick(self):
+        if self.policy == "PRIORITY":
+            # 正在运行的任务不在就绪表中：有其他就绪任务时切换到其中优先级最高的一个
+            target_task = self.ready.pop_highest()
+            return target_task, "Preemption" if target_task else ""
+        return self._pick_preemptive()
+
+    def _pick_preemptive(self):
+        """RM / EDF：只有就绪表中更优先的任务才能抢占正在运行的任务"""
+        current = self.current_task
+        best = self.ready.peek_highest()
+        if best is None:
+            return current, ""
+        if current is None:
+            return self.ready.pop_highest(), "Dispatch"
+        if self.ready.key(best) < self.ready.key(current):
+            return self.ready.pop_highest(), "Preemption"
+        return current, ""
+
+    def _record_dispatch_latency(self, task, switch_ns):
+        """任务被切换上 CPU 时的统计：切换开销、周期作业的释放抖动"""
+        key = _latency_key(task)
+        latency_stats.record('switch_overhead', key, switch_ns)
+        if _is_periodic(task) and not task.job_started:
+            task.job_started = True
+            latency_stats.record('release_jitter', key, (self.simulation_timer - task.release_time) * 1000)
+
+    def _record_event(self, event_type, prev_pid, next_pid, extra_info="", when=None):
+        # 环形缓冲区分配事件 ID 并覆盖最早的事件；读者按 ID 游标读取，不需要 STATUS._lock
+        STATUS.rtos_timeline.append(self.simulation_timer if when is None else when,
+                                    event_type, prev_pid, next_pid, extra_info)
 
     def run_cycle(self, time_unit=20): 
-        global pending_isr
-        
         while STATUS.rtos_running:
             time.sleep(0.35) 
             if not STATUS.rtos_running: break
 
             with rtos_lock:
-                self.simulation_timer += time_unit
-                STATUS.global_timer = self.simulation_timer
-                
-                target_task = None
-                reason = ""
-                
-                # 1. 调度
-                if pending_isr:
-                    target_task = pending_isr
-                    pending_isr = None 
-                    reason = "Hardware IRQ"
-                else:
-                    for t in STATUS.all_processes.values():
-                        if t.state == ProcessState.BLOCKED and random.random() < 0.1: 
-                            t.state = ProcessState.READY
-                            self._record_event("WAKEUP", -1, t.pid, "Sem Given")
-
-                    ready_q = [t for t in STATUS.all_processes.values() 
-                               if t.state == ProcessState.READY and t.remaining_time > 0]
-                    if ready_q:
-                        ready_q.sort(key=lambda x: x.priority)
-                        target_task = ready_q[0]
-                        reason = "Preemption"
-
-                # 2. 切换
-                if target_task != self.current_task:
-                    prev_pid = self.current_task.pid if self.current_task else -1
-                    next_pid = target_task.pid if target_task else -1
-                    
-                    if self.current_task:
-                        if getattr(self.current_task, 'is_isr', False):
-                             self.current_task.state = ProcessState.TERMINATED
-                        elif self.current_task.state == ProcessState.RUNNING:
-                            self.current_task.state = ProcessState.READY
-                        
-                        if next_pid != -1:
-                            self._record_event("SWITCH_START", prev_pid, -1, "Save Context")
-
-                    self.current_task = target_task
-                    
-                    if self.current_task:
-                        self.current_task.state = ProcessState.RUNNING
-                        self._update_registers(self.current_task)
-                        evt_type = "ISR_EXEC" if getattr(self.current_task, 'is_isr', False) else "TASK_SWITCH"
-                        self._record_event(evt_type, prev_pid, next_pid, reason)
-                    else:
-                        self._record_event("IDLE", prev_pid, -1, "Idle")
-
-                # 3. 执行
-                if self.current_task:
-                    self.current_task.remaining_time -= time_unit
-                    
-                    if not getattr(self.current_task, 'is_isr', False) and random.random() < 0.05:
-                        self.current_task.state = ProcessState.BLOCKED
-                        self.current_task.block_reason = "Wait Queue"
-                        self._record_event("BLOCKED", self.current_task.pid, -1, "Blocked")
-                        self.current_task = None
-                        continue
-
-                    if self.current_task.remaining_time <= 0:
-                        if getattr(self.current_task, 'is_isr', False):
-                            self._record_event("ISR_FINISH", self.current_task.pid, -1, "ISR Return")
-                            if self.current_task.pid in STATUS.all_processes:
-                                del STATUS.all_processes[self.current_task.pid]
-                        else:
-                            self.current_task.state = ProcessState.TERMINATED
-                            self._record_event("TASK_FINISH", self.current_task.pid, -1, "任务完成")
-                        self.current_task = None
-
-def start_rtos_simulation():
+                self.step(time_unit)
+
+    def step(self, time_unit=20, until=None):
+        """
+        推进一个时间片：调度 -> 切换 -> 中断 -> 执行 (调用方持有 rtos_lock 或处于单线程模式)。
+        无节拍模式下先跳过确定空闲的时间片 (处理的时间片开始时刻不超过 until)。
+        返回推进的时间片数 (含跳过的时间片)。
+        """
+        skipped = self._tickless_slices(time_unit, until) if self.tickless else 0
+        if skipped:
+            self._record_event("TICKLESS", -1, -1, f"跳过 {skipped} 个时间片 ({skipped * time_unit}ms)")
+            self.simulation_timer += skipped * time_unit
+            self.tick_count += skipped
+            self.skipped_slices += skipped
+        self.simulation_timer += time_unit
+        self.tick_count += 1
+        STATUS.global_timer = self.simulation_timer
+        
+        target_task = None
+        reason = ""
+
+        # 0. 定时器：截止时间检查、作业释放、延时到期与等待超时 (本时间片覆盖 [simulation_timer, simulation_timer + time_unit))
+        if len(self.timers) or self._unreleased:
+            self._process_timers(self.simulation_timer)
+        
+        # 1. 调度：选中的任务在执行本时间片前可能请求互斥量，被占用时阻塞并重新选择
+        target_task, reason = self._pick()
+        while target_task is not None and self._request_mutex(target_task, self.simulation_timer):
+            target_task, reason = self._pick()
+
+        # 2. 切换：保存上文、恢复下文 (寄存器文件整体复制)，计时只覆盖切换本身，事件在其后记录
+        if target_task != self.current_task:
+            switch_start = time.perf_counter_ns()
+            prev_task = self.current_task
+            if prev_task and prev_task.state == ProcessState.RUNNING:
+                # RM 下被抢占的任务排在同优先级队首 (与 POSIX SCHED_FIFO 一致)，
+                # 提升到天花板的持有者因此先于同优先级的使用者恢复执行
+                self._make_ready(prev_task, front=self.policy == "RM")
+            self.current_task = target_task
+            if target_task:
+                target_task.state = ProcessState.RUNNING
+            cycles = cpu.switch(target_task)
+            switch_ns = time.perf_counter_ns() - switch_start
+
+            prev_pid = prev_task.pid if prev_task else -1
+            if target_task:
+                if prev_task:
+                    self._record_event("SWITCH_START", prev_pid, -1, "Save Context")
+                self._record_event("TASK_SWITCH", prev_pid, target_task.pid, f"{reason}, {cycles} cycles")
+                self._record_dispatch_latency(target_task, switch_ns)
+            else:
+                self._record_event("IDLE", prev_pid, -1, "Idle")
+
+        # 等待互斥量期间，名义优先级更低的任务 (持有者或其他任务) 占用 CPU 的时间计为优先级反转
+        if self._mutex_waiters and self.current_task is not None:
+            running = self.current_task.nominal_priority
+            for w in self._mutex_waiters:
+                if running > w.nominal_priority:
+                    w.mutex_inversion += time_unit
+
+        # 3. 中断：NVIC 按到达时刻处理本时间片内的中断 (嵌套、尾链)，线程只得到剩余的时间
+        running_pid = self.current_task.pid if self.current_task else -1
+        nvic.thread_stack = getattr(self.current_task, 'stack', None)  # 打断线程时异常帧压入其任务栈
+        isr_time = nvic.run(self.simulation_timer, self.simulation_timer + time_unit)
+        thread_time = time_unit - isr_time if isr_time else time_unit
+
+        # 4. 执行
+        if self.current_task and thread_time > 0:
+            self._execute(thread_time, time_unit)
+
+        # 中断事件的时间不早于本时间片开始时记录的线程事件，最后写入时间线
+        self._flush_irq_events(running_pid)
+        return skipped + 1
+
+    def _execute(self, run_time, time_unit):
+        """当前任务执行 run_time，处理随机阻塞与完成"""
+        task = self.current_task
+        task.remaining_time -= run_time
+        cpu.run(run_time)
+        # 调用深度随寄存器的变化而变化 (不消耗随机数，无节拍模式与逐个时间片推进的结果一致)
+        _set_call_depth(task, (cpu.regs[R0] >> 16) % (RTOS_MAX_CALL_DEPTH + 1))
+        now = self.simulation_timer + time_unit  # 主动阻塞与释放互斥量发生在本时间片结束时
+        held = getattr(task, 'held_mutexes', None)
+        if held:
+            self._run_critical_sections(task, run_time, now)
+            held = task.held_mutexes
+
+        # 周期任务的执行时间是确定的 (可调度性分析的前提)，只有非周期任务会随机阻塞：
+        # 调用 vTaskDelay，或等待某条中断线的信号量 (带超时)；持有互斥量时不会主动阻塞
+        if (not _is_periodic(task) and not held and task.remaining_time > 0
+                and random.random() < BLOCK_PROBABILITY):
+            if random.random() < 0.5:
+                self.task_delay(task, random.randint(*RTOS_DELAY_RANGE_MS), now)
+                return
+            irq = random.choice(sorted(nvic.lines))
+            if not self.semaphore_take(task, irq_semaphore(irq), RTOS_SEM_TIMEOUT_MS, now):
+                return
+
+        if task.remaining_time <= 0:
+            # 本时间片执行完才完成，完成时刻为时间片的结束时刻 (统计单位为微秒)
+            finish_time = now
+            self._abandon_mutexes(task, now)
+            if _is_periodic(task):
+                # 周期任务的作业完成，等待下一次释放
+                task.state = ProcessState.BLOCKED
+                task.block_reason = _WAIT_NEXT_PERIOD
+                _set_call_depth(task, 0)  # 作业函数返回
+                self._record_event("JOB_FINISH", task.pid, -1, f"作业 #{task.job_count} 完成")
+                latency_stats.record('response_time', _latency_key(task), (finish_time - task.release_time) * 1000)
+            else:
+                task.state = ProcessState.TERMINATED
+                if getattr(task, 'stack', None) is not None:
+                    # 任务删除后栈归还内存池 (保留 task.stack 中的使用统计)
+                    stack_pool.free(task.stack.base)
+                self._record_event("TASK_FINISH", task.pid, -1, "任务完成")
+                latency_stats.record('response_time', _latency_key(task), (finish_time - task.arrival_time) * 1000)
+            self.current_task = None
+
+    def _flush_irq_events(self, running_pid):
+        """把 NVIC 缓存的中断事件写入时间线，"被中断的线程"替换为实际的任务"""
+        events = nvic.drain_events()
+        if not events:
+            return
+        resumed_pid = self.current_task.pid if self.current_task else -1
+        append = STATUS.rtos_timeline.append
+        for when, event_type, prev_pid, next_pid, info in events:
+            # 时间片开始前触发的中断在内核处理它的时刻记入时间线 (延迟统计使用实际触发时刻)
+            when = max(when, self.simulation_timer)
+            if prev_pid == THREAD_CONTEXT:
+                prev_pid = running_pid
+            if next_pid == THREAD_CONTEXT:
+                next_pid = resumed_pid
+            append(when, event_type, prev_pid, next_pid, info)
+            if event_type == "ISR_FINISH":
+                # 中断处理完成时释放该中断线的信号量，唤醒等待的任务
+                self.semaphore_give(irq_semaphore(prev_pid - IRQ_PID_BASE), when)
+
+def start_rtos_simulation(policy="PRIORITY", tickless=RTOS_TICKLESS, mutex_protocol=RTOS_MUTEX_PROTOCOL):
     global rtos_thread_handle
     if STATUS.rtos_running: return
 
     STATUS.rtos_running = True 
     
-    tasks = []
-    if not STATUS.all_processes:
-        tasks = generate_rtos_tasks(5)
+    tasks = list(STATUS.all_processes.values())
+    generated = True
+    if not tasks:
+        # 固定优先级调度沿用随机的一次性任务
+        tasks = generate_rtos_tasks(5) if policy == "PRIORITY" else generate_periodic_tasks(5)
+    elif policy != "PRIORITY" and not any(_is_periodic(t) for t in tasks):
+        # RM / EDF 需要周期任务集，现有进程都不是周期任务时生成演示任务集
+        tasks = generate_periodic_tasks(5)
     else:
-        tasks = list(STATUS.all_processes.values())
+        generated = False  # 暂停后继续：沿用原有的互斥量与等待关系
+    if generated and RTOS_MUTEX_COUNT:
+        # 优先级继承 / 天花板只适用于固定优先级调度，EDF 下使用普通互斥量
+        setup_mutexes(tasks, RTOS_MUTEX_COUNT, mutex_protocol if policy != "EDF" else "NONE")
         
-    scheduler = RTOS_Scheduler(tasks)
+    scheduler = RTOS_Scheduler(tasks, policy, tickless)
     rtos_thread_handle = Thread(target=scheduler.run_cycle, daemon=True)
     rtos_thread_handle.start()
 
@@ -0,0 +1,643 @@
+# src/modules_extension/memory_allocator.py
+# 动态分区分配的核心：按地址排序、带最大值线段树的空闲块索引 + 按大小排序的索引 (首次 / 最佳 / 最坏适应)、伙伴分配器、slab 分配器
+
+from bisect import bisect_left, insort
+from itertools import chain
+from typing import Dict, List, Optional, Tuple
+
+# 内存块视图：(start_addr, size, is_allocated, pid)
+MemoryBlock = Tuple[int, int, bool, int]
+
+FIT_STRATEGIES = ("first_fit", "best_fit", "worst_fit")
+
+
+class SortedList:
+    """
+    分块的有序列表：元素按序分散在若干长度不超过 2 * LOAD 的子列表中，另有各子列表最大元素的列表。
+    插入与删除先二分查找子列表，只移动该子列表中的元素，开销与总长度基本无关 (单个有序列表的插入和删除
+    需要移动其后的所有元素，空闲块很多时与块数成正比)。
+    """
+
+    LOAD = 256
+
+    __slots__ = ('_lists', '_maxes', '_len')
+
+    def __init__(self):
+        self._lists: List[list] = []
+        self._maxes: list = []
+        self._len = 0
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        return chain.from_iterable(self._lists)
+
+    def add(self, value):
+        lists, maxes = self._lists, self._maxes
+        self._len += 1
+        if not maxes:
+            lists.append([value])
+            maxes.append(value)
+            return
+        i = bisect_left(maxes, value)
+        if i == len(maxes):
+            i -= 1
+            sub = lists[i]
+            sub.append(value)
+            maxes[i] = value
+        else:
+            sub = lists[i]
+            insort(sub, value)
+        if len(sub) > 2 * self.LOAD:
+            # 子列表过长时对半拆分
+            half = sub[self.LOAD:]
+            del sub[self.LOAD:]
+            maxes[i] = sub[-1]
+            lists.insert(i + 1, half)
+            maxes.insert(i + 1, half[-1])
+
+    def discard(self, value) -> bool:
+        """删除 value，不存在时返回 False"""
+        lists, maxes = self._lists, self._maxes
+        i = bisect_left(maxes, value)
+        if i == len(maxes):
+            return False
+        sub = lists[i]
+        j = bisect_left(sub, value)
+        if sub[j] != value:
+            return False
+        del sub[j]
+        self._len -= 1
+        if not sub:
+            del lists[i]
+            del maxes[i]
+        elif j == len(sub):
+            maxes[i] = sub[-1]
+        return True
+
+    def remove(self, value):
+        if not self.discard(value):
+            raise ValueError(f"{value!r} 不在列表中")
+
+    def ceiling(self, value):
+        """不小于 value 的最小元素，没有时返回 None"""
+        i = bisect_left(self._maxes, value)
+        if i == len(self._maxes):
+            return None
+        sub = self._lists[i]
+        return sub[bisect_left(sub, value)]
+
+    def first(self):
+        return self._lists[0][0] if self._lists else None
+
+    def last(self):
+        return self._maxes[-1] if self._maxes else None
+
+
+class FreeBlockIndex:
+    """
+    按起始地址排序的空闲块索引，附带最大空闲块信息：块按地址分散在若干长度不超过 2 * LOAD 的段中 (同 SortedList)，
+    每段保存起始地址与大小两个并列的列表以及段内最大的块，各段的最大值再组成一棵最大值线段树。
+    首次适应从树根向下走到第一个最大值足够大的段，只在该段内按地址查找，开销为 O(log n + LOAD)，
+    不随空闲块数线性增长。
+    """
+
+    LOAD = 64  # 段内的查找与最大值重算是线性的，段比 SortedList 短
+
+    __slots__ = ('_starts', '_sizes', '_keys', '_seg_max', '_tree', '_leaves', '_len')
+
+    def __init__(self):
+        self._starts: List[List[int]] = []
+        self._sizes: List[List[int]] = []
+        self._keys: List[int] = []      # 各段最后一个起始地址，用于二分查找段
+        self._seg_max: List[int] = []   # 各段最大的块
+        self._tree: List[int] = [0, 0]  # 最大值线段树，叶子为各段的最大块
+        self._leaves = 1
+        self._len = 0
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        """按地址顺序产生 (起始地址, 大小)"""
+        for starts, sizes in zip(self._starts, self._sizes):
+            yield from zip(starts, sizes)
+
+    @property
+    def largest(self) -> int:
+        return self._tree[1]
+
+    def _rebuild(self):
+        """段数变化后重建线段树 (每插入约 LOAD 个块才发生一次)"""
+        leaves = 1
+        while leaves < len(self._seg_max):
+            leaves *= 2
+        tree = [0] * (2 * leaves)
+        tree[leaves:leaves + len(self._seg_max)] = self._seg_max
+        for i in range(leaves - 1, 0, -1):
+            tree[i] = max(tree[2 * i], tree[2 * i + 1])
+        self._tree, self._leaves = tree, leaves
+
+    def _set_max(self, seg: int, value: int):
+        self._seg_max[seg] = value
+        tree = self._tree
+        i = seg + self._leaves
+        tree[i] = value
+        i //= 2
+        while i:
+            tree[i] = max(tree[2 * i], tree[2 * i + 1])
+            i //= 2
+
+    def add(self, start: int, size: int):
+        keys = self._keys
+        self._len += 1
+        if not keys:
+            self._starts.append([start])
+            self._sizes.append([size])
+            keys.append(start)
+            self._seg_max.append(size)
+            self._rebuild()
+            return
+        seg = bisect_left(keys, start)
+        if seg == len(keys):
+            seg -= 1
+            keys[seg] = start
+        starts, sizes = self._starts[seg], self._sizes[seg]
+        j = bisect_left(starts, start)
+        starts.insert(j, start)
+        sizes.insert(j, size)
+        if len(starts) > 2 * self.LOAD:
+            # 段过长时对半拆分
+            load = self.LOAD
+            self._starts.insert(seg + 1, starts[load:])
+            self._sizes.insert(seg + 1, sizes[load:])
+            del starts[load:]
+            del sizes[load:]
+            keys[seg] = starts[-1]
+            keys.insert(seg + 1, self._starts[seg + 1][-1])
+            self._seg_max[seg] = max(sizes)
+            self._seg_max.insert(seg + 1, max(self._sizes[seg + 1]))
+            self._rebuild()
+        elif size > self._seg_max[seg]:
+            self._set_max(seg, size)
+
+    def remove(self, start: int) -> int:
+        """删除起始地址为 start 的块，返回其大小"""
+        keys = self._keys
+        seg = bisect_left(keys, start)
+        starts = self._starts[seg] if seg < len(keys) else ()
+        j = bisect_left(starts, start)
+        if j == len(starts) or starts[j] != start:
+            raise ValueError(f"{start!r} 不是空闲块")
+        sizes = self._sizes[seg]
+        size = sizes.pop(j)
+        del starts[j]
+        self._len -= 1
+        if not starts:
+            del self._starts[seg], self._sizes[seg], keys[seg], self._seg_max[seg]
+            self._rebuild()
+            return size
+        if j == len(starts):
+            keys[seg] = starts[-1]
+        if size == self._seg_max[seg]:
+            self._set_max(seg, max(sizes))
+        return size
+
+    def first_fit(self, size: int) -> Optional[int]:
+        """地址最低的、不小于 size 的空闲块的起始地址，没有时返回 None"""
+        tree = self._tree
+        if tree[1] < size:
+            return None
+        i, leaves = 1, self._leaves
+        while i < leaves:
+            i *= 2
+            if tree[i] < size:
+                i += 1
+        seg = i - leaves
+        starts = self._starts[seg]
+        for j, block in enumerate(self._sizes[seg]):
+            if block >= size:
+                return starts[j]
+        return None
+
+
+class PidIndex:
+    """pid -> 该 pid 持有的块的起始地址集合：按 pid 释放只访问它自己的块，与堆中的总块数无关"""
+
+    __slots__ = ('_blocks',)
+
+    def __init__(self):
+        self._blocks: Dict[int, set] = {}
+
+    def add(self, pid: int, start: int):
+        blocks = self._blocks.get(pid)
+        if blocks is None:
+            blocks = self._blocks[pid] = set()
+        blocks.add(start)
+
+    def remove(self, pid: int, start: int):
+        blocks = self._blocks[pid]
+        blocks.discard(start)
+        if not blocks:
+            del self._blocks[pid]
+
+    def blocks(self, pid: int) -> List[int]:
+        return list(self._blocks.get(pid, ()))
+
+    def pids(self):
+        return set(self._blocks)
+
+
+class FreeListAllocator:
+    """
+    动态分区分配器。
+    - 边界标记：空闲块按起始地址 (头部) 和结束地址 (尾部) 各登记在一个字典中，释放时用两次字典查找
+      判断紧邻的前后块是否空闲并合并，不需要在空闲表中查找
+    - 空闲块另按地址顺序保存在带最大值线段树的分段索引中：首次适应沿树找到第一个足够大的块，O(log n)
+    - 另有按 (大小, 起始地址) 排序的索引：最佳适应二分查找第一个足够大的块，最坏适应取最大的块，
+      同样大小时都取地址最低的块 (与按地址扫描的结果一致)
+    - 已分配的块保存在 {起始地址: (大小, pid)} 字典中，另有 pid -> 块的索引，按 pid 释放的开销与该 pid 的块数成正比
+    释放的开销与堆中的总块数基本无关；(start, size, is_allocated, pid) 形式的布局只在显示时生成。
+    """
+
+    STRATEGIES = FIT_STRATEGIES
+
+    def __init__(self, total: int):
+        self.total = total
+        self.reset()
+
+    def reset(self):
+        """释放所有块，恢复为一个完整的空闲块"""
+        self._free_index = FreeBlockIndex()          # 按地址排序的空闲块 (首次适应、生成布局)
+        self._free_size: Dict[int, int] = {}         # 头部标记 {起始地址: 大小}
+        self._free_end: Dict[int, int] = {}          # 尾部标记 {结束地址: 起始地址}
+        self._by_size = SortedList()                 # [(大小, 起始地址)] (升序)
+        self.allocated: Dict[int, Tuple[int, int]] = {}  # {起始地址: (大小, pid)}
+        self._by_pid = PidIndex()
+        self.used = 0
+        if self.total > 0:
+            self._add_free(0, self.total)
+
+    # --- 空闲块索引 ---
+
+    def _add_free(self, start: int, size: int):
+        self._free_index.add(start, size)
+        self._free_size[start] = size
+        self._free_end[start + size] = start
+        self._by_size.add((size, start))
+
+    def _remove_free(self, start: int) -> int:
+        size = self._free_size.pop(start)
+        del self._free_end[start + size]
+        self._free_index.remove(start)
+        self._by_size.remove((size, start))
+        return size
+
+    # --- 查找 ---
+
+    @property
+    def reserved(self) -> int:
+        """已分配块占用的空间 (按请求大小分割，没有内部碎片)"""
+        return self.used
+
+    @property
+    def free_memory(self) -> int:
+        return self.total - self.used
+
+    @property
+    def largest_free(self) -> int:
+        return self._by_size.last()[0] if self._by_size else 0
+
+    @property
+    def free_blocks(self) -> int:
+        return len(self._free_index)
+
+    def find(self, size: int, strategy: str = "first_fit") -> Optional[int]:
+        """按策略选择能容纳 size 的空闲块，返回其起始地址；没有时返回 None"""
+        if strategy not in FIT_STRATEGIES:
+            raise ValueError(f"未知的分配策略: {strategy}")
+        largest = self.largest_free
+        if largest < size:
+            return None
+        if strategy == "best_fit":
+            return self._by_size.ceiling((size, -1))[1]
+        if strategy == "worst_fit":
+            return self._by_size.ceiling((largest, -1))[1]
+        return self._free_index.first_fit(size)
+
+    # --- 分配与释放 ---
+
+    def allocate(self, pid: int, size: int, strategy: str = "first_fit") -> Optional[int]:
+        """从选中的空闲块的低地址端分配 size，剩余部分仍为空闲块；返回起始地址，失败时返回 None"""
+        if size <= 0:
+            raise ValueError(f"分配大小必须为正数: {size}")
+        start = self.find(size, strategy)
+        if start is None:
+            return None
+        block_size = self._remove_free(start)
+        if block_size > size:
+            self._add_free(start + size, block_size - size)
+        self.allocated[start] = (size, pid)
+        self._by_pid.add(pid, start)
+        self.used += size
+        return start
+
+    def free(self, start: int):
+        """释放起始地址为 start 的已分配块，通过边界标记与紧邻的空闲块合并"""
+        size, pid = self.allocated.pop(start)
+        self._by_pid.remove(pid, start)
+        self.used -= size
+        end = start + size
+        if end in self._free_size:
+            size += self._remove_free(end)
+        prev = self._free_end.get(start)
+        if prev is not None:
+            size += self._remove_free(prev)
+            start = prev
+        self._add_free(start, size)
+
+    def free_pid(self, pid: int) -> int:
+        """释放 pid 的所有块，返回释放的块数"""
+        starts = self._by_pid.blocks(pid)
+        for start in starts:
+            self.free(start)
+        return len(starts)
+
+    def pids(self):
+        return self._by_pid.pids()
+
+    # --- 视图 ---
+
+    def layout(self) -> List[MemoryBlock]:
+        """按地址排列的内存布局 [(start, size, is_allocated, pid)]"""
+        blocks = [(start, size, True, pid) for start, (size, pid) in self.allocated.items()]
+        blocks.extend((start, size, False, -1) for start, size in self._free_index)
+        blocks.sort()
+        return blocks
+
+
+class BuddyAllocator:
+    """
+    二进制伙伴分配器。
+    - 请求向上取整到 2 的幂 (不小于最小块)，块的地址按其大小对齐，k 阶块的伙伴地址为 start ^ 2^k
+    - 每阶的空闲块起始地址保存在分块的有序列表中，另用整数位图记录哪些阶有空闲块：
+      分配时取位图中不低于所需阶的最低置位，逐阶对半分裂 (O(log n) 阶)，取地址最低的块
+    - 释放时只要伙伴也空闲就逐阶合并 (二分查找伙伴，O(log n) 阶)
+    总大小不是 2 的幂时，从地址 0 开始分解为若干对齐的 2 的幂块，小于最小块的余量不使用。
+    """
+
+    STRATEGIES = ("buddy",)
+
+    def __init__(self, total: int, min_block: int = 1):
+        self.total = total
+        self.min_order = max(0, (min_block - 1).bit_length())
+        self.reset()
+
+    def reset(self):
+        self.max_order = max(self.min_order, self.total.bit_length() - 1)
+        self._free = [SortedList() for _ in range(self.max_order + 1)]  # 每阶的空闲块起始地址 (升序)
+        self._free_mask = 0      # 第 k 位表示 k 阶有空闲块
+        self._free_count = 0
+        self.allocated: Dict[int, Tuple[int, int, int]] = {}  # {起始地址: (阶, 请求大小, pid)}
+        self._by_pid = PidIndex()
+        self.used = 0            # 请求大小之和
+        self.reserved = 0        # 已分配块的大小之和 (含向上取整的内部碎片)
+        start, remaining = 0, self.total
+        for order in range(self.max_order, self.min_order - 1, -1):
+            if remaining >= 1 << order:
+                self._add_free(start, order)
+                start += 1 << order
+                remaining -= 1 << order
+        self.unusable = remaining
+
+    def _add_free(self, start: int, order: int):
+        self._free[order].add(start)
+        self._free_mask |= 1 << order
+        self._free_count += 1
+
+    def _take_free(self, order: int, start: int) -> bool:
+        """从 order 阶的空闲表中取出 start，不存在时返回 False"""
+        blocks = self._free[order]
+        if not blocks.discard(start):
+            return False
+        if not blocks:
+            self._free_mask &= ~(1 << order)
+        self._free_count -= 1
+        return True
+
+    def order_for(self, size: int) -> int:
+        return max(self.min_order, (size - 1).bit_length())
+
+    @property
+    def free_memory(self) -> int:
+        return self.total - self.reserved - self.unusable
+
+    @property
+    def largest_free(self) -> int:
+        return 1 << (self._free_mask.bit_length() - 1) if self._free_mask else 0
+
+    @property
+    def free_blocks(self) -> int:
+        return self._free_count
+
+    def allocate(self, pid: int, size: int, strategy: str = "buddy") -> Optional[int]:
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"未知的分配策略: {strategy}")
+        if size <= 0:
+            raise ValueError(f"分配大小必须为正数: {size}")
+        order = self.order_for(size)
+        if order > self.max_order:
+            return None
+        candidates = self._free_mask >> order
+        if not candidates:
+            return None
+        k = order + (candidates & -candidates).bit_length() - 1
+        start = self._free[k].first()
+        self._take_free(k, start)
+        while k > order:
+            # 对半分裂：低半块继续分裂或分配，高半块 (伙伴) 放入低一阶的空闲表
+            k -= 1
+            self._add_free(start + (1 << k), k)
+        self.allocated[start] = (order, size, pid)
+        self._by_pid.add(pid, start)
+        self.used += size
+        self.reserved += 1 << order
+        return start
+
+    def free(self, start: int):
+        order, size, pid = self.allocated.pop(start)
+        self._by_pid.remove(pid, start)
+        self.used -= size
+        self.reserved -= 1 << order
+        while order < self.max_order:
+            buddy = start ^ (1 << order)
+            if not self._take_free(order, buddy):
+                break
+            start = min(start, buddy)
+            order += 1
+        self._add_free(start, order)
+
+    def free_pid(self, pid: int) -> int:
+        starts = self._by_pid.blocks(pid)
+        for start in starts:
+            self.free(start)
+        return len(starts)
+
+    def pids(self):
+        return self._by_pid.pids()
+
+    def layout(self) -> List[MemoryBlock]:
+        """按地址排列的块 (已分配的块按整块显示，含内部碎片)"""
+        blocks = [(start, 1 << order, True, pid) for start, (order, _size, pid) in self.allocated.items()]
+        for order, starts in enumerate(self._free):
+            blocks.extend((start, 1 << order, False, -1) for start in starts)
+        blocks.sort()
+        return blocks
+
+
+class _Slab:
+    """一个 slab：切分为 count 个 obj_size 大小的槽，空闲槽序号保存在栈中 (先分配低地址的槽)"""
+
+    __slots__ = ('start', 'class_index', 'obj_size', 'count', 'free_slots')
+
+    def __init__(self, start: int, class_index: int, obj_size: int, slab_size: int):
+        self.start = start
+        self.class_index = class_index
+        self.obj_size = obj_size
+        self.count = slab_size // obj_size
+        self.free_slots = list(range(self.count - 1, -1, -1))
+
+
+class SlabAllocator:
+    """
+    slab (大小类) 分配器，用于小对象。
+    - 请求向上取整到最近的大小类，从该类地址最低的未满 slab 中取一个空闲槽，分配与释放都是 O(1) 的槽操作
+    - slab 是 slab_size 大小的块，由后备的伙伴分配器提供；槽全部空闲时立即归还
+    - 超过最大大小类的请求直接由伙伴分配器分配
+    内部碎片包括槽的取整、slab 中的空闲槽与末尾放不下一个槽的余量。
+    """
+
+    STRATEGIES = ("slab",)
+
+    def __init__(self, total: int, classes, slab_size: int, min_block: int = 1):
+        self.classes = tuple(sorted(classes))
+        if not self.classes or self.classes[0] <= 0 or self.classes[-1] > slab_size:
+            raise ValueError(f"大小类需要为正数且不超过 slab 大小 {slab_size}: {classes}")
+        self.slab_size = slab_size
+        self.backing = BuddyAllocator(total, min_block)
+        self.total = total
+        self.reset()
+
+    def reset(self):
+        self.backing.reset()
+        self._slabs: Dict[int, _Slab] = {}                          # {slab 起始地址: slab}
+        self._partial: List[List[int]] = [[] for _ in self.classes]  # 每个大小类中未满的 slab (升序)
+        self.allocated: Dict[int, Tuple[int, int, Optional[int]]] = {}  # {地址: (请求大小, pid, 所在 slab 或 None)}
+        self._by_pid = PidIndex()
+        self.used = 0
+
+    @property
+    def reserved(self) -> int:
+        return self.backing.reserved
+
+    @property
+    def free_memory(self) -> int:
+        return self.backing.free_memory
+
+    @property
+    def largest_free(self) -> int:
+        return self.backing.largest_free
+
+    @property
+    def free_blocks(self) -> int:
+        return self.backing.free_blocks
+
+    def allocate(self, pid: int, size: int, strategy: str = "slab") -> Optional[int]:
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"未知的分配策略: {strategy}")
+        if size <= 0:
+            raise ValueError(f"分配大小必须为正数: {size}")
+        if size > self.classes[-1]:
+            start = self.backing.allocate(pid, size)
+            if start is not None:
+                self.allocated[start] = (size, pid, None)
+                self._by_pid.add(pid, start)
+                self.used += size
+            return start
+
+        index = bisect_left(self.classes, size)
+        partial = self._partial[index]
+        if partial:
+            slab = self._slabs[partial[0]]
+        else:
+            start = self.backing.allocate(-1, self.slab_size)
+            if start is None:
+                return None
+            slab = self._slabs[start] = _Slab(start, index, self.classes[index], self.slab_size)
+            partial.append(start)
+        addr = slab.start + slab.free_slots.pop() * slab.obj_size
+        if not slab.free_slots:
+            del partial[bisect_left(partial, slab.start)]
+        self.allocated[addr] = (size, pid, slab.start)
+        self._by_pid.add(pid, addr)
+        self.used += size
+        return addr
+
+    def free(self, addr: int):
+        size, pid, slab_start = self.allocated.pop(addr)
+        self._by_pid.remove(pid, addr)
+        self.used -= size
+        if slab_start is None:
+            self.backing.free(addr)
+            return
+        slab = self._slabs[slab_start]
+        partial = self._partial[slab.class_index]
+        was_full = not slab.free_slots
+        slab.free_slots.append((addr - slab_start) // slab.obj_size)
+        if len(slab.free_slots) == slab.count:
+            # slab 全部空闲，归还后备分配器
+            if not was_full:
+                del partial[bisect_left(partial, slab_start)]
+            del self._slabs[slab_start]
+            self.backing.free(slab_start)
+        elif was_full:
+            insort(partial, slab_start)
+
+    def free_pid(self, pid: int) -> int:
+        addrs = self._by_pid.blocks(pid)
+        for addr in addrs:
+            self.free(addr)
+        return len(addrs)
+
+    def pids(self):
+        return self._by_pid.pids()
+
+    def layout(self) -> List[MemoryBlock]:
+        """按地址排列的块：slab 展开为各个槽 (空闲槽与末尾余量显示为空闲)"""
+        blocks = []
+        for start, size, is_alloc, pid in self.backing.layout():
+            slab = self._slabs.get(start) if is_alloc else None
+            if slab is None:
+                blocks.append((start, size, is_alloc, pid))
+                continue
+            for i in range(slab.count):
+                addr = start + i * slab.obj_size
+                entry = self.allocated.get(addr)
+                blocks.append((addr, slab.obj_size, entry is not None, entry[1] if entry else -1))
+            tail = slab.count * slab.obj_size
+            if tail < size:
+                blocks.append((start + tail, size - tail, False, -1))
+        return blocks
+
+
+def fragmentation(allocator) -> Dict[str, float]:
+    """
+    内部碎片率：已占用空间中超出请求大小的部分 (取整、slab 空闲槽) 所占的比例；
+    外部碎片率：不能被最大空闲块满足的空闲内存占比。
+    """
+    reserved, free = allocator.reserved, allocator.free_memory
+    return {
+        'internal': (reserved - allocator.used) / reserved if reserved else 0.0,
+        'external': 1 - allocator.largest_free / free if free else 0.0,
+    }
@@ -0,0 +1,234 @@
+# src/modules_extension/rtos_analysis.py
+# 周期任务集的离线可调度性分析：利用率界、RM 响应时间分析 (RTA)、EDF 处理器需求分析 (QPA)
+
+import math
+import random
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# 任务参数：(pid, 执行时间 C, 周期 T, 相对截止时间 D)，要求 D <= T
+TaskParams = Tuple[int, int, int, int]
+
+
+def uunifast(count: int, utilization: float) -> List[float]:
+    """UUniFast 算法：把总利用率随机且均匀地分配给 count 个任务"""
+    utils = []
+    remaining = utilization
+    for i in range(1, count):
+        next_remaining = remaining * random.random() ** (1.0 / (count - i))
+        utils.append(remaining - next_remaining)
+        remaining = next_remaining
+    utils.append(remaining)
+    return utils
+
+
+def random_taskset(count: int, utilization: float, period_range=(100, 100000),
+                   resolution: int = 1000) -> List[TaskParams]:
+    """
+    随机生成隐式截止时间的周期任务集参数，不创建内核任务 (不占用任务栈等内核资源)。
+    周期在 period_range (ms) 内按整毫秒均匀选取，参数以 1/resolution ms 为单位 (默认 µs)：
+    执行时间取整到这一粒度，任务很多时总利用率也与 utilization 基本一致。
+    """
+    low, high = period_range
+    params = []
+    for i, u in enumerate(uunifast(count, utilization), start=1):
+        period = random.randint(low, high) * resolution
+        wcet = min(period, max(1, round(u * period)))
+        params.append((i, wcet, period, period))
+    return params
+
+
+def task_params(tasks: Iterable) -> List[TaskParams]:
+    """从 RTOS_Task 列表中取出周期任务的参数 (非周期任务不参与分析)"""
+    return [(t.pid, int(t.burst_time), int(t.period), int(t.deadline or t.period))
+            for t in tasks if getattr(t, 'period', 0) > 0]
+
+
+def _arrays(params: Sequence[TaskParams]):
+    arr = np.array([p[1:] for p in params], dtype=np.int64).reshape(-1, 3)
+    return arr[:, 0], arr[:, 1], arr[:, 2]
+
+
+def liu_layland_bound(n: int) -> float:
+    """RM 的 Liu & Layland 利用率界 n(2^(1/n) - 1) (隐式截止时间的充分条件)"""
+    return n * (2 ** (1.0 / n) - 1) if n > 0 else 1.0
+
+
+def _rm_order(params: Sequence[TaskParams]):
+    """按 RM 优先级排序 (周期越短越高，周期相同按 pid)，返回排序后的参数和浮点数组"""
+    order = sorted(params, key=lambda p: (p[2], p[0]))
+    C, T, D = _arrays(order)
+    return order, C.astype(np.float64), T.astype(np.float64), D
+
+
+def _response_time(r: int, c_i: int, d_i: int, hp_c, hp_t) -> int:
+    """
+    从下界 r 开始迭代 R = C_i + Σ ⌈R / T_j⌉ C_j，直到不动点或超过截止时间 d_i。
+    ⌈R / T_j⌉ 用浮点除法计算：R / T_j 为整数时结果精确；不是整数时与最近整数的距离至少为 1 / T_j，
+    而舍入误差不超过 (R / T_j) * 2^-53，只要 R < 2^53 就不会被舍入成整数，结果与整数运算一致。
+    """
+    if not len(hp_c):
+        return c_i
+    while r <= d_i:
+        w = c_i + int(np.dot(np.ceil(r / hp_t), hp_c))
+        if w == r:
+            break
+        r = w
+    return r
+
+
+def rm_response_times(params: Sequence[TaskParams]) -> List[Tuple[int, Optional[int]]]:
+    """
+    RM 优先级下的迭代响应时间分析：
+        R = C_i + Σ_{j ∈ hp(i)} ⌈R / T_j⌉ C_j
+    返回按优先级排列的 [(pid, R)]，R 超过截止时间时为 None。
+    高优先级任务的干扰用 numpy 向量化计算；按优先级顺序分析时，
+    R_{i-1} + C_i 是 R_i 的下界，可作为迭代初值；R 超过 D_i 立即停止。
+    """
+    order, C, T, D = _rm_order(params)
+    results = []
+    prev_r = 0      # 上一个任务的响应时间 (不可调度时为 0，改用 ΣC 作为初值)
+    prefix_c = 0    # Σ_{j<=i} C_j
+    for i in range(len(order)):
+        c_i, d_i = order[i][1], order[i][3]
+        prefix_c += c_i
+        r = _response_time(prev_r + c_i if prev_r else prefix_c, c_i, d_i, C[:i], T[:i])
+        if r <= d_i:
+            results.append((order[i][0], r))
+            prev_r = r
+        else:
+            results.append((order[i][0], None))
+            prev_r = 0
+    return results
+
+
+def rm_unschedulable(params: Sequence[TaskParams]) -> List[int]:
+    """
+    RM 下会错过截止时间的任务 pid 列表 (只判定，不求各任务的响应时间)。
+    任务 i 的可调度性只取决于它和更高优先级的任务：若这些任务的利用率满足双曲界 Π(U_j + 1) <= 2，
+    且任务 i 为隐式截止时间，则任务 i 一定可调度，不需要迭代；其余任务用响应时间分析精确判定。
+    """
+    order, C, T, D = _rm_order(params)
+    misses = []
+    product = 1.0
+    prefix_c = 0
+    for i in range(len(order)):
+        pid, c_i, t_i, d_i = order[i]
+        product *= 1.0 + c_i / t_i
+        prefix_c += c_i
+        # 留出浮点误差余量，边界上的任务交给精确分析
+        if product <= 2.0 - 1e-9 and d_i == t_i:
+            continue
+        if _response_time(prefix_c, c_i, d_i, C[:i], T[:i]) > d_i:
+            misses.append(pid)
+    return misses
+
+
+def _demand(t: int, C, T, D) -> int:
+    """处理器需求函数 h(t) = Σ_{D_i <= t} (⌊(t - D_i) / T_i⌋ + 1) C_i"""
+    jobs = np.maximum((t - D) // T + 1, 0)
+    return int(np.dot(jobs, C))
+
+
+def _last_deadline_before(t: int, T, D) -> int:
+    """小于 t 的最大绝对截止时间 (D_i + k T_i)，不存在时返回 0"""
+    mask = D < t
+    if not mask.any():
+        return 0
+    k = (t - D[mask] - 1) // T[mask]
+    return int((D[mask] + k * T[mask]).max())
+
+
+def _busy_period(C, T) -> int:
+    """同步释放时的第一个忙碌期长度 L = Σ ⌈L / T_i⌉ C_i (要求 U <= 1)"""
+    length = int(C.sum())
+    while True:
+        nxt = int(np.dot(-(-length // T), C))
+        if nxt == length:
+            return length
+        length = nxt
+
+
+def edf_demand_test(params: Sequence[TaskParams]) -> Tuple[bool, Optional[int]]:
+    """
+    EDF 的精确可调度性判定。
+    隐式截止时间 (D = T) 时等价于 U <= 1；受限截止时间时使用 QPA (Zhang & Burns)，
+    从检查区间上界向下迭代 t = h(t)，只需计算很少几个点的处理器需求。
+    返回 (是否可调度, 需求超过供给的时刻或 None)。
+    """
+    if not params:
+        return True, None
+    C, T, D = _arrays(params)
+    u = float(np.sum(C / T))
+    if u > 1.0 + 1e-12:
+        return False, None
+    if np.all(D == T):
+        return True, None
+
+    # 检查区间上界：同步忙碌期，以及 U < 1 时的 La 界，取较小者
+    limit = _busy_period(C, T)
+    if u < 1.0:
+        la = max(int(D.max()), math.ceil(float(np.sum((T - D) * (C / T))) / (1.0 - u)))
+        limit = min(limit, la)
+
+    d_min = int(D.min())
+    t = _last_deadline_before(limit + 1, T, D)
+    h = _demand(t, C, T, D)
+    while h <= t and h > d_min:
+        if h < t:
+            t = h
+        else:
+            t = _last_deadline_before(t, T, D)
+        h = _demand(t, C, T, D)
+    if h <= d_min:
+        return True, None
+    return False, t
+
+
+def analyze(params: Sequence[TaskParams], policy: str = "RM", per_task: bool = False,
+            target_utilization: Optional[float] = None) -> Dict[str, Any]:
+    """
+    分析周期任务集在 RM 或 EDF 下的可调度性，返回 JSON 可序列化的结果：
+    总利用率、各利用率界的判定、精确判定的结论与方法；per_task 为 True 时附带 RM 各任务的响应时间。
+    随机生成的任务集可给出 target_utilization，与实际的总利用率并列输出。
+    """
+    n = len(params)
+    utils = [c / t for (_pid, c, t, _d) in params]
+    u = sum(utils)
+    implicit = all(d == t for (_pid, _c, t, d) in params)
+    result: Dict[str, Any] = {
+        'policy': policy,
+        'tasks': n,
+        'utilization': u,
+        'implicit_deadlines': implicit,
+    }
+    if target_utilization is not None:
+        result['target_utilization'] = target_utilization
+        result['utilization_drift'] = u - target_utilization
+    if policy == "RM":
+        ll = liu_layland_bound(n)
+        hyperbolic = math.prod(x + 1 for x in utils)
+        result['bounds'] = {
+            # 利用率界只是充分条件，且只适用于隐式截止时间
+            'liu_layland': {'bound': ll, 'passed': implicit and u <= ll},
+            'hyperbolic': {'product': hyperbolic, 'passed': implicit and hyperbolic <= 2.0},
+        }
+        if per_task:
+            responses = rm_response_times(params)
+            misses = [pid for pid, r in responses if r is None]
+            result['response_times'] = {pid: r for pid, r in responses}
+        else:
+            misses = rm_unschedulable(params)
+        result['method'] = "RTA"
+        result['schedulable'] = not misses
+        result['unschedulable_pids'] = misses
+    elif policy == "EDF":
+        ok, failure = edf_demand_test(params)
+        result['bounds'] = {'utilization': {'bound': 1.0, 'passed': u <= 1.0}}
+        result['method'] = "U<=1" if implicit else "QPA"
+        result['schedulable'] = ok
+        result['demand_failure_at'] = failure
+    else:
+        raise ValueError(f"可调度性分析只支持 RM 和 EDF: {policy}")
+    return result
@@ -0,0 +1,111 @@
+# src/modules_extension/rtos_context.py
+# 任务上下文：Cortex-M 寄存器文件 (32 位整数数组) 的保存与恢复，上下文切换的开销按模拟的 CPU 周期计
+
+from array import array
+
+from config import NVIC_ENTRY_CYCLES, NVIC_EXIT_CYCLES
+from src.process_model import ProcessState
+from src.modules_extension.rtos_memory import CONTEXT_FRAME_BYTES
+
+# 寄存器文件的布局：R0-R12、SP (PSP)、LR、PC、xPSR
+REGISTER_NAMES = tuple(f"R{i}" for i in range(13)) + ("SP", "LR", "PC", "xPSR")
+REG_INDEX = {name: i for i, name in enumerate(REGISTER_NAMES)}
+R0, SP, LR, PC, XPSR = (REG_INDEX[name] for name in ("R0", "SP", "LR", "PC", "xPSR"))
+
+_MASK32 = 0xFFFFFFFF
+FLASH_BASE = 0x08000000
+SRAM_BASE = 0x20000000
+_CODE_REGION = 0x1000        # 每个任务的代码区大小 (入口地址按 pid 分配)
+_STACK_SIZE = 0x400          # 没有任务栈的进程 (普通进程) 按 pid 划分的栈大小
+_EXC_RETURN_THREAD_PSP = 0xFFFFFFFD  # 返回线程模式并使用 PSP
+_XPSR_THUMB = 0x01000000
+
+# 复位后的寄存器 (MSP 栈顶、LR 无效值、复位向量)
+_RESET = [0] * 13 + [0x20001000, _MASK32, FLASH_BASE, _XPSR_THUMB]
+
+# PendSV 上下文切换的周期开销 (Cortex-M3/M4，无 FPU 上下文，零等待存储器)：
+# 异常进入 / 返回的硬件压栈、出栈与 NVIC 使用相同的周期数；
+# 软件部分为 MRS PSP + STMDB R4-R11 保存上文，LDMIA R4-R11 + MSR PSP 恢复下文
+SAVE_CYCLES = 1 + (1 + 8)
+RESTORE_CYCLES = (1 + 8) + 1
+
+
+def initial_context(task) -> array:
+    """任务第一次运行前的寄存器文件：SP 指向栈顶 (栈中预置的初始上下文在恢复时弹出)，PC 为任务入口，LR 为线程模式的异常返回值"""
+    regs = array('I', [0]) * len(REGISTER_NAMES)
+    pid = task.pid & 0xFFF
+    stack = getattr(task, 'stack', None)
+    regs[SP] = stack.base + stack.size if stack is not None else SRAM_BASE + (pid + 1) * _STACK_SIZE
+    regs[PC] = FLASH_BASE + pid * _CODE_REGION
+    regs[LR] = _EXC_RETURN_THREAD_PSP
+    regs[XPSR] = _XPSR_THUMB
+    return regs
+
+
+class CpuContext:
+    """
+    CPU 当前的寄存器文件与上下文切换统计。
+    寄存器只以整数保存，切换时在 CPU 与任务的寄存器文件之间整体复制 (数组切片赋值)；
+    十六进制格式化由界面在显示时进行，不计入切换开销。
+    """
+
+    __slots__ = ('regs', 'owner', 'switches', 'cycles')
+
+    def __init__(self):
+        self.regs = array('I', _RESET)
+        self.owner = None  # 寄存器当前属于的任务 (任务阻塞后仍留在 CPU 中，到下一次切换时才保存)
+        self.switches = 0
+        self.cycles = 0
+
+    def reset(self):
+        self.regs[:] = array('I', _RESET)
+        self.owner = None
+        self.switches = self.cycles = 0
+
+    def switch(self, task) -> int:
+        """
+        PendSV：把寄存器保存到原持有者的寄存器文件，再恢复 task 的寄存器文件 (None 表示切换到空闲)，
+        返回消耗的周期数。已终止的任务不保存；task 就是原持有者时寄存器仍在 CPU 中，不需要恢复。
+        有任务栈时，保存的上下文同时压入任务栈，恢复时弹出。
+        """
+        cycles = NVIC_ENTRY_CYCLES + NVIC_EXIT_CYCLES
+        owner = self.owner
+        if owner is not task:
+            if owner is not None and owner.state != ProcessState.TERMINATED:
+                # 普通进程 (Process) 没有 context 属性，第一次切出时创建
+                context = getattr(owner, 'context', None)
+                if context is None:
+                    owner.context = array('I', self.regs)
+                else:
+                    context[:] = self.regs
+                cycles += SAVE_CYCLES
+                stack = getattr(owner, 'stack', None)
+                if stack is not None:
+                    stack.push(CONTEXT_FRAME_BYTES)
+            if task is not None:
+                context = getattr(task, 'context', None)
+                if context is None:
+                    context = task.context = initial_context(task)
+                self.regs[:] = context
+                cycles += RESTORE_CYCLES
+                stack = getattr(task, 'stack', None)
+                if stack is not None:
+                    stack.pop(CONTEXT_FRAME_BYTES)
+            self.owner = task
+        self.switches += 1
+        self.cycles += cycles
+        return cycles
+
+    def run(self, run_time: int):
+        """当前任务执行 run_time (ms)：PC 在任务的代码区内前进，R0 按线性同余变化"""
+        regs = self.regs
+        entry = regs[PC] & ~(_CODE_REGION - 1)
+        regs[PC] = entry + ((regs[PC] - entry + 2 * int(run_time)) & (_CODE_REGION - 2))
+        regs[R0] = (regs[R0] * 1664525 + 1013904223) & _MASK32
+
+    def summary(self):
+        return {
+            'switches': self.switches,
+            'cycles': self.cycles,
+            'mean_cycles': round(self.cycles / self.switches, 3) if self.switches else None,
+        }
@@ -0,0 +1,130 @@
+# src/modules_extension/rtos_memory.py
+# RTOS 内存：任务栈的使用量与高水位统计、固定块内存池 (O(1) 分配与释放)
+
+from array import array
+from typing import Dict, Iterable, Optional
+
+# Cortex-M 的栈帧大小 (字节)
+EXCEPTION_FRAME_BYTES = 32                         # 异常进入时硬件压栈的 R0-R3、R12、LR、PC、xPSR
+CONTEXT_FRAME_BYTES = EXCEPTION_FRAME_BYTES + 32   # 任务切出时另由软件压栈的 R4-R11
+
+
+class PoolExhausted(MemoryError):
+    """内存池的块已全部分配 (模拟的内存耗尽，不是 Python 进程的内存不足)"""
+
+
+class TaskStack:
+    """
+    一段模拟的栈 (从 base + size 向下增长)，只记录使用的字节数。
+    peak 为使用量的峰值；使用量超过 size 时计一次溢出并继续记录，峰值可用于估计实际需要的栈大小。
+    """
+
+    __slots__ = ('base', 'size', 'used', 'peak', 'overflows')
+
+    def __init__(self, base: int, size: int):
+        self.base = base
+        self.size = size
+        self.used = 0
+        self.peak = 0
+        self.overflows = 0
+
+    @property
+    def sp(self) -> int:
+        return self.base + self.size - self.used
+
+    @property
+    def high_water_mark(self) -> int:
+        """运行以来剩余空间的最小值 (与 FreeRTOS 的 uxTaskGetStackHighWaterMark 含义相同，溢出时为负数)"""
+        return self.size - self.peak
+
+    def push(self, nbytes: int):
+        used = self.used + nbytes
+        if used > self.size >= self.used:
+            self.overflows += 1  # 使用量越过栈底
+        self.used = used
+        if used > self.peak:
+            self.peak = used
+
+    def pop(self, nbytes: int):
+        self.used = max(0, self.used - nbytes)
+
+    def reset(self):
+        self.used = self.peak = self.overflows = 0
+
+    def summary(self) -> Dict:
+        return {'size': self.size, 'peak': self.peak, 'high_water_mark': self.high_water_mark,
+                'overflows': self.overflows}
+
+
+class BlockPool:
+    """
+    固定块内存池 (FreeRTOS / µC/OS 的内存分区)：从 base 开始的 count 个 block_size 字节的块。
+    空闲块按序号串成单链表 (整数数组中保存下一个空闲块的序号)，分配取表头、释放插回表头，都是 O(1)；
+    另用一个字节数组记录各块是否已分配，检查重复释放与无效地址。
+    """
+
+    def __init__(self, base: int, block_size: int, count: int):
+        self.base = base
+        self.reset(block_size, count)
+
+    def reset(self, block_size: Optional[int] = None, count: Optional[int] = None):
+        """释放所有块 (可同时修改块大小与块数)，清空统计"""
+        if block_size is not None:
+            self.block_size = block_size
+        if count is not None:
+            self.count = count
+        self._next = array('i', range(1, self.count + 1))
+        if self.count:
+            self._next[-1] = -1
+        self._allocated = bytearray(self.count)
+        self._head = 0 if self.count else -1
+        self.used = self.peak = self.failures = 0
+
+    def alloc(self) -> Optional[int]:
+        """分配一个块，返回其地址；内存池已耗尽时返回 None"""
+        index = self._head
+        if index < 0:
+            self.failures += 1
+            return None
+        self._head = self._next[index]
+        self._allocated[index] = 1
+        self.used += 1
+        if self.used > self.peak:
+            self.peak = self.used
+        return self.base + index * self.block_size
+
+    def free(self, addr: int):
+        index, offset = divmod(addr - self.base, self.block_size)
+        if offset or not 0 <= index < self.count or not self._allocated[index]:
+            raise ValueError(f"无效的内存块地址或重复释放: 0x{addr:08X}")
+        self._allocated[index] = 0
+        self._next[index] = self._head
+        self._head = index
+        self.used -= 1
+
+    def summary(self) -> Dict:
+        return {
+            'block_size': self.block_size,
+            'blocks': self.count,
+            'used': self.used,
+            'peak': self.peak,
+            'peak_bytes': self.peak * self.block_size,
+            'failures': self.failures,
+        }
+
+
+def stack_report(tasks: Iterable) -> Dict:
+    """任务栈的汇总：分配的总字节数、各任务峰值之和 (实际需要的栈空间)、最大峰值的任务与溢出情况"""
+    stacks = [(t.pid, t.stack) for t in tasks if getattr(t, 'stack', None) is not None]
+    if not stacks:
+        return {'tasks': 0}
+    worst_pid, worst = max(stacks, key=lambda item: item[1].peak)
+    return {
+        'tasks': len(stacks),
+        'allocated_bytes': sum(s.size for _pid, s in stacks),
+        'peak_bytes': sum(s.peak for _pid, s in stacks),
+        'max_peak': worst.peak,
+        'max_peak_pid': worst_pid,
+        'min_high_water_mark': min(s.high_water_mark for _pid, s in stacks),
+        'overflowed_tasks': sum(1 for _pid, s in stacks if s.overflows),
+    }
@@ -0,0 +1,337 @@
+# src/modules_extension/rtos_nvic.py
+# 嵌套向量中断控制器 (NVIC)：多条中断线、可配置优先级、嵌套抢占与尾链，挂起状态用位图表示
+
+import heapq
+import math
+import random
+from typing import Dict, List, Optional, Tuple
+
+from config import (NVIC_PRIORITY_BITS, NVIC_CPU_MHZ, NVIC_ENTRY_CYCLES, NVIC_EXIT_CYCLES,
+                    NVIC_TAILCHAIN_CYCLES, RTOS_IRQ_LINES, RTOS_ISR_FRAME_BYTES)
+from src.modules_extension.rtos_memory import EXCEPTION_FRAME_BYTES
+
+# 时间线中中断处理函数的 pid 为 IRQ_PID_BASE + IRQ 号，与任务的 pid 区分
+IRQ_PID_BASE = 100000
+
+# 事件中表示"被中断的线程"的占位 pid，由内核写入时间线时替换为实际运行的任务
+THREAD_CONTEXT = -2
+
+# 线程的执行优先级：低于所有可配置的中断优先级
+THREAD_PRIORITY = 1 << NVIC_PRIORITY_BITS
+
+_EPS = 1e-9
+
+
+def irq_pid(irq: int) -> int:
+    return IRQ_PID_BASE + irq
+
+
+def is_irq_pid(pid: int) -> bool:
+    return pid >= IRQ_PID_BASE
+
+
+def _cycles_to_ms(cycles: int) -> float:
+    return cycles / (NVIC_CPU_MHZ * 1000.0)
+
+
+class IRQLine:
+    """一条中断线：配置 (名称、优先级、处理时间、随机触发频率) 与统计"""
+
+    __slots__ = ('irq', 'name', 'priority', 'handler_time', 'rate', 'next_arrival',
+                 'pending_since', 'raised', 'lost', 'serviced')
+
+    def __init__(self, irq: int, name: str, priority: int, handler_time: float, rate: float = 0.0):
+        self.irq = irq
+        self.name = name
+        self.priority = priority
+        self.handler_time = handler_time  # 处理函数的执行时间 (ms)
+        self.rate = rate                  # 随机触发的平均频率 (次/秒)，0 表示只由外部触发
+        self.next_arrival = math.inf
+        self.pending_since = 0.0          # 当前挂起的触发时刻
+        self.raised = 0                   # 被锁存的触发次数
+        self.lost = 0                     # 已挂起时再次触发而被合并的次数
+        self.serviced = 0                 # 处理完成的次数
+
+
+class _Frame:
+    """正在执行 (或被嵌套抢占) 的中断"""
+
+    __slots__ = ('line', 'remaining', 'exit_time', 'arrival', 'frame_stack')
+
+    def __init__(self, line: IRQLine, remaining: float, exit_time: float, arrival: float, frame_stack=None):
+        self.line = line
+        self.remaining = remaining  # 剩余时间 (含异常返回的出栈开销)
+        self.exit_time = exit_time
+        self.arrival = arrival
+        self.frame_stack = frame_stack  # 异常帧压入的栈 (被中断的任务栈或主栈)，None 表示不记录
+
+
+class NVIC:
+    """
+    嵌套向量中断控制器 (Cortex-M NVIC 的时间模型)。
+    - 挂起状态为两级位图：_prio_mask 的第 p 位表示优先级 p 有挂起的中断，_pending[p] 的第 n 位表示 IRQ n 挂起；
+      取最高优先级的挂起中断只需两次取最低置位 (同优先级时 IRQ 号小者优先)，与中断线数量无关
+    - 已挂起的中断线再次触发时被合并 (计为丢失)；正在执行的中断再次触发会重新挂起
+    - 挂起中断的优先级高于当前执行优先级 (栈顶中断，或线程) 时立即嵌套抢占
+    - 中断处理完成时，若有挂起中断能抢占将要返回的上下文，则不出栈直接进入该中断 (尾链)
+    - 进入、返回与尾链的开销按周期数换算为时间，计入中断占用的时间
+    run(t0, t1) 在一个时间片内按到达时刻连续推进，返回中断占用的时间，线程只能使用剩余的时间。
+    - 给出主栈 (main_stack) 时记录栈的使用：打断线程的异常帧压入线程的栈 (thread_stack，由内核在每个时间片设置)，
+      嵌套的异常帧和处理函数的栈帧压入主栈 (与 Cortex-M 的 PSP / MSP 一致)
+    事件先缓存在控制器中，由内核在记录完本时间片的线程事件后统一写入时间线，保证事件时间递增。
+    """
+
+    def __init__(self, lines=RTOS_IRQ_LINES, stats=None, main_stack=None):
+        self.stats = stats  # 延迟统计 (提供 record(指标, 对象, 数值))，可以为空
+        self.main_stack = main_stack  # 主栈 (TaskStack)，可以为空
+        self.thread_stack = None      # 当前线程的任务栈 (没有时被打断线程的异常帧不记录)
+        self.now = 0.0
+        self._default_lines = list(lines)
+        self.reset_lines()
+
+    # --- 配置 ---
+
+    def reset_lines(self):
+        """恢复默认中断线配置并清空运行状态"""
+        self.lines: Dict[int, IRQLine] = {}
+        for irq, name, priority, handler_time in self._default_lines:
+            self.configure(irq, name, priority, handler_time)
+        self.reset()
+
+    def configure(self, irq: int, name: str, priority: int, handler_time: float, rate: float = 0.0):
+        """添加或修改一条中断线 (在中断线空闲时调用)"""
+        if irq < 0:
+            raise ValueError(f"IRQ 号不能为负数: {irq}")
+        if not 0 <= priority < THREAD_PRIORITY:
+            raise ValueError(f"IRQ{irq} 的优先级需要在 0 ~ {THREAD_PRIORITY - 1} 之间: {priority}")
+        line = IRQLine(irq, name, priority, handler_time, rate)
+        if rate > 0:
+            line.next_arrival = self.now + random.expovariate(rate / 1000.0)
+        self.lines[irq] = line
+        return line
+
+    def reset(self):
+        """清空挂起、执行中的中断和统计，保留中断线配置"""
+        self.now = 0.0
+        self._prio_mask = 0
+        self._pending = [0] * THREAD_PRIORITY
+        self._active: List[_Frame] = []
+        self.thread_stack = None
+        if self.main_stack is not None:
+            self.main_stack.reset()
+        self._arrivals: List[Tuple[float, int, int]] = []  # [(到达时刻, 序号, IRQ)] 小根堆
+        self._arrival_seq = 0
+        self._events = []
+        self.raised = self.lost = self.serviced = self.tail_chains = 0
+        self.max_depth = 0
+        self.busy_time = 0.0
+        for line in self.lines.values():
+            line.raised = line.lost = line.serviced = 0
+            line.next_arrival = random.expovariate(line.rate / 1000.0) if line.rate > 0 else math.inf
+
+    # --- 触发 ---
+
+    def raise_irq(self, irq: int, when: Optional[float] = None) -> bool:
+        """
+        触发中断线 irq。when 为空或不晚于当前时刻时立即挂起，否则在 when 时刻挂起 (届时再判断是否被合并)。
+        中断线不存在或立即挂起时已处于挂起状态 (触发被合并) 时返回 False。
+        """
+        if irq not in self.lines:
+            return False
+        if when is None or when <= self.now:
+            return self._latch(irq, self.now if when is None else when)
+        self._push_arrival(when, irq)
+        return True
+
+    def _push_arrival(self, when, irq):
+        self._arrival_seq += 1
+        heapq.heappush(self._arrivals, (when, self._arrival_seq, irq))
+
+    def _generate_arrivals(self, start, until):
+        """为按频率随机触发的中断线生成 [start, until) 内的到达时刻 (泊松过程)"""
+        for line in self.lines.values():
+            if line.rate <= 0:
+                continue
+            rate_per_ms = line.rate / 1000.0
+            if line.next_arrival < start:
+                # 内核没有运行的时间段 (启动前、暂停期间) 不产生中断；指数分布无记忆，从 start 重新抽样
+                line.next_arrival = start + random.expovariate(rate_per_ms)
+            while line.next_arrival < until:
+                self._push_arrival(line.next_arrival, line.irq)
+                line.next_arrival += random.expovariate(rate_per_ms)
+
+    def _latch(self, irq, when) -> bool:
+        line = self.lines[irq]
+        p = line.priority
+        bit = 1 << irq
+        if self._pending[p] & bit:
+            line.lost += 1
+            self.lost += 1
+            return False
+        self._pending[p] |= bit
+        self._prio_mask |= 1 << p
+        line.pending_since = when
+        line.raised += 1
+        self.raised += 1
+        self._event(when, "ISR_TRIGGER", -1, irq_pid(irq), f"{line.name} 挂起")
+        return True
+
+    def _best_pending(self) -> Optional[IRQLine]:
+        """优先级最高的挂起中断：两级位图各取一次最低置位"""
+        mask = self._prio_mask
+        if not mask:
+            return None
+        p = (mask & -mask).bit_length() - 1
+        bits = self._pending[p]
+        return self.lines[(bits & -bits).bit_length() - 1]
+
+    def _clear_pending(self, line):
+        p = line.priority
+        self._pending[p] &= ~(1 << line.irq)
+        if not self._pending[p]:
+            self._prio_mask &= ~(1 << p)
+
+    # --- 执行 ---
+
+    def _context_pid(self, depth=None):
+        """栈中第 depth 层 (默认栈顶) 的上下文 pid，depth 为 0 时为线程"""
+        depth = len(self._active) if depth is None else depth
+        return irq_pid(self._active[depth - 1].line.irq) if depth else THREAD_CONTEXT
+
+    def _enter(self, now, line, prev_pid, reason, tail_chain=False):
+        self._clear_pending(line)
+        entry = _cycles_to_ms(NVIC_TAILCHAIN_CYCLES if tail_chain else NVIC_ENTRY_CYCLES)
+        exit_time = _cycles_to_ms(NVIC_EXIT_CYCLES)
+        frame_stack = None
+        if self.main_stack is not None:
+            frame_stack = self.main_stack if self._active else self.thread_stack
+            if frame_stack is not None:
+                frame_stack.push(EXCEPTION_FRAME_BYTES)
+            self.main_stack.push(RTOS_ISR_FRAME_BYTES)
+        self._active.append(_Frame(line, entry + line.handler_time + exit_time, exit_time, line.pending_since,
+                                   frame_stack))
+        self.max_depth = max(self.max_depth, len(self._active))
+        if tail_chain:
+            self.tail_chains += 1
+        if self.stats is not None:
+            # 中断延迟：触发 -> 处理函数开始执行 (含压栈或尾链开销)，统计单位为纳秒
+            self.stats.record('isr_latency', f"IRQ{line.irq}", (now + entry - line.pending_since) * 1e6)
+        self._event(now, "ISR_EXEC", prev_pid, irq_pid(line.irq), reason)
+
+    def _finish(self, now, next_pid):
+        frame = self._active.pop()
+        if self.main_stack is not None:
+            self.main_stack.pop(RTOS_ISR_FRAME_BYTES)
+            if frame.frame_stack is not None:
+                frame.frame_stack.pop(EXCEPTION_FRAME_BYTES)
+        line = frame.line
+        line.serviced += 1
+        self.serviced += 1
+        if self.stats is not None:
+            self.stats.record('response_time', f"IRQ{line.irq}", (now - frame.arrival) * 1000)
+        self._event(now, "ISR_FINISH", irq_pid(line.irq), next_pid, f"{line.name} 返回")
+
+    def run(self, t0: float, t1: float) -> float:
+        """推进 [t0, t1) 内的中断处理，返回中断占用的时间"""
+        self._generate_arrivals(max(t0, self.now), t1)
+        arrivals = self._arrivals
+        stack = self._active
+        now = t0
+        busy = 0.0
+        while True:
+            while arrivals and arrivals[0][0] <= now:
+                when, _, irq = heapq.heappop(arrivals)
+                self._latch(irq, when)
+
+            best = self._best_pending()
+            if stack and stack[-1].remaining - stack[-1].exit_time <= _EPS:
+                # 处理函数已完成 (出栈阶段)：挂起中断能抢占将要返回的上下文时尾链，省去出栈和再次压栈
+                frame = stack[-1]
+                below = stack[-2].line.priority if len(stack) > 1 else THREAD_PRIORITY
+                if best is not None and best.priority < below:
+                    self._finish(now, irq_pid(best.irq))
+                    self._enter(now, best, irq_pid(frame.line.irq), "Tail-chain", tail_chain=True)
+                    continue
+            else:
+                # 嵌套抢占：挂起中断的优先级高于当前执行优先级
+                while best is not None and best.priority < (stack[-1].line.priority if stack else THREAD_PRIORITY):
+                    reason = f"抢占 IRQ{stack[-1].line.irq}" if stack else "Hardware IRQ"
+                    self._enter(now, best, self._context_pid(), reason)
+                    best = self._best_pending()
+
+            next_arrival = arrivals[0][0] if arrivals else math.inf
+            if not stack:
+                if next_arrival >= t1:
+                    break
+                now = next_arrival
+                continue
+
+            # 运行到处理函数完成 (或出栈完成)、下一个中断到达或时间片结束
+            frame = stack[-1]
+            handler_left = frame.remaining - frame.exit_time
+            step_end = now + (handler_left if handler_left > _EPS else frame.remaining)
+            end = min(step_end, next_arrival, t1)
+            busy += end - now
+            frame.remaining -= end - now
+            now = end
+            if frame.remaining <= _EPS:
+                self._finish(now, self._context_pid(len(stack) - 1))
+            if now >= t1:
+                break
+
+        self.now = t1
+        self.busy_time += busy
+        return busy
+
+    # --- 事件与状态 ---
+
+    def _event(self, time, event_type, prev_pid, next_pid, info):
+        self._events.append((round(time, 3), event_type, prev_pid, next_pid, info))
+
+    def drain_events(self):
+        """取出缓存的事件 [(时间, 类型, prev_pid, next_pid, 说明)]"""
+        events, self._events = self._events, []
+        return events
+
+    def next_event(self) -> float:
+        """下一次需要处理中断的时刻：有挂起或正在执行的中断时为当前时刻，否则为最早的到达时刻 (没有时为 inf)"""
+        if self._active or self._prio_mask:
+            return self.now
+        earliest = self._arrivals[0][0] if self._arrivals else math.inf
+        for line in self.lines.values():
+            if line.next_arrival < earliest:
+                earliest = line.next_arrival
+        return earliest
+
+    def active_irqs(self) -> List[int]:
+        """正在执行的中断 (栈底 -> 栈顶)"""
+        return [frame.line.irq for frame in self._active]
+
+    def pending_irqs(self) -> List[int]:
+        """挂起的中断，按优先级排列"""
+        result = []
+        mask = self._prio_mask
+        while mask:
+            p = (mask & -mask).bit_length() - 1
+            mask &= mask - 1
+            bits = self._pending[p]
+            while bits:
+                result.append((bits & -bits).bit_length() - 1)
+                bits &= bits - 1
+        return result
+
+    def summary(self, elapsed: float) -> Dict:
+        """中断统计；elapsed 为统计区间的总时长 (ms)，用于计算中断占用率"""
+        return {
+            'raised': self.raised,
+            'serviced': self.serviced,
+            'lost': self.lost,
+            'tail_chains': self.tail_chains,
+            'max_nesting': self.max_depth,
+            'busy_ratio': round(self.busy_time / elapsed, 4) if elapsed > 0 else 0.0,
+            'lines': {
+                f"IRQ{irq}": {'name': line.name, 'priority': line.priority, 'raised': line.raised,
+                              'serviced': line.serviced, 'lost': line.lost}
+                for irq, line in sorted(self.lines.items())
+            },
+        }
@@ -0,0 +1,191 @@
+# src/modules_extension/rtos_timer.py
+# 分层时间轮：RTOS 内核的软件定时器服务 (任务延时、信号量超时、周期任务的释放与截止时间)
+
+from typing import List, Optional
+
+# 每层的槽数为 2^WHEEL_BITS，共 WHEEL_LEVELS 层；一个 tick 为 1ms，
+# 第 l 层的一个槽覆盖 2^(WHEEL_BITS * l) 个 tick，4 层 64 槽可直接容纳约 4.6 小时内的定时器
+WHEEL_BITS = 6
+WHEEL_LEVELS = 4
+_RANGE = 1 << (WHEEL_BITS * WHEEL_LEVELS)  # 时间轮能直接容纳的最大时间差
+_OVERFLOW = WHEEL_LEVELS                  # 超出范围的定时器所在的"层"
+
+
+class WheelTimer:
+    """时间轮中的一个定时器；kind / task / data 由使用者解释"""
+
+    __slots__ = ('expires', 'kind', 'seq', 'task', 'data', '_level', '_index')
+
+    def __init__(self, expires: int, kind: int, seq: int, task=None, data=0):
+        self.expires = expires
+        self.kind = kind
+        self.seq = seq
+        self.task = task
+        self.data = data
+        self._level = -1  # 所在的层与槽序号，-1 表示已到期或已取消
+        self._index = 0
+
+    @property
+    def active(self) -> bool:
+        return self._level >= 0
+
+    def sort_key(self):
+        """同一时刻到期的定时器按类型、创建顺序处理"""
+        return self.expires, self.kind, self.seq
+
+
+class TimingWheel:
+    """
+    分层时间轮 (Varghese & Lauck)。
+    - 第 0 层的每个槽对应一个 tick；更高层的槽对应一段时间，轮到该槽时把其中的定时器级联到低层
+    - 每个槽是以定时器为键的字典 (保持插入顺序)，插入与取消都是 O(1)
+    - 每层用一个整数位图记录非空的槽：advance() 直接跳到下一个需要处理的 tick，空闲的 tick 不逐个推进；
+      next_expiry() 只需检查每层第一个非空的槽 (无节拍模式据此计算可以跳过的时间)；
+      另外缓存下一个需要处理的 tick，没有定时器到期的时间片 advance() 直接返回
+    - 超出时间轮范围的定时器放在溢出表中，进入范围时再放入时间轮
+    """
+
+    def __init__(self, now: int = 0):
+        self.now = int(now)  # 已处理到的 tick
+        self._size = 1 << WHEEL_BITS
+        self._mask = self._size - 1
+        self._slots = [[{} for _ in range(self._size)] for _ in range(WHEEL_LEVELS)]
+        self._bitmaps = [0] * WHEEL_LEVELS
+        self._overflow = {}
+        self._overflow_due = None  # 溢出表中最早进入范围的 tick (取消定时器后可能偏早，只影响一次多余的检查)
+        self._due = None  # 下一个需要处理的 tick 的下界 (取消定时器后可能偏早)，None 表示没有定时器
+        self._count = 0
+        self._seq = 0
+
+    def __len__(self):
+        return self._count
+
+    def add(self, expires: int, kind: int = 0, task=None, data=0) -> WheelTimer:
+        """添加一个在 expires 时刻到期的定时器 (不晚于当前时刻时在下一个 tick 到期)"""
+        self._seq += 1
+        timer = WheelTimer(max(int(expires), self.now + 1), kind, self._seq, task, data)
+        self._place(timer)
+        self._count += 1
+        return timer
+
+    def cancel(self, timer: WheelTimer) -> bool:
+        """取消定时器；已到期或已取消时返回 False"""
+        level, index = timer._level, timer._index
+        if level < 0:
+            return False
+        slot = self._overflow if level == _OVERFLOW else self._slots[level][index]
+        del slot[timer]
+        timer._level = -1
+        self._count -= 1
+        if not slot and level != _OVERFLOW:
+            self._bitmaps[level] &= ~(1 << index)
+        return True
+
+    def _place(self, timer: WheelTimer):
+        delta = max(0, timer.expires - self.now)
+        if delta >= _RANGE:
+            self._overflow[timer] = None
+            timer._level = _OVERFLOW
+            due = timer.expires - _RANGE + 1
+            if self._overflow_due is None or due < self._overflow_due:
+                self._overflow_due = due
+            self._update_due(due)
+            return
+        level = 0
+        while delta >> (WHEEL_BITS * (level + 1)):
+            level += 1
+        shift = WHEEL_BITS * level
+        index = (timer.expires >> shift) & self._mask
+        self._slots[level][index][timer] = None
+        timer._level, timer._index = level, index
+        self._bitmaps[level] |= 1 << index
+        self._update_due((timer.expires >> shift) << shift)
+
+    def _update_due(self, tick):
+        if self._due is None or tick < self._due:
+            self._due = tick
+
+    def _first_slot(self, level: int) -> Optional[int]:
+        """level 层在当前时刻之后第一个轮到的非空槽所对应的块号 (tick >> (WHEEL_BITS * level))"""
+        bits = self._bitmaps[level]
+        if not bits:
+            return None
+        current = self.now >> (WHEEL_BITS * level)
+        start = (current + 1) & self._mask
+        rotated = ((bits >> start) | (bits << (self._size - start))) & ((1 << self._size) - 1)
+        return current + 1 + ((rotated & -rotated).bit_length() - 1)
+
+    def _next_tick(self) -> Optional[int]:
+        """下一个需要处理 (到期、级联或溢出表中的定时器进入范围) 的 tick"""
+        best = self._overflow_due
+        for level in range(WHEEL_LEVELS):
+            block = self._first_slot(level)
+            if block is not None:
+                tick = block << (WHEEL_BITS * level)
+                if best is None or tick < best:
+                    best = tick
+        return best
+
+    def next_expiry(self) -> Optional[int]:
+        """最早到期的定时器的到期时刻，没有定时器时返回 None"""
+        best = min((t.expires for t in self._overflow), default=None)
+        for level in range(WHEEL_LEVELS):
+            block = self._first_slot(level)
+            if block is None:
+                continue
+            if level == 0:
+                expires = block
+            else:
+                # 较早的槽中的定时器一定早于较晚的槽，只需检查第一个非空的槽
+                expires = min(t.expires for t in self._slots[level][block & self._mask])
+            if best is None or expires < best:
+                best = expires
+        return best
+
+    def advance(self, now: int) -> List[WheelTimer]:
+        """推进到 now，返回期间到期的定时器 (按到期时刻、类型、创建顺序排列)"""
+        now = int(now)
+        if self._due is None or self._due > now:
+            # 没有需要处理的 tick (大多数时间片的情况)，不必检查各层位图
+            self.now = max(self.now, now)
+            return []
+        expired = []
+        while True:
+            tick = self._next_tick()
+            if tick is None or tick > now:
+                break
+            self.now = tick
+            if tick == self._overflow_due:
+                self._refill_overflow()
+            # 级联：从低层到高层，轮到的槽中的定时器按剩余时间重新放置
+            for level in range(1, WHEEL_LEVELS):
+                shift = WHEEL_BITS * level
+                if tick & ((1 << shift) - 1):
+                    break
+                index = (tick >> shift) & self._mask
+                slot = self._slots[level][index]
+                if slot:
+                    self._slots[level][index] = {}
+                    self._bitmaps[level] &= ~(1 << index)
+                    for timer in slot:
+                        self._place(timer)
+            index = tick & self._mask
+            slot = self._slots[0][index]
+            if slot:
+                self._slots[0][index] = {}
+                self._bitmaps[0] &= ~(1 << index)
+                for timer in slot:
+                    timer._level = -1
+                expired.extend(slot)
+                self._count -= len(slot)
+        self._due = tick
+        self.now = max(self.now, now)
+        if len(expired) > 1:
+            expired.sort(key=WheelTimer.sort_key)
+        return expired
+
+    def _refill_overflow(self):
+        """把溢出表中已进入范围的定时器放入时间轮，并重新计算最早进入范围的时刻"""
+        pending, self._overflow, self._overflow_due = self._overflow, {}, None
+        for timer in pending:
+            self._place(timer)
@@ -0,0 +1,87 @@
+# src/process_archive.py
+# 已终止进程的归档存储：只追加的列式摘要表
+
+from array import array
+from typing import List, Tuple
+
+from src.process_model import Process
+
+# 归档行格式：(pid, 到达时间, 总需时间, 优先级, 等待时间, 周转时间, 响应时间, 完成时间)
+ArchivedRow = Tuple[int, float, float, int, float, float, float, float]
+
+
+class ProcessArchive:
+    """
+    已终止进程的摘要表。
+    每一列是一个紧凑的 array，只追加不修改；活跃结构中不再保留 TERMINATED 进程，
+    调度指标直接使用这里维护的累计值，不需要再扫描全部进程。
+    """
+
+    def __init__(self):
+        self.pids = array('q')
+        self.arrival_times = array('d')
+        self.burst_times = array('d')
+        self.priorities = array('q')
+        self.wait_times = array('d')
+        self.turnaround_times = array('d')
+        self.response_times = array('d')
+        self.finish_times = array('d')
+
+        # 累计值，避免统计时重新遍历
+        self.total_wait = 0.0
+        self.total_turnaround = 0.0
+        self.total_response = 0.0
+        self.max_pid = 0
+
+    def __len__(self):
+        return len(self.pids)
+
+    def append(self, process: Process):
+        """归档一个已终止的进程（调用方需持有 STATUS._lock）"""
+        # 响应时间在首次运行时由 transition_state 计算；从未运行过的进程记为 0
+        response = process.response_time if process.response_time is not None else 0.0
+
+        self.pids.append(process.pid)
+        self.arrival_times.append(process.arrival_time)
+        self.burst_times.append(process.burst_time)
+        self.priorities.append(process.priority)
+        self.wait_times.append(process.wait_time)
+        self.turnaround_times.append(process.turnaround_time)
+        self.response_times.append(response)
+        self.finish_times.append(process.finish_time)
+
+        self.total_wait += process.wait_time
+        self.total_turnaround += process.turnaround_time
+        self.total_response += response
+        if process.pid > self.max_pid:
+            self.max_pid = process.pid
+
+    def row(self, index: int) -> ArchivedRow:
+        return (
+            self.pids[index], self.arrival_times[index], self.burst_times[index],
+            self.priorities[index], self.wait_times[index], self.turnaround_times[index],
+            self.response_times[index], self.finish_times[index]
+        )
+
+    def rows(self, start: int, count: int) -> List[ArchivedRow]:
+        """按页读取归档行，用于列表视图的分页浏览"""
+        end = min(len(self.pids), start + count)
+        return [self.row(i) for i in range(max(0, start), end)]
+
+    def average_wait(self) -> float:
+        return self.total_wait / len(self.pids) if self.pids else 0.0
+
+    def average_turnaround(self) -> float:
+        return self.total_turnaround / len(self.pids) if self.pids else 0.0
+
+    def average_response(self) -> float:
+        return self.total_response / len(self.pids) if self.pids else 0.0
+
+    def clear(self):
+        for column in (self.pids, self.arrival_times, self.burst_times, self.priorities,
+                       self.wait_times, self.turnaround_times, self.response_times, self.finish_times):
+            del column[:]
+        self.total_wait = 0.0
+        self.total_turnaround = 0.0
+        self.total_response = 0.0
+        self.max_pid = 0
@@ -44,9 +44,32 @@ class RTOS_Task(Process):
 
     def __init__(self, pid, arrival_time, burst_time, priority, period, deadline):
         super().__init__(pid, arrival_time, burst_time, priority)
-        self.period = period  # 周期时间
-        self.deadline = deadline  # 截止时间
+        self.period = period  # 周期时间 (0 表示非周期任务)
+        self.deadline = deadline  # 相对截止时间 (周期任务要求 deadline <= period)
         self.is_critical = False  # 是否为关键任务
 
+        # 周期任务的作业状态 (由 RTOS 内核维护)
+        self.next_release = None      # 下一个作业的释放时刻，None 表示尚未开始释放
+        self.release_time = 0         # 当前作业的释放时刻
+        self.absolute_deadline = 0    # 当前作业的绝对截止时间
+        self.job_started = False      # 当前作业是否已开始执行 (用于统计释放抖动)
+        self.job_count = 0            # 已释放的作业数
+        self.deadline_misses = 0      # 错过截止时间的作业数
+        self.wake_time = None         # 阻塞任务的唤醒 / 等待超时时刻 (vTaskDelay、信号量)
+
+        # 互斥量 (由 RTOS 内核维护)：priority 为当前的有效优先级，可能因优先级继承 / 天花板而临时提高
+        self.nominal_priority = None  # 名义优先级，None 表示尚未由内核记录
+        self.resources = ()           # 任务会使用的互斥量序号 (按序号递增加锁，避免死锁)
+        self.held_mutexes = []        # 持有的互斥量 [[互斥量, 临界区剩余时间]] (外层 -> 内层)
+        self.waiting_mutex = None     # 正在等待的互斥量
+        self.pending_cs = 0           # 等待中的互斥量获得后的临界区长度
+        self.mutex_wait_start = 0     # 开始等待互斥量的时刻
+        self.mutex_inversion = 0      # 本次等待中，更低名义优先级的任务占用 CPU 的时间
+
+        # 任务上下文：寄存器文件 (array('I'))，第一次被调度时由内核初始化，切换时保存 / 恢复
+        self.context = None
+        self.stack = None             # 任务栈 (TaskStack)，生成任务集时从内存池分配
+        self.call_depth = 0           # 当前的函数调用深度 (决定栈的使用量)
+
     def __repr__(self):
         return f"RTOS_Task(PID={self.pid}, Priority={self.priority}, Deadline={self.deadline})"
\ No newline at end of file
@@ -6,6 +6,9 @@ from collections import deque
 from typing import Dict, Any, List, Optional
 # 修正 1: 导入核心模型
 from src.process_model import Process, ProcessState
+from src.process_archive import ProcessArchive
+from src.event_ring import EventRing
+from config import RTOS_TIMELINE_CAPACITY
 
 
 class SystemStatus:
@@ -29,7 +32,8 @@ class SystemStatus:
 
         # 核心调度状态
         # 修正 2: 明确指定类型为 Process
-        self.all_processes: Dict[int, Process] = {}  # 所有进程的字典 {pid: Process}
+        self.all_processes: Dict[int, Process] = {}  # 活跃进程的字典 {pid: Process}
+        self.process_archive = ProcessArchive()  # 已终止进程的归档摘要 (不再保留在 all_processes 中)
         self.ready_queue: deque[Process] = deque()  # 就绪队列 (使用 deque)
         self.cpu_history: Dict[int, List[Dict]] = {}  # 多核调度历史
         self.global_timer: float = 0.0  # 模拟系统时钟
@@ -61,13 +65,12 @@ class SystemStatus:
         self.shared_memory_readers: Dict[int, bool] = {}  # 记录进程是否在读取共享内存
         self.shared_memory_access_count: int = 0  # 共享内存访问计数器
 
-        # 内存状态
-        self.memory_layout: List[Dict] = []  # 内存分区状态列表
+        # 内存状态 (动态分区由 extension_memory 中的分配器维护)
         self.page_table: Dict[int, Dict[int, int]] = {}  # 页表状态 {pid: {page: frame}}
         self.next_free_frame: int = 0
 
         # RTOS 状态
-        self.rtos_timeline: List[Dict] = []  # 任务上下文切换记录
+        self.rtos_timeline = EventRing(RTOS_TIMELINE_CAPACITY)  # 任务上下文切换记录 (按事件 ID 增量读取)
         self.rtos_running: bool = False
         
         # 信号量模拟状态
@@ -80,6 +83,7 @@ class SystemStatus:
         with self._lock:
             self.global_timer = 0.0
             self.all_processes.clear()
+            self.process_archive.clear()
             self.ready_queue.clear()
             self.message_queue.clear()
             self.blocked_queue.clear()